@@ -0,0 +1,121 @@
+"""
+Buang laporan posisi AIS ganda saat ingest (streaming, berbasis hash).
+
+Laporan yang sama sering masuk lebih dari sekali (mis. ditangkap beberapa
+receiver), contoh 525015242/525016451 @ 2024-06-08 01:01:08 muncul dua kali di
+potential_vessel_interactions.csv. Baris ganda ikut membesarkan BallTree per
+bin dan jumlah pasangan di semua detektor.
+
+Kunci dedup = hash(mmsi, ts // time_tol, round(lat / pos_tol), round(lon / pos_tol)).
+Toleransi berupa grid: dua laporan yang jatuh di sel grid yang sama dianggap
+duplikat (laporan yang kebetulan beda sel di batas grid tetap lolos).
+Dedup berjalan dua tahap:
+  1. streaming per chunk (`keep_mask`): kunci chunk sebelumnya disimpan selama
+     `window_ms` sebelum `ts` terbaru, jadi sebagian besar duplikat sudah
+     dibuang sebelum payload-nya ditulis. Export MongoDB tidak dijamin urut
+     waktu, jadi tahap ini saja tidak menjamin semua duplikat lintas chunk
+     tertangkap.
+  2. per partisi hari saat compact (`dedup_partition`, dipanggil dari
+     ais_store.compact_partition): seluruh baris satu hari sudah ada di
+     memori, jadi duplikat yang lolos tahap 1 dibuang di sini apa pun urutan
+     export-nya. Laporan ganda selalu jatuh di hari yang sama (kunci memuat
+     ts // time_tol). Payload baris yang dibuang di tahap ini sudah terlanjur
+     ditulis ke payload store; ref-nya dikumpulkan di `orphans` supaya
+     pemanggil bisa mengosongkannya (`PayloadStore.discard`).
+
+Hanya tipe pesan laporan posisi yang didedup. Fragmen pesan statis (tipe 5
+dua kalimat) punya mmsi/waktu/posisi yang sama tapi payload berbeda, dan
+keduanya dibutuhkan untuk reassembly.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from ais_validate import POSITION_TYPES
+
+TIME_TOL_MS = 1_000          # laporan di detik yang sama
+POS_TOL_DEG = 1e-5           # ≈ 1 m
+WINDOW_MS = 10 * 60_000      # simpan kunci 10 menit terakhir (lintas chunk)
+
+
+class Deduplicator:
+    def __init__(self, time_tol_ms=TIME_TOL_MS, pos_tol_deg=POS_TOL_DEG, window_ms=WINDOW_MS):
+        self.time_tol_ms = max(int(time_tol_ms), 1)
+        self.pos_tol_deg = pos_tol_deg
+        self.window_ms = window_ms
+        self.seen_keys = np.empty(0, dtype=np.uint64)
+        self.seen_ts = np.empty(0, dtype=np.int64)
+        self.rows_in = 0
+        self.dropped = 0
+        self.orphans = []            # payload_ref baris yang dibuang dedup_partition
+
+    def keys(self, tbl):
+        """Hash uint64 per baris dari kolom kanonik mmsi/ts/lat/lon (null → sentinel)."""
+        def col(name, fill):
+            vals = tbl.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+            return np.nan_to_num(vals, nan=fill)
+
+        mmsi = col("mmsi", -1).astype(np.int64)
+        ts = tbl.column("ts").to_numpy(zero_copy_only=False).astype(np.int64)
+        lat = col("lat", 999.0)
+        lon = col("lon", 999.0)
+        parts = pd.DataFrame({
+            "mmsi": mmsi,
+            "t": ts // self.time_tol_ms,
+            "lat": np.round(lat / self.pos_tol_deg).astype(np.int64),
+            "lon": np.round(lon / self.pos_tol_deg).astype(np.int64),
+        })
+        return pd.util.hash_pandas_object(parts, index=False).to_numpy()
+
+    def _first(self, tbl):
+        """(mask laporan posisi, kuncinya, mask kemunculan pertama di dalam tbl)."""
+        aistype = tbl.column("aistype").to_numpy(zero_copy_only=False).astype(np.float64)
+        pos = np.isin(aistype, POSITION_TYPES)
+        keys = self.keys(tbl)[pos]
+        return pos, keys, ~pd.Series(keys).duplicated().to_numpy()
+
+    def keep_mask(self, tbl):
+        """Mask bool baris yang dipertahankan (kemunculan pertama tiap kunci)."""
+        pos, keys, keep_pos = self._first(tbl)
+        ts = tbl.column("ts").to_numpy(zero_copy_only=False).astype(np.int64)[pos]
+        if len(self.seen_keys):
+            keep_pos &= ~np.isin(keys, self.seen_keys)
+        keep = np.ones(tbl.num_rows, dtype=bool)
+        keep[pos] = keep_pos
+
+        # simpan kunci baru, buang yang sudah lewat jendela waktu
+        self.seen_keys = np.concatenate([self.seen_keys, keys[keep_pos]])
+        self.seen_ts = np.concatenate([self.seen_ts, ts[keep_pos]])
+        if len(self.seen_ts):
+            recent = self.seen_ts >= self.seen_ts.max() - self.window_ms
+            self.seen_keys, self.seen_ts = self.seen_keys[recent], self.seen_ts[recent]
+
+        self.rows_in += tbl.num_rows
+        self.dropped += int((~keep).sum())
+        return keep
+
+    def dedup_partition(self, tbl):
+        """
+        Buang duplikat di tabel satu partisi hari (semua file-nya sekaligus).
+        Tanpa state lintas chunk: baris yang muncul lebih dulu di tabel dipertahankan.
+        """
+        pos, _, keep_pos = self._first(tbl)
+        keep = np.ones(tbl.num_rows, dtype=bool)
+        keep[pos] = keep_pos
+        dropped = int((~keep).sum())
+        if not dropped:
+            return tbl
+        self.dropped += dropped
+        refs = tbl.column("payload_ref").filter(pa.array(~keep)).drop_null()
+        self.orphans.append(refs.to_numpy().astype(np.int64))
+        return tbl.filter(keep)
+
+    def take_orphans(self):
+        """payload_ref yatim yang terkumpul sejak panggilan terakhir (array int64), lalu kosongkan."""
+        refs = np.concatenate(self.orphans) if self.orphans else np.empty(0, dtype=np.int64)
+        self.orphans = []
+        return refs
+
+    def report(self):
+        pct = 100 * self.dropped / self.rows_in if self.rows_in else 0.0
+        return f"{self.dropped:,} duplikat dibuang dari {self.rows_in:,} baris ({pct:.2f}%)"
@@ -0,0 +1,308 @@
+"""
+Ingest export MongoDB (Extended JSON) → dataset Parquet terpartisi secara streaming.
+
+Pengganti playground.py: file JSON tidak di-`json.load` sekaligus, tapi
+di-parse per blok dan diproses per chunk baris, jadi pemakaian RAM
+tetap (± ukuran satu chunk) berapa pun besar export-nya. Hasilnya ditulis
+langsung ke partisi harian ais_store (lihat ais_store.py) dengan schema
+kanonik yang ringkas (lihat ais_schema.py), jadi normalisasi hanya terjadi
+sekali di sini, bukan di tiap script analisis. Kolom `original` (NMEA mentah)
+dipindah ke payload_store; tabel posisi hanya menyimpan `payload_ref`.
+Baris yang tidak lolos validasi dialihkan ke partisi quarantine dengan kode
+alasan (lihat ais_validate.py), dan laporan posisi ganda dibuang saat
+ingest dan saat compact per hari (lihat ais_dedup.py).
+
+Mode `--append` untuk update harian: hanya record dengan waktu > watermark
+(waktu terbaru yang sudah di-ingest, disimpan di _watermark.json) yang
+ditulis, dan hanya partisi hari yang tersentuh yang di-compact serta
+view turunannya (ais_views.py) dihitung ulang.
+
+Pemakaian:
+    python V1/ais_ingest.py                                   # default path, bangun ulang penuh
+    python V1/ais_ingest.py data/maritim.ais.json data/ais_store --chunk 200000
+    python V1/ais_ingest.py data/export_harian.json --append  # tambah data baru saja
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ais_dedup import Deduplicator, POS_TOL_DEG, TIME_TOL_MS
+from ais_schema import canonical_schema, to_canonical
+from ais_store import POSITIONS, STORE, compact, list_partitions, write_positions
+from ais_validate import Validator
+from ais_views import update_views
+from payload_store import PayloadStore
+
+SRC = Path("data/maritim.ais.json")
+DST = STORE
+CHUNK = 200_000                      # baris per chunk (batas RAM)
+BLOCK = 8 * 1024 * 1024              # byte yang dibaca per blok dari file
+WATERMARK = "_watermark.json"
+
+NUMERIC_COLS = ["mmsi", "lat", "lon", "sog", "aistype"]
+
+_WS = " \t\r\n,"
+
+
+# ────────────────────────── parser streaming ──────────────────────────
+def iter_records(path, block_size=BLOCK):
+    """
+    Yield dict per dokumen dari export mongoexport.
+    Mendukung format array (`--jsonArray`) maupun satu dokumen per baris.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(block_size)
+        eof = not buf
+        pos = 0
+
+        # lewati pembuka array kalau ada
+        while pos < len(buf) and buf[pos] in _WS:
+            pos += 1
+        if pos < len(buf) and buf[pos] == "[":
+            pos += 1
+
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            if pos >= len(buf):
+                if eof:
+                    return
+                buf, pos = f.read(block_size), 0
+                eof = not buf
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # dokumen terpotong di batas blok → sambung blok berikutnya
+                more = f.read(block_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+
+            yield obj
+            pos = end
+
+
+def iter_chunks(path, chunk_rows=CHUNK, block_size=BLOCK):
+    """Kelompokkan hasil iter_records jadi list berisi maksimal `chunk_rows` dokumen."""
+    chunk = []
+    for rec in iter_records(path, block_size):
+        chunk.append(rec)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ────────────────────────── normalisasi ──────────────────────────
+def _unwrap(col, key):
+    """{'$key': v} → v secara vektor; nilai yang bukan dict dibiarkan apa adanya."""
+    if col.dtype != object:
+        return col
+    inner = col.str.get(key)
+    return inner.where(inner.notna(), col)
+
+
+def normalize_extended_json(df):
+    """
+    Ubah kolom Extended JSON ke tipe biasa tanpa loop per baris:
+      _id        {'$oid': ...}                     → string
+      created_at {'$date': iso | {'$numberLong'}}  → datetime UTC
+      angka      {'$numberInt'/'$numberLong'/'$numberDouble': ...} → numerik
+    """
+    if "_id" in df.columns:
+        df["_id"] = _unwrap(df["_id"], "$oid").astype("string")
+
+    if "created_at" in df.columns:
+        raw = _unwrap(df["created_at"], "$date")
+        epoch = pd.to_numeric(_unwrap(raw, "$numberLong"), errors="coerce")
+        is_epoch = epoch.notna()
+        # kedua cabang disamakan ke epoch ms dulu: hasil ISO bisa ber-unit [s] / [us],
+        # dan menimpa sebagiannya dengan nilai [ms] ditolak pandas 3
+        iso = pd.to_datetime(raw.where(~is_epoch), utc=True, format="ISO8601", errors="coerce")
+        iso_ms = (iso - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+        ms = epoch.where(is_epoch, iso_ms)
+        df["created_at"] = pd.to_datetime(ms, unit="ms", utc=True).dt.as_unit("ms")
+
+    for c in NUMERIC_COLS:
+        if c not in df.columns:
+            continue
+        col = df[c]
+        for key in ("$numberInt", "$numberLong", "$numberDouble"):
+            col = _unwrap(col, key)
+        df[c] = pd.to_numeric(col, errors="coerce")
+    return df
+
+
+# ────────────────────────── writer ──────────────────────────
+def conform(df, schema, payloads, dedup=None, after=None, validator=None, tag="0"):
+    """
+    Chunk → pa.Table kanonik; kolom asing yang belum ada di schema dibuang.
+    Baris dengan waktu ≤ `after` (watermark) dilewati, baris tidak valid
+    dialihkan `validator` ke quarantine (tanpa validator: baris tanpa waktu
+    dibuang), duplikat dibuang `dedup`, lalu `original` ditulis sebagai segmen
+    baru di `payloads` dan diganti `payload_ref`.
+    """
+    extra = [c for c in df.columns if c not in ("created_at", "original") and c not in schema.names]
+    if extra:
+        print(f"   ⚠  kolom baru diabaikan: {extra}")
+    tbl = to_canonical(df, schema)
+    original = df["original"] if "original" in df.columns else pd.Series([None] * len(df))
+    original = pa.array(original.astype("string"), type=pa.string(), from_pandas=True)
+
+    if after is not None:
+        keep = pc.or_kleene(pc.is_null(tbl["ts"]), pc.greater(tbl["ts"], after))
+        tbl, original = tbl.filter(keep), original.filter(keep)
+    if validator is not None:
+        tbl, original = validator.split(tbl, original, tag)
+    else:
+        keep = tbl["ts"].is_valid()
+        tbl, original = tbl.filter(keep), original.filter(keep)
+    if dedup is not None:
+        keep = pa.array(dedup.keep_mask(tbl))
+        tbl, original = tbl.filter(keep), original.filter(keep)
+
+    refs = payloads.append(original)
+    i = tbl.schema.get_field_index("payload_ref")
+    return tbl.set_column(i, "payload_ref", pa.array(refs, type=pa.int64()))
+
+
+# ────────────────────────── watermark ──────────────────────────
+def read_watermark(root=DST):
+    """Waktu (epoch ms) record terbaru yang sudah ada di store; None kalau belum pernah ingest."""
+    path = Path(root) / WATERMARK
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())["ts"]
+
+
+def write_watermark(root, ts):
+    path = Path(root) / WATERMARK
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"ts": int(ts), "utc": str(pd.Timestamp(int(ts), unit="ms", tz="UTC"))}))
+    os.replace(tmp, path)
+
+
+def _store_schema(root):
+    """Schema positions yang sudah ada, supaya chunk append konsisten dengan data lama."""
+    for _, part in list_partitions(root, POSITIONS):
+        for f in part.glob("data.parquet"):
+            return pq.read_schema(f)
+    return None
+
+
+# ────────────────────────── ingest ──────────────────────────
+def ingest(src=SRC, dst=DST, chunk_rows=CHUNK, dedup=None, append=False, validate=True):
+    """
+    Konversi export JSON → dataset terpartisi harian di `dst`.
+
+    append=False : store dibangun ulang penuh (ditulis ke `dst.tmp` lalu ditukar).
+    append=True  : hanya record setelah watermark yang ditambahkan ke store yang ada.
+    `dedup`      : Deduplicator (atau None untuk menyimpan semua baris apa adanya).
+    validate     : alihkan baris tidak valid ke quarantine (lihat ais_validate.py).
+    """
+    dst = Path(dst)
+    if append:
+        target = dst
+        after = read_watermark(dst)
+        schema = _store_schema(dst)
+        # sisa part-*.parquet = run append sebelumnya gagal sebelum compact → buang
+        for _, part in list_partitions(dst, POSITIONS):
+            for f in part.glob("part-*.parquet"):
+                f.unlink()
+        if after is not None:
+            print(f"   ✔  watermark: {pd.Timestamp(after, unit='ms', tz='UTC')}")
+    else:
+        target = dst.with_name(dst.name + ".tmp")
+        if target.exists():
+            shutil.rmtree(target)
+        after, schema = None, None
+
+    run = time.strftime("%Y%m%d%H%M%S")
+    payloads = PayloadStore(target)
+    validator = Validator(target, run) if validate else None
+    touched = set()
+    newest = after
+    total = 0
+    seen_any = False
+    for i, records in enumerate(iter_chunks(src, chunk_rows)):
+        seen_any = True
+        df = normalize_extended_json(pd.DataFrame.from_records(records))
+        del records
+
+        if schema is None:
+            schema = canonical_schema(df.columns)
+        tag = f"{run}-{i:05d}"
+        tbl = conform(df, schema, payloads, dedup, after, validator, tag)
+        del df
+        if tbl.num_rows == 0:
+            continue
+        touched.update(p.parent for p in write_positions(tbl, target, tag=tag))
+
+        chunk_max = pc.max(tbl["ts"]).as_py()
+        newest = chunk_max if newest is None else max(newest, chunk_max)
+        total += tbl.num_rows
+        print(f"   ✔  chunk {i}: {tbl.num_rows:,} baris (total {total:,})")
+
+    if not seen_any and not append:
+        raise RuntimeError(f"Tidak ada dokumen di {src}")
+    if validator is not None:
+        print(f"   ✔  validasi: {validator.report()}")
+
+    print(f"➜  Compact {len(touched)} partisi (urut Z-order, row group + statistik bbox) ...")
+    compact(target, partitions=sorted(touched), dedup=dedup)
+    if dedup is not None:
+        print(f"   ✔  dedup: {dedup.report()}")
+        freed, removed = payloads.discard(dedup.take_orphans())
+        if freed:
+            print(f"   ♻  {freed:,} payload duplikat dikosongkan, {removed} segmen dihapus")
+    print("➜  Update view turunan untuk partisi yang sama ...")
+    update_views(target, days=sorted(touched))
+    if newest is not None:
+        write_watermark(target, newest)
+
+    if not append:
+        # ganti store lama hanya kalau ingest selesai utuh
+        if dst.exists():
+            shutil.rmtree(dst)
+        target.rename(dst)
+    return total
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Ingest export MongoDB AIS ke dataset Parquet terpartisi")
+    ap.add_argument("src", nargs="?", default=SRC, type=Path)
+    ap.add_argument("dst", nargs="?", default=DST, type=Path)
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="jumlah baris per chunk")
+    ap.add_argument("--append", action="store_true",
+                    help="tambahkan hanya record setelah watermark ke store yang sudah ada")
+    ap.add_argument("--no-validate", action="store_true", help="jangan alihkan baris tidak valid ke quarantine")
+    ap.add_argument("--no-dedup", action="store_true", help="jangan buang laporan ganda")
+    ap.add_argument("--dedup-time-tol", type=float, default=TIME_TOL_MS / 1000,
+                    help="toleransi waktu dedup (detik)")
+    ap.add_argument("--dedup-pos-tol", type=float, default=POS_TOL_DEG,
+                    help="toleransi posisi dedup (derajat)")
+    args = ap.parse_args()
+
+    dedup = None if args.no_dedup else Deduplicator(args.dedup_time_tol * 1000, args.dedup_pos_tol)
+
+    start = time.time()
+    mode = "append" if args.append else "bangun ulang"
+    print(f"➜  Ingest {args.src} → {args.dst} ({mode}, chunk {args.chunk:,} baris)")
+    n = ingest(args.src, args.dst, args.chunk, dedup, args.append, not args.no_validate)
+    print(f"✅  {n:,} baris ditulis ke {args.dst} dalam {time.time() - start:.1f} detik")
@@ -0,0 +1,275 @@
+"""
+Pipeline artefak turunan (slice wilayah, sampel 500k, mapping ship type,
+merge vessel_type) dengan cache berbasis hash konten.
+
+Tiap langkah dideklarasikan sebagai node: fungsi + dependensi (node lain dan
+file/direktori sumber) + parameter. Output node disimpan di
+
+    data/derived/<node>/<key>/
+
+dengan `key` = hash dari kode fungsi, parameter, hash konten sumber, dan key
+node dependensinya. Kalau direktori untuk key itu sudah ada, node tidak
+dijalankan lagi; yang dibangun ulang hanya node yang basi. Node yang saling
+independen dijalankan paralel di process pool. Setelah selesai, artefak bisa
+di-"publish" (symlink) ke path lama (mis. data/maritim_selat_sunda.pkl)
+supaya script yang masih pakai read_pickle tetap jalan.
+
+Pemakaian:
+    python V1/ais_pipeline.py                               # semua node yang basi
+    python V1/ais_pipeline.py maritim_selat_sunda_500k      # node ini + dependensinya
+    python V1/ais_pipeline.py --dry-run                     # tampilkan rencana saja
+    python V1/ais_pipeline.py -j 4
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from ais_store import POSITIONS, SELAT_SUNDA, SELAT_SUNDA_LUAS, STORE, load_positions
+from payload_store import PAYLOADS
+from vessel_dim import VESSELS
+from vessel_lookup import VESSEL_TYPE_CSV, VesselLookup, attach_vessel_attrs
+
+DERIVED = Path("data/derived")
+HASH_CACHE = DERIVED / "_filehash.json"
+JOBS = 2
+
+
+@dataclass
+class Node:
+    name: str
+    fn: object
+    deps: tuple = ()
+    sources: tuple = ()
+    params: dict = field(default_factory=dict)
+    publish: str = None
+
+
+NODES = {}
+
+
+def node(name, deps=(), sources=(), publish=None, **params):
+    """Daftarkan fungsi `fn(inputs, out, **params)` sebagai node pipeline."""
+    def register(fn):
+        NODES[name] = Node(name, fn, tuple(deps), tuple(str(s) for s in sources), params, publish)
+        return fn
+    return register
+
+
+# ────────────────────────── definisi node ──────────────────────────
+@node("maritim_selat_sunda", sources=[STORE / POSITIONS],
+      publish="data/maritim_selat_sunda.pkl", bbox=SELAT_SUNDA_LUAS)
+def maritim_selat_sunda(inputs, out, bbox):
+    """Potongan wilayah Selat Sunda (pengganti slicing-selat-sunda.py)."""
+    df = load_positions(bbox=bbox, utc=True).rename(columns={'utc': 'created_at'})
+    df.to_pickle(out / "data.pkl")
+
+
+@node("maritim_selat_sunda_500k", sources=[STORE / POSITIONS],
+      publish="data/maritim_selat_sunda_500k.pkl", bbox=SELAT_SUNDA, rows=500_000, mode="tracks", seed=0)
+def maritim_selat_sunda_500k(inputs, out, bbox, rows, mode, seed):
+    """
+    Subset kecil untuk eksperimen (pengganti cut_data_to_500k.py): track utuh
+    per MMSI dengan seed tetap, bukan head(500_000). Lihat ais_sample.py.
+    """
+    from ais_sample import sample_positions
+    df = sample_positions(rows=rows, mode=mode, seed=seed, bbox=bbox, utc=True)
+    df.rename(columns={'utc': 'created_at'}).to_pickle(out / "data.pkl")
+
+
+@node("vessel_dim", sources=[STORE / POSITIONS, STORE / PAYLOADS])
+def vessel_dim(inputs, out):
+    """
+    Satu-satunya node yang memperbarui tabel dimensi kapal di store
+    (vessel_dim.update_vessels); salinannya disimpan di output node supaya node
+    lain membaca snapshot yang sama, bukan file store yang bisa berubah.
+    """
+    from vessel_dim import update_vessels
+    update_vessels(STORE)
+    if (STORE / VESSELS).exists():
+        shutil.copy2(STORE / VESSELS, out / VESSELS)
+
+
+@node("ship_type_mapper", deps=["vessel_dim"])
+def ship_type_mapper(inputs, out):
+    """Mapping MMSI → ship_type_code dari tabel dimensi kapal (fase A extract_ship_type.py)."""
+    from extract_ship_type import build_mapper
+    build_mapper(inputs["vessel_dim"], update=False).to_parquet(out / "data.parquet", index=False)
+
+
+@node("maritim_with_ship_type", deps=["maritim_selat_sunda", "ship_type_mapper"],
+      publish="data/maritim_with_ship_type.pkl")
+def maritim_with_ship_type(inputs, out):
+    """Dataset + ship_type_code/ship_group (fase B extract_ship_type.py)."""
+    from extract_ship_type import attach_ship_type
+    df = pd.read_pickle(inputs["maritim_selat_sunda"] / "data.pkl")
+    mapper = pd.read_parquet(inputs["ship_type_mapper"] / "data.parquet")
+    attach_ship_type(df, mapper).to_pickle(out / "data.pkl")
+
+
+@node("maritim_selat_sunda_with_type", deps=["maritim_selat_sunda", "vessel_dim"],
+      sources=[VESSEL_TYPE_CSV], publish="data/maritim_selat_sunda_with_type.pkl")
+def maritim_selat_sunda_with_type(inputs, out):
+    """
+    Dataset + vessel_type, hanya untuk script lama yang masih read_pickle.
+    Kode baru sebaiknya pakai vessel_lookup.attach_vessel_attrs langsung.
+    """
+    df = pd.read_pickle(inputs["maritim_selat_sunda"] / "data.pkl")
+    lookup = VesselLookup(root=inputs["vessel_dim"], csv=VESSEL_TYPE_CSV)
+    attach_vessel_attrs(df, ["vessel_type"], lookup).to_pickle(out / "data.pkl")
+
+
+# ────────────────────────── hash ──────────────────────────
+def _file_digest(path, cache):
+    """sha256 isi file; di-cache per (size, mtime) supaya file besar tidak di-hash ulang tiap run."""
+    st = path.stat()
+    stamp = f"{st.st_size}:{st.st_mtime_ns}"
+    hit = cache.get(str(path))
+    if hit and hit[0] == stamp:
+        return hit[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    cache[str(path)] = [stamp, h.hexdigest()]
+    return h.hexdigest()
+
+
+def source_digest(path, cache):
+    """Hash konten file, atau gabungan (path relatif, hash) semua file di direktori."""
+    path = Path(path)
+    if not path.exists():
+        return "missing"
+    if path.is_file():
+        return _file_digest(path, cache)
+    h = hashlib.sha256()
+    for f in sorted(p for p in path.rglob("*") if p.is_file() and not p.name.endswith(".tmp")):
+        h.update(str(f.relative_to(path)).encode())
+        h.update(_file_digest(f, cache).encode())
+    return h.hexdigest()
+
+
+def node_key(n, dep_keys, cache):
+    spec = {
+        "name": n.name,
+        "code": inspect.getsource(n.fn),
+        "params": n.params,
+        "deps": {d: dep_keys[d] for d in n.deps},
+        "sources": {s: source_digest(s, cache) for s in n.sources},
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+# ────────────────────────── eksekusi ──────────────────────────
+def output_dir(name, key):
+    return DERIVED / name / key
+
+
+def is_built(name, key):
+    return (output_dir(name, key) / "_SUCCESS").exists()
+
+
+def _closure(targets):
+    """Node target + semua dependensinya, urut topologis."""
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for d in NODES[name].deps:
+            visit(d)
+        order.append(name)
+
+    for t in targets:
+        visit(t)
+    return order
+
+
+def _run_node(name, key, inputs):
+    """Dijalankan di worker: build ke direktori sementara lalu rename (atomik)."""
+    n = NODES[name]
+    out = output_dir(name, key)
+    tmp = out.with_name(out.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    t0 = time.time()
+    n.fn({k: Path(v) for k, v in inputs.items()}, tmp, **n.params)
+    (tmp / "_SUCCESS").write_text(json.dumps({"seconds": round(time.time() - t0, 2)}))
+    tmp.rename(out)
+    return name
+
+
+def _publish(n, key):
+    (DERIVED / n.name / "latest").write_text(key)
+    if not n.publish:
+        return
+    artefact = next(p for p in output_dir(n.name, key).iterdir() if p.name != "_SUCCESS")
+    link = Path(n.publish)
+    if link.is_symlink() or link.exists():
+        link.unlink()
+    try:
+        os.symlink(artefact.resolve(), link)
+    except OSError:
+        shutil.copy2(artefact, link)     # filesystem tanpa dukungan symlink
+
+
+def build(targets=None, jobs=JOBS, dry_run=False):
+    """Bangun node `targets` (default semua) yang basi; return daftar node yang dijalankan."""
+    DERIVED.mkdir(parents=True, exist_ok=True)
+    cache = json.loads(HASH_CACHE.read_text()) if HASH_CACHE.exists() else {}
+    order = _closure(targets or list(NODES))
+
+    keys = {}
+    for name in order:
+        keys[name] = node_key(NODES[name], keys, cache)
+    HASH_CACHE.write_text(json.dumps(cache))
+
+    stale = [name for name in order if not is_built(name, keys[name])]
+    for name in order:
+        state = "BASI" if name in stale else "ok"
+        print(f"   {state:>4}  {name:<32} {keys[name]}")
+    if dry_run or not stale:
+        return stale
+
+    pending, running, done = list(stale), {}, set(order) - set(stale)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in [p for p in pending if all(d in done for d in NODES[p].deps)]:
+                inputs = {d: str(output_dir(d, keys[d])) for d in NODES[name].deps}
+                running[pool.submit(_run_node, name, keys[name], inputs)] = name
+                pending.remove(name)
+                print(f"➜  {name} ...")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                fut.result()                    # lempar error node ke sini
+                _publish(NODES[name], keys[name])
+                done.add(name)
+                print(f"   ✔  {name}")
+    return stale
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bangun artefak turunan yang basi (cache hash konten)")
+    ap.add_argument("targets", nargs="*", help=f"default: semua node ({', '.join(NODES)})")
+    ap.add_argument("-j", "--jobs", type=int, default=JOBS, help="jumlah node paralel")
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+    unknown = [t for t in args.targets if t not in NODES]
+    if unknown:
+        ap.error(f"node tidak dikenal: {', '.join(unknown)}")
+
+    t0 = time.time()
+    built = build(args.targets or None, args.jobs, args.dry_run)
+    verb = "basi" if args.dry_run else "dibangun"
+    print(f"✅  {len(built)} node {verb} dalam {time.time() - t0:.1f} detik")
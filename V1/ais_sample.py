@@ -0,0 +1,202 @@
+"""
+Subset representatif dari ais_store untuk eksperimen / benchmark detektor.
+
+Dulu subset dibuat dengan `df.head(500_000)`: isinya cuma baris yang kebetulan
+paling depan di file (beberapa hari / beberapa kapal), jadi waktu jalan di
+file 500k tidak menggambarkan perilaku di data penuh. Di sini sampel dibuat
+dalam satu pass streaming per partisi hari, dengan seed tetap:
+
+- mode "strata"  : stratified per (hari, MMSI); tiap strata diambil
+                   proporsional (pembulatan acak) dan minimal MIN_PER_STRATUM
+                   baris, jadi sebaran hari dan kapal sama dengan data penuh.
+                   Kelebihan akibat minimum itu diambil dari strata terbesar,
+                   jadi total per hari tetap ≈ n × frac; hanya kalau jumlah
+                   strata × minimum sudah melebihi target, total ikut naik.
+- mode "tracks"  : sampling track utuh per MMSI; MMSI dipilih lewat hash
+                   ber-seed (keputusan sama di semua hari), jadi track tidak
+                   bolong dan pasangan kapal yang sama-sama terpilih tetap utuh.
+                   MMSI di `include` selalu diambil (mis. pasangan hasil deteksi).
+
+Fraksi sampling dihitung dari target `rows` dan perkiraan jumlah baris yang
+dibaca dari footer Parquet saja (statistik row group vs bbox), tanpa pass
+tambahan.
+
+Pemakaian:
+    python V1/ais_sample.py --rows 500000 --mode tracks --out data/sample_tracks_500k.parquet
+    python V1/ais_sample.py --rows 500000 --mode strata --seed 1 --out data/sample_strata_500k.pkl
+    python V1/ais_sample.py --frac 0.05 --start 2024-08-01 --end 2024-09-01 --include pair.csv
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ais_schema import MS_PER_DAY, ms_to_datetime, to_epoch_ms
+from ais_store import SELAT_SUNDA, STORE, list_partitions, load_positions, row_group_stats
+
+MODES = ("strata", "tracks")
+SEED = 0
+MIN_PER_STRATUM = 1
+GOLDEN = 0x9E3779B97F4A7C15     # pengacak seed (Fibonacci hashing)
+
+
+# ────────────────────────── perkiraan ukuran ──────────────────────────
+def estimate_rows(root=STORE, start=None, end=None, bbox=None):
+    """
+    Perkiraan jumlah baris di [start, end) ∩ bbox dari footer Parquet: row group
+    yang beririsan dihitung sebanding luas irisan bbox-nya.
+    """
+    stats = row_group_stats(root, start, end)
+    if stats.empty:
+        return 0
+    if bbox is None:
+        return int(stats["rows"].sum())
+    lat_min, lat_max, lon_min, lon_max = bbox
+    h = stats["lat_max"] - stats["lat_min"]
+    w = stats["lon_max"] - stats["lon_min"]
+    dh = np.minimum(stats["lat_max"], lat_max) - np.maximum(stats["lat_min"], lat_min)
+    dw = np.minimum(stats["lon_max"], lon_max) - np.maximum(stats["lon_min"], lon_min)
+    # row group selebar nol (satu garis / titik) dihitung penuh kalau ada di dalam bbox
+    frac = (np.where(h > 1e-9, dh.clip(lower=0) / h, dh >= 0) *
+            np.where(w > 1e-9, dw.clip(lower=0) / w, dw >= 0))
+    return int(np.round((stats["rows"] * frac.clip(0, 1)).sum()))
+
+
+# ────────────────────────── pemilihan baris ──────────────────────────
+def mmsi_hash_mask(mmsi, frac, seed=SEED):
+    """True untuk MMSI yang hash ber-seed-nya < frac (keputusan sama untuk MMSI yang sama)."""
+    key = np.asarray(mmsi, dtype=np.uint64) ^ np.uint64(seed * GOLDEN % 2 ** 64)
+    h = pd.util.hash_array(key, categorize=False)
+    if frac >= 1.0:
+        return np.ones(len(h), dtype=bool)
+    return h < np.uint64(int(frac * 2 ** 64))
+
+
+def cap_quota(quota, floor, target, rng):
+    """
+    Turunkan quota strata terbesar (tidak di bawah `floor`) sampai total ≤ target:
+    semua quota dipotong di satu batas c, sisa target dibagi acak +1 ke strata yang terpotong.
+    """
+    def total(c):
+        return int(np.maximum(np.minimum(quota, c), floor).sum())
+
+    if total(quota.max()) <= target:
+        return quota
+    lo, hi = 0, int(quota.max())        # total(lo) ≤ target (atau floor saja) < total(hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        lo, hi = (mid, hi) if total(mid) <= target else (lo, mid)
+    capped = np.maximum(np.minimum(quota, lo), floor)
+    slack = target - int(capped.sum())
+    if slack > 0:
+        over = np.flatnonzero(quota > capped)
+        capped[rng.permutation(over)[:slack]] += 1
+    return capped
+
+
+def strata_take(mmsi, frac, rng, min_per=MIN_PER_STRATUM):
+    """
+    Index baris sampel proporsional per MMSI (dalam satu hari), urut naik.
+    Total ≈ len(mmsi) × frac (pembulatan acak); minimum `min_per` per strata
+    dibayar dari strata terbesar, kecuali jumlah strata × min_per > target.
+    """
+    mmsi = np.asarray(mmsi)
+    n = len(mmsi)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.lexsort((rng.random(n), mmsi))
+    sm = mmsi[order]
+    first = np.flatnonzero(np.r_[True, sm[1:] != sm[:-1]])
+    counts = np.diff(np.r_[first, n])
+    quota = np.floor(counts * frac + rng.random(len(counts))).astype(np.int64)
+    floor = np.minimum(counts, min_per)
+    quota = np.minimum(counts, np.maximum(quota, floor))
+    quota = cap_quota(quota, floor, int(np.floor(n * frac + rng.random())), rng)
+    rank = np.arange(n) - np.repeat(first, counts)
+    return np.sort(order[rank < np.repeat(quota, counts)])
+
+
+# ────────────────────────── sampling ──────────────────────────
+def sample_positions(root=STORE, rows=None, frac=None, mode="tracks", seed=SEED,
+                     start=None, end=None, bbox=SELAT_SUNDA, include=(), columns=None,
+                     min_per=MIN_PER_STRATUM, utc=False):
+    """
+    Sampel posisi dari ais_store dalam satu pass per partisi hari.
+
+    rows / frac : target jumlah baris (fraksi diperkirakan dari footer) atau fraksi langsung
+    mode        : "strata" (per hari × MMSI) atau "tracks" (track utuh per MMSI)
+    include     : MMSI yang selalu diambil utuh (mode "tracks")
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode harus salah satu dari {MODES}, bukan {mode!r}")
+    if frac is None:
+        if rows is None:
+            raise ValueError("isi salah satu: rows atau frac")
+        total = estimate_rows(root, start, end, bbox)
+        frac = 1.0 if total <= rows else rows / total
+    include = np.asarray(sorted({int(m) for m in include}), dtype=np.uint32)
+
+    lo, hi = to_epoch_ms(start), to_epoch_ms(end)
+    parts = []
+    for day, _ in list_partitions(root):
+        d0 = to_epoch_ms(day)
+        if (lo is not None and d0 + MS_PER_DAY <= lo) or (hi is not None and d0 >= hi):
+            continue
+        d_start = pd.Timestamp(max(d0, lo or d0), unit="ms", tz="UTC")
+        d_end = pd.Timestamp(min(d0 + MS_PER_DAY, hi or d0 + MS_PER_DAY), unit="ms", tz="UTC")
+        df = load_positions(root, start=d_start, end=d_end, bbox=bbox, columns=columns)
+        if df.empty:
+            continue
+        mmsi = df["mmsi"].to_numpy(dtype=np.uint32, na_value=0)
+        if mode == "tracks":
+            keep = mmsi_hash_mask(mmsi, frac, seed) | np.isin(mmsi, include)
+            df = df[keep]
+        else:
+            rng = np.random.default_rng([seed, d0 // MS_PER_DAY])
+            df = df.iloc[strata_take(mmsi, frac, rng, min_per)]
+        parts.append(df)
+
+    if not parts:
+        raise FileNotFoundError(f"Tidak ada posisi di {root} untuk rentang {start} – {end}")
+    out = pd.concat(parts, ignore_index=True)
+    if utc:
+        out["utc"] = ms_to_datetime(out["ts"])
+    return out
+
+
+def _read_include(path):
+    if path is None:
+        return ()
+    df = pd.read_csv(path, dtype=str)
+    cols = [c for c in df.columns if c.startswith("mmsi")] or df.columns[:1]
+    return pd.to_numeric(df[cols].stack(), errors="coerce").dropna().astype(np.int64).unique()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Sampel representatif ais_store (pengganti head(500_000))")
+    ap.add_argument("--root", type=Path, default=STORE)
+    size = ap.add_mutually_exclusive_group(required=True)
+    size.add_argument("--rows", type=int, help="target jumlah baris")
+    size.add_argument("--frac", type=float, help="fraksi baris / MMSI")
+    ap.add_argument("--mode", choices=MODES, default="tracks")
+    ap.add_argument("--seed", type=int, default=SEED)
+    ap.add_argument("--start")
+    ap.add_argument("--end")
+    ap.add_argument("--all-area", action="store_true", help="tanpa filter bbox Selat Sunda")
+    ap.add_argument("--include", help="CSV berisi kolom mmsi* yang selalu diambil (mode tracks)")
+    ap.add_argument("--out", type=Path, required=True, help=".parquet atau .pkl")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    df = sample_positions(args.root, args.rows, args.frac, args.mode, args.seed, args.start, args.end,
+                          None if args.all_area else SELAT_SUNDA, _read_include(args.include),
+                          utc=args.out.suffix == ".pkl")
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    if args.out.suffix == ".pkl":
+        df.rename(columns={"utc": "created_at"}).to_pickle(args.out)
+    else:
+        df.to_parquet(args.out, index=False)
+    print(f"✅ {len(df):,} baris, {df['mmsi'].nunique():,} kapal "
+          f"({args.mode}, seed {args.seed}) → {args.out} dalam {time.time() - t0:.1f} detik")
@@ -0,0 +1,123 @@
+"""
+Schema kanonik posisi AIS, dinormalisasi sekali saat ingest.
+
+Sebelumnya tiap script membereskan schema sendiri-sendiri (created_at kadang
+dict {'$date': ...}, mmsi kadang int kadang str, sog di-`to_numeric` tiap run).
+Sekarang store hanya berisi tipe ringkas di bawah, jadi detektor tinggal pakai:
+
+    _id       fixed_size_binary(12)   ObjectId mentah (12 byte, bukan hex 24 char)
+    ts        int64                   waktu epoch milidetik UTC
+    mmsi      uint32
+    lat, lon  float32
+    sog       float32
+    aistype   uint8
+    payload_ref int64                 referensi ke kalimat NMEA mentah di payload_store
+
+Kolom lain yang tidak dikenal disimpan sebagai string.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+CANONICAL = pa.schema([
+    ("_id", pa.binary(12)),
+    ("ts", pa.int64()),
+    ("mmsi", pa.uint32()),
+    ("lat", pa.float32()),
+    ("lon", pa.float32()),
+    ("sog", pa.float32()),
+    ("aistype", pa.uint8()),
+    ("payload_ref", pa.int64()),
+])
+KNOWN = set(CANONICAL.names) | {"created_at", "original"}
+
+MS_PER_DAY = 86_400_000
+
+
+# ────────────────────────── konversi waktu ──────────────────────────
+def to_epoch_ms(t):
+    """Timestamp/string (naive dianggap UTC) → epoch milidetik; None tetap None."""
+    if t is None:
+        return None
+    t = pd.Timestamp(t)
+    t = t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+    return t.value // 1_000_000
+
+
+def ms_to_datetime(ts):
+    """Array/Series epoch ms → datetime64[ms, UTC] (vektor)."""
+    return pd.to_datetime(ts, unit="ms", utc=True)
+
+
+def oid_hex(col):
+    """Kolom _id biner → string hex 24 karakter (untuk ditampilkan / join ke MongoDB)."""
+    return pd.Series([b.hex() if b is not None else None for b in col], dtype="string")
+
+
+# ────────────────────────── builder kolom ──────────────────────────
+def _uint_array(col, typ):
+    num = pd.to_numeric(col, errors="coerce")
+    vals = num.to_numpy(dtype=np.float64, na_value=np.nan)
+    info = np.iinfo(typ.to_pandas_dtype())
+    mask = np.isnan(vals) | (vals < info.min) | (vals > info.max)
+    vals = np.where(mask, 0, vals).astype(typ.to_pandas_dtype())
+    return pa.array(vals, type=typ, mask=mask)
+
+
+def _float32_array(col):
+    vals = pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    return pa.array(vals, type=pa.float32(), from_pandas=True)
+
+
+def _ts_array(col):
+    created = pd.to_datetime(col, utc=True, errors="coerce")
+    vals = pd.DatetimeIndex(created).as_unit("ms").asi8
+    return pa.array(vals, type=pa.int64(), mask=created.isna().to_numpy())
+
+
+def _oid_array(col):
+    """Hex ObjectId 24 karakter → 12 byte biner; nilai tidak valid jadi null."""
+    s = col.astype("string")
+    ok = s.str.fullmatch(r"[0-9a-fA-F]{24}").fillna(False).to_numpy(dtype=bool)
+    raw = np.zeros((len(s), 12), dtype=np.uint8)
+    if ok.any():
+        raw[ok] = np.frombuffer(bytes.fromhex("".join(s[ok].tolist())), dtype=np.uint8).reshape(-1, 12)
+    validity = pa.array(ok).buffers()[1]
+    return pa.FixedSizeBinaryArray.from_buffers(pa.binary(12), len(s), [validity, pa.py_buffer(raw.tobytes())])
+
+
+# ────────────────────────── normalisasi ──────────────────────────
+def canonical_schema(columns):
+    """Schema kanonik + kolom tambahan (string) sesuai urutan kemunculan di export."""
+    extra = [c for c in columns if c not in KNOWN]
+    return pa.schema(list(CANONICAL) + [pa.field(c, pa.string()) for c in extra])
+
+
+def to_canonical(df, schema):
+    """
+    DataFrame hasil parse export (created_at sudah datetime) → pa.Table dengan `schema`.
+    Semua konversi vektor per kolom; kolom yang tidak ada diisi null.
+    `payload_ref` dibiarkan null, diisi ingest setelah `original` masuk payload_store.
+    """
+    n = len(df)
+    builders = {
+        "_id": _oid_array,
+        "ts": _ts_array,
+        "mmsi": lambda c: _uint_array(c, pa.uint32()),
+        "lat": _float32_array,
+        "lon": _float32_array,
+        "sog": _float32_array,
+        "aistype": lambda c: _uint_array(c, pa.uint8()),
+    }
+    source = {"ts": "created_at"}
+
+    arrays = []
+    for field in schema:
+        col = df.get(source.get(field.name, field.name))
+        if col is None:
+            arrays.append(pa.nulls(n, field.type))
+        elif field.name in builders:
+            arrays.append(builders[field.name](col))
+        else:
+            arrays.append(pa.array(col.astype("string"), type=pa.string(), from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
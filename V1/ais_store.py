@@ -0,0 +1,217 @@
+"""
+Dataset AIS terpartisi waktu (Parquet) sebagai pengganti pickle maritim*.pkl.
+
+Layout di disk:
+    data/ais_store/positions/year=2024/month=08/day=01/data.parquet
+
+Loader `load_positions` hanya membuka partisi hari yang masuk rentang waktu,
+hanya membaca kolom yang diminta, dan filter bbox/waktu di-push ke reader
+Parquet (row group yang jelas di luar filter tidak didekode).
+
+Setelah ingest tiap partisi hari di-`compact` jadi satu file yang barisnya
+diurutkan menurut kurva Z-order (lat, lon). Row group jadi berisi titik yang
+berdekatan secara spasial, sehingga statistik min/max lat/lon per row group
+cukup sempit untuk dipakai melewati sebagian besar file saat query bbox.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ais_schema import MS_PER_DAY, ms_to_datetime, to_epoch_ms
+
+STORE = Path("data/ais_store")
+POSITIONS = "positions"
+
+# (lat_min, lat_max, lon_min, lon_max) — kotak yang dipakai di semua script
+SELAT_SUNDA = (-6.5, -5.5, 105.0, 106.0)
+SELAT_SUNDA_LUAS = (-8.0, -4.5, 104.0, 107.0)   # potongan slicing-selat-sunda.py
+
+ROW_GROUP = 8_192       # baris per row group; kecil supaya statistik bbox selektif
+ZORDER_BITS = 16        # resolusi grid Z-order per sumbu (2^16 sel ≈ 300 m di lintang)
+
+
+# ────────────────────────── helper partisi ──────────────────────────
+def partition_dir(root, table, year, month, day):
+    return Path(root) / table / f"year={year:04d}" / f"month={month:02d}" / f"day={day:02d}"
+
+
+def partition_date(path):
+    """Path direktori partisi hari → Timestamp UTC tanggalnya."""
+    path = Path(path)
+    y = int(path.parent.parent.name.split("=")[1])
+    m = int(path.parent.name.split("=")[1])
+    d = int(path.name.split("=")[1])
+    return pd.Timestamp(year=y, month=m, day=d, tz="UTC")
+
+
+def list_partitions(root=STORE, table=POSITIONS):
+    """Daftar (tanggal, path) semua partisi hari, urut waktu."""
+    return sorted((partition_date(d), d) for d in Path(root, table).glob("year=*/month=*/day=*"))
+
+
+# ────────────────────────── tulis ──────────────────────────
+def write_positions(tbl, root=STORE, tag="0", table=POSITIONS):
+    """
+    Tulis satu chunk (pa.Table kanonik, lihat ais_schema) ke partisi harian sesuai `ts`.
+    Tiap (chunk, hari) jadi satu file `part-<tag>.parquet`; `tag` harus unik per chunk.
+    """
+    if tbl.num_rows == 0:
+        return []
+    day = tbl.column("ts").to_numpy() // MS_PER_DAY
+    order = np.argsort(day, kind="stable")
+    days, first = np.unique(day[order], return_index=True)
+    bounds = np.append(first, len(order))
+
+    written = []
+    for k, d in enumerate(days):
+        date = pd.Timestamp(int(d) * MS_PER_DAY, unit="ms")
+        out = partition_dir(root, table, date.year, date.month, date.day)
+        out.mkdir(parents=True, exist_ok=True)
+        path = out / f"part-{tag}.parquet"
+        part = tbl.take(pa.array(order[bounds[k]:bounds[k + 1]]))
+        pq.write_table(part, path, compression="zstd")
+        written.append(path)
+    return written
+
+
+# ────────────────────────── urutan spasial ──────────────────────────
+def _spread_bits(v):
+    """Sisipkan bit 0 di antara tiap bit (16 bit → 32 bit) untuk interleave Morton."""
+    v = v.astype(np.uint64)
+    for shift, mask in ((8, 0x00FF00FF), (4, 0x0F0F0F0F), (2, 0x33333333), (1, 0x55555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def zorder_key(lat, lon, bits=ZORDER_BITS):
+    """Kunci Z-order (Morton) uint64 dari lat/lon derajat; NaN dipetakan ke sel 0."""
+    scale = (1 << bits) - 1
+    y = np.nan_to_num((np.asarray(lat, dtype=np.float64) + 90.0) / 180.0)
+    x = np.nan_to_num((np.asarray(lon, dtype=np.float64) + 180.0) / 360.0)
+    y = (np.clip(y, 0.0, 1.0) * scale).astype(np.uint32)
+    x = (np.clip(x, 0.0, 1.0) * scale).astype(np.uint32)
+    return _spread_bits(x) | (_spread_bits(y) << np.uint64(1))
+
+
+def compact_partition(path, row_group_size=ROW_GROUP, dedup=None):
+    """
+    Gabung semua part-*.parquet di satu partisi hari jadi `data.parquet`,
+    diurutkan Z-order lalu ts, dengan row group kecil + statistik.
+    `dedup` (ais_dedup.Deduplicator) membuang laporan ganda di seluruh hari.
+    """
+    path = Path(path)
+    files = sorted(path.glob("*.parquet"))
+    if not files:
+        return None
+    tbl = ds.dataset([str(f) for f in files], format="parquet").to_table()
+    if dedup is not None:
+        tbl = dedup.dedup_partition(tbl)
+
+    lat = tbl.column("lat").to_numpy(zero_copy_only=False)
+    lon = tbl.column("lon").to_numpy(zero_copy_only=False)
+    t = tbl.column("ts").to_numpy()
+    order = np.lexsort((t, zorder_key(lat, lon)))
+    tbl = tbl.take(pa.array(order))
+
+    tmp = path / "data.parquet.tmp"
+    pq.write_table(tbl, tmp, row_group_size=row_group_size,
+                   compression="zstd", write_statistics=True)
+    out = path / "data.parquet"
+    tmp.replace(out)
+    for f in files:
+        if f != out:
+            f.unlink()
+    return out
+
+
+def compact(root=STORE, table=POSITIONS, partitions=None, dedup=None):
+    """Compact semua partisi (atau hanya `partitions`, list path direktori hari)."""
+    if partitions is None:
+        partitions = [p for _, p in list_partitions(root, table)]
+    for p in partitions:
+        compact_partition(p, dedup=dedup)
+    return len(partitions)
+
+
+def row_group_stats(root=STORE, start=None, end=None, table=POSITIONS):
+    """Statistik min/max lat/lon per row group (dibaca dari footer Parquet saja)."""
+    rows = []
+    for f in partition_files(root, start, end, table):
+        meta = pq.ParquetFile(f).metadata
+        names = meta.schema.names
+        i_lat, i_lon = names.index("lat"), names.index("lon")
+        for rg in range(meta.num_row_groups):
+            g = meta.row_group(rg)
+            s_lat, s_lon = g.column(i_lat).statistics, g.column(i_lon).statistics
+            rows.append({
+                "file": f, "row_group": rg, "rows": g.num_rows,
+                "lat_min": s_lat.min if s_lat is not None else None,
+                "lat_max": s_lat.max if s_lat is not None else None,
+                "lon_min": s_lon.min if s_lon is not None else None,
+                "lon_max": s_lon.max if s_lon is not None else None,
+            })
+    return pd.DataFrame(rows)
+
+
+# ────────────────────────── baca ──────────────────────────
+def build_filter(start=None, end=None, bbox=None):
+    """Ekspresi pyarrow untuk rentang waktu [start, end) dan bbox (lat_min, lat_max, lon_min, lon_max)."""
+    expr = None
+
+    def _and(e):
+        nonlocal expr
+        expr = e if expr is None else expr & e
+
+    if start is not None:
+        _and(ds.field("ts") >= to_epoch_ms(start))
+    if end is not None:
+        _and(ds.field("ts") < to_epoch_ms(end))
+    if bbox is not None:
+        lat_min, lat_max, lon_min, lon_max = bbox
+        _and((ds.field("lat") >= lat_min) & (ds.field("lat") <= lat_max) &
+             (ds.field("lon") >= lon_min) & (ds.field("lon") <= lon_max))
+    return expr
+
+
+def partition_files(root=STORE, start=None, end=None, table=POSITIONS):
+    """File Parquet di partisi hari yang beririsan dengan [start, end)."""
+    start, end = to_epoch_ms(start), to_epoch_ms(end)
+    files = []
+    for day, path in list_partitions(root, table):
+        day = to_epoch_ms(day)
+        if start is not None and day + MS_PER_DAY <= start:
+            continue
+        if end is not None and day >= end:
+            continue
+        files.extend(sorted(str(p) for p in path.glob("*.parquet")))
+    return files
+
+
+def open_dataset(root=STORE, start=None, end=None, table=POSITIONS):
+    files = partition_files(root, start, end, table)
+    if not files:
+        raise FileNotFoundError(f"Tidak ada partisi {table} di {root} untuk rentang {start} – {end}")
+    return ds.dataset(files, format="parquet")
+
+
+def load_positions(root=STORE, start=None, end=None, bbox=None, columns=None, table=POSITIONS, utc=False):
+    """
+    Baca posisi AIS sebagai DataFrame (tipe kanonik, lihat ais_schema).
+
+    start/end : batas waktu [start, end), string atau Timestamp (dianggap UTC)
+    bbox      : (lat_min, lat_max, lon_min, lon_max), mis. SELAT_SUNDA
+    columns   : kolom yang dibaca; None = semua
+    utc       : tambahkan kolom `utc` (datetime64[ms, UTC]) hasil konversi `ts`
+    """
+    if utc and columns is not None and "ts" not in columns:
+        columns = [*columns, "ts"]
+    dataset = open_dataset(root, start, end, table)
+    tbl = dataset.to_table(columns=columns, filter=build_filter(start, end, bbox))
+    df = tbl.to_pandas()
+    if utc:
+        df["utc"] = ms_to_datetime(df["ts"])
+    return df
@@ -0,0 +1,144 @@
+"""
+Validasi posisi AIS saat ingest, semua aturan sebagai mask vektor.
+
+Dulu pengecekan tersebar: `dropna(subset=[...])` di sebagian script,
+`df[df['sog'] >= 0]` di script lain, dan tidak ada yang membuang nilai
+sentinel AIS (sog 102.3 = tidak tersedia, lat 91 / lon 181 = tidak tersedia).
+Di sini tiap baris diberi kode alasan (bit flag uint16). Baris dengan kode ≠ 0
+tidak masuk tabel positions, tapi ditulis ke partisi quarantine beserta
+kodenya, jadi bisa dilihat berapa banyak data yang ditolak tiap aturan:
+
+    data/ais_store/quarantine/run=<waktu_ingest>/part-*.parquet
+
+Aturan posisi hanya berlaku untuk tipe pesan laporan posisi; pesan statis
+(tipe 5 / 24) memang tidak punya lat/lon/sog dan tetap disimpan. Baris tanpa
+aistype (mis. fragmen kedua `!AIVDM,2,2,...` tipe 5, yang tidak bisa didecode
+sendiri) tidak diwajibkan punya posisi/sog/mmsi — hanya nilai yang ada dicek
+rentangnya — supaya vessel_dim.py masih bisa menggabungkan fragmennya. MMSI
+hanya ada di bit awal fragmen pertama, jadi fragmen lanjutan sering tanpa MMSI.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ais_store import STORE
+
+QUARANTINE = "quarantine"
+
+# kode alasan (bit flag)
+MMSI_INVALID = 1 << 0
+TS_NULL = 1 << 1
+POS_NULL = 1 << 2
+LAT_RANGE = 1 << 3
+LON_RANGE = 1 << 4
+NULL_ISLAND = 1 << 5
+SOG_NULL = 1 << 6
+SOG_RANGE = 1 << 7
+
+REASONS = {
+    MMSI_INVALID: "mmsi_invalid",
+    TS_NULL: "ts_null",
+    POS_NULL: "pos_null",
+    LAT_RANGE: "lat_range",
+    LON_RANGE: "lon_range",
+    NULL_ISLAND: "null_island",
+    SOG_NULL: "sog_null",
+    SOG_RANGE: "sog_range",
+}
+
+POSITION_TYPES = [1, 2, 3, 4, 9, 18, 19, 21, 27]     # pesan yang membawa lat/lon
+SOG_TYPES = [1, 2, 3, 9, 18, 19, 27]                 # pesan yang membawa sog
+SOG_NOT_AVAILABLE = 102.25   # sog 102.3 = "tidak tersedia"; float32 jadi dibandingkan ≥ 102.25
+
+
+def _col(tbl, name):
+    """Kolom → float64 numpy (null → NaN)."""
+    return tbl.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+
+
+def reason_codes(tbl):
+    """Kode alasan uint16 per baris tabel kanonik; 0 = valid."""
+    mmsi = _col(tbl, "mmsi")
+    ts = tbl.column("ts").is_null().to_numpy(zero_copy_only=False)
+    lat, lon, sog = _col(tbl, "lat"), _col(tbl, "lon"), _col(tbl, "sog")
+    aistype = _col(tbl, "aistype")
+
+    # null wajib ada posisi/sog/mmsi hanya untuk tipe yang memang membawanya; baris
+    # tanpa tipe (fragmen multi-part) tetap dicek rentang nilainya kalau ada
+    untyped = np.isnan(aistype)
+    need_pos = np.isin(aistype, POSITION_TYPES)
+    need_sog = np.isin(aistype, SOG_TYPES)
+    is_pos = need_pos | untyped
+    has_sog = need_sog | untyped
+
+    code = np.zeros(tbl.num_rows, dtype=np.uint16)
+    with np.errstate(invalid="ignore"):
+        code[(np.isnan(mmsi) & ~untyped) | (mmsi <= 0) | (mmsi > 999_999_999)] |= MMSI_INVALID
+        code[ts] |= TS_NULL
+        code[need_pos & (np.isnan(lat) | np.isnan(lon))] |= POS_NULL
+        code[is_pos & (np.abs(lat) > 90)] |= LAT_RANGE
+        code[is_pos & (np.abs(lon) > 180)] |= LON_RANGE
+        code[is_pos & (lat == 0) & (lon == 0)] |= NULL_ISLAND
+        code[need_sog & np.isnan(sog)] |= SOG_NULL
+        code[has_sog & ((sog < 0) | (sog >= SOG_NOT_AVAILABLE))] |= SOG_RANGE
+    return code
+
+
+def reason_names(code):
+    """Kode bit → 'lat_range|sog_range'."""
+    return "|".join(name for bit, name in REASONS.items() if code & bit)
+
+
+class Validator:
+    """Pisahkan baris valid dan quarantine per chunk, sambil menghitung penolakan per aturan."""
+
+    def __init__(self, root=STORE, run="0"):
+        self.out = Path(root) / QUARANTINE / f"run={run}"
+        self.rows_in = 0
+        self.quarantined = 0
+        self.per_rule = {name: 0 for name in REASONS.values()}
+
+    def split(self, tbl, original, tag):
+        """
+        Return (tbl_valid, original_valid). Baris tidak valid ditulis ke quarantine
+        (payload `original` ikut disimpan inline supaya bisa diperiksa).
+        """
+        code = reason_codes(tbl)
+        bad = code != 0
+        self.rows_in += len(code)
+        if not bad.any():
+            return tbl, original
+
+        for bit, name in REASONS.items():
+            self.per_rule[name] += int((code & bit).astype(bool).sum())
+        self.quarantined += int(bad.sum())
+
+        mask_bad = pa.array(bad)
+        q = tbl.filter(mask_bad).drop_columns(["payload_ref"])
+        q = q.append_column("original", original.filter(mask_bad))
+        q = q.append_column("reason", pa.array(code[bad], type=pa.uint16()))
+        self.out.mkdir(parents=True, exist_ok=True)
+        pq.write_table(q, self.out / f"part-{tag}.parquet", compression="zstd")
+
+        mask_ok = pa.array(~bad)
+        return tbl.filter(mask_ok), original.filter(mask_ok)
+
+    def report(self):
+        pct = 100 * self.quarantined / self.rows_in if self.rows_in else 0.0
+        lines = [f"{self.quarantined:,} baris di-quarantine dari {self.rows_in:,} ({pct:.2f}%)"]
+        lines += [f"      {name:<13} {n:>12,}" for name, n in self.per_rule.items() if n]
+        return "\n".join(lines)
+
+
+def load_quarantine(root=STORE, run=None):
+    """Baca baris quarantine (semua run atau satu run) + kolom `reason_names`."""
+    base = Path(root) / QUARANTINE
+    files = sorted(base.glob(f"run={run or '*'}/*.parquet"))
+    if not files:
+        return pd.DataFrame()
+    df = pd.concat([pq.read_table(f).to_pandas() for f in files], ignore_index=True)
+    df["reason_names"] = df["reason"].map({c: reason_names(c) for c in df["reason"].unique()})
+    return df
@@ -0,0 +1,160 @@
+"""
+View turunan ais_store yang dipartisi per hari, sejajar dengan tabel positions.
+
+Dulu tiap dataset turunan (potongan wilayah, data + vessel_type) dibuat ulang
+dari pickle penuh. Di sini tiap view adalah fungsi DataFrame → DataFrame yang
+dijalankan per partisi hari, jadi setelah append harian cukup hari baru yang
+dihitung ulang:
+
+    data/ais_store/selat_sunda/year=2024/month=08/day=01/data.parquet
+
+Baca view dengan `load_positions(table="selat_sunda")`. Jenis kapal tidak
+di-materialisasi sebagai view; tambahkan saat query dengan
+`vessel_lookup.attach_vessel_attrs`.
+
+View `bin1m` / `bin10m` berisi satu baris per (kapal, bin 1 / 10 menit),
+pengganti `dt.floor('1min')` / `floor('10T')` + `groupby(...).first()` yang
+dulu dihitung ulang di tiap detektor:
+
+    ts                      awal bin (epoch ms), jadi filter waktu / `utc=True` tetap jalan
+    mmsi
+    lat, lon, sog           posisi pertama di bin (sama dengan .first() lama)
+    lat_mean, lon_mean, sog_mean
+    lat_last, lon_last, sog_last
+    ts_first, ts_last, n    waktu posisi pertama / terakhir dan jumlah posisi
+
+Posisi tanpa lat/lon/sog dibuang sebelum di-bin (seperti `dropna` di detektor).
+Bin hanya dihitung dari posisi di dalam SELAT_SUNDA (bbox semua preset
+transhipment), jadi "posisi pertama di bin" adalah posisi pertama di Selat
+Sunda, sama dengan spire_logic.py lama yang memotong wilayah dulu baru
+floor('10T'). Posisi di luar bbox tidak ikut rata-rata / n. Untuk wilayah lain
+pakai tabel positions.
+
+Pemakaian:
+    python V1/ais_views.py                       # hari yang view-nya belum ada / basi
+    python V1/ais_views.py --force               # bangun ulang semua view, semua hari
+    python V1/ais_views.py --view bin10m         # satu view saja
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ais_store import (POSITIONS, ROW_GROUP, SELAT_SUNDA, STORE, list_partitions,
+                       partition_date, partition_dir)
+
+VIEWS = {}
+
+
+def view(name):
+    """Daftarkan fungsi sebagai view per hari dengan nama `name`."""
+    def register(fn):
+        VIEWS[name] = fn
+        return fn
+    return register
+
+
+# ────────────────────────── definisi view ──────────────────────────
+@view("selat_sunda")
+def selat_sunda(df):
+    lat_min, lat_max, lon_min, lon_max = SELAT_SUNDA
+    return df[(df['lat'] >= lat_min) & (df['lat'] <= lat_max) &
+              (df['lon'] >= lon_min) & (df['lon'] <= lon_max)]
+
+
+def resample(df, width_ms):
+    """Satu baris per (bin `width_ms`, mmsi): posisi pertama, rata-rata, terakhir."""
+    df = df.dropna(subset=["mmsi", "lat", "lon", "sog"])
+    mmsi = df["mmsi"].to_numpy()
+    t = df["ts"].to_numpy()
+    b = t - t % width_ms
+    order = np.lexsort((t, mmsi, b))
+    b, mmsi, t = b[order], mmsi[order], t[order]
+    first = np.flatnonzero(np.r_[len(b) > 0, (b[1:] != b[:-1]) | (mmsi[1:] != mmsi[:-1])])
+    last = np.append(first[1:], len(order))[:len(first)] - 1
+    n = last - first + 1
+
+    out = {"ts": b[first], "mmsi": mmsi[first]}
+    cols = {c: df[c].to_numpy(dtype=np.float64)[order] for c in ("lat", "lon", "sog")}
+    for c, v in cols.items():
+        out[c] = v[first].astype(np.float32)
+    for c, v in cols.items():
+        out[f"{c}_mean"] = (np.add.reduceat(v, first) / n).astype(np.float32) if len(v) else v.astype(np.float32)
+    for c, v in cols.items():
+        out[f"{c}_last"] = v[last].astype(np.float32)
+    out.update(ts_first=t[first], ts_last=t[last], n=n.astype(np.uint32))
+    return pd.DataFrame(out)
+
+
+@view("bin1m")
+def bin1m(df):
+    return resample(selat_sunda(df), 60_000)
+
+
+@view("bin10m")
+def bin10m(df):
+    return resample(selat_sunda(df), 600_000)
+
+
+# ────────────────────────── update ──────────────────────────
+def update_views(root=STORE, days=None, names=None, force=True):
+    """
+    Hitung ulang view `names` (default semua) untuk partisi hari `days`
+    (list path direktori partisi positions atau Timestamp; default semua hari).
+    Dengan force=False, hari yang view-nya lebih baru dari partisi positions dilewati.
+    Return jumlah (view, hari) yang dihitung ulang.
+    """
+    names = list(VIEWS) if names is None else names
+    if days is None:
+        days = [d for d, _ in list_partitions(root, POSITIONS)]
+    days = [d if isinstance(d, pd.Timestamp) else partition_date(d) for d in days]
+
+    n = 0
+    for d in days:
+        src = partition_dir(root, POSITIONS, d.year, d.month, d.day)
+        files = sorted(src.glob("*.parquet"))
+        if not files:
+            continue
+        todo = [name for name in names if force or _is_stale(root, name, d, files)]
+        if not todo:
+            continue
+        # partisi positions dibaca sekali untuk semua view hari ini
+        df = ds.dataset([str(f) for f in files], format="parquet").to_table().to_pandas()
+        for name in todo:
+            try:
+                _write_day(root, name, d, VIEWS[name](df))
+                n += 1
+            except FileNotFoundError as e:
+                print(f"   ⚠  view {name} dilewati: {e}")
+    return n
+
+
+def _is_stale(root, name, day, files):
+    out = partition_dir(root, name, day.year, day.month, day.day) / "data.parquet"
+    return not out.exists() or out.stat().st_mtime < max(f.stat().st_mtime for f in files)
+
+
+def _write_day(root, name, day, df):
+    out = partition_dir(root, name, day.year, day.month, day.day)
+    out.mkdir(parents=True, exist_ok=True)
+    tmp = out / "data.parquet.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp,
+                   row_group_size=ROW_GROUP, compression="zstd")
+    tmp.replace(out / "data.parquet")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bangun ulang view turunan ais_store per hari")
+    ap.add_argument("--root", type=Path, default=STORE)
+    ap.add_argument("--view", action="append", choices=VIEWS, help="boleh diulang; default semua")
+    ap.add_argument("--force", action="store_true", help="hitung ulang juga hari yang view-nya masih baru")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    n = update_views(args.root, names=args.view, force=args.force)
+    print(f"✅  {n} partisi (view × hari) diproses dalam {time.time() - t0:.1f} detik")
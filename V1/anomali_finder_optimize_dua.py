@@ -1,14 +1,15 @@
 import pandas as pd
 import numpy as np
-from haversine import haversine, Unit
 from datetime import timedelta
 import matplotlib.pyplot as plt
 import time
-from sklearn.neighbors import BallTree
 import folium
 from folium.plugins import MarkerCluster
 import warnings
 import hashlib
+
+from ais_schema import ms_to_datetime
+from transhipment import PRESETS, build_sessions, frame_pairs, port_distance_km
 warnings.filterwarnings("ignore")
 
 start = time.time()
@@ -21,29 +22,13 @@ df = df.dropna(subset=['mmsi', 'lat', 'lon', 'created_at', 'sog'])
 df['utc'] = pd.to_datetime(df['created_at'])
 df = df.sort_values(by='utc')
 
-# Parameter aturan
-PROXIMITY_THRESHOLD_KM = 0.05  # 50 meter
-DURATION_THRESHOLD_MIN = 30    # minimal 30 menit
-SOG_THRESHOLD = 0.5            # kapal hampir diam
-PORT_DISTANCE_THRESHOLD_KM = 10.0  # minimal 10 km dari pelabuhan
-TIME_GAP_MINUTES = 10  # batas waktu antar interaksi dianggap sesi baru
-
-# Daftar pelabuhan
-ports = [
-    {"name": "Pelabuhan Merak", "lat": -5.8933, "lon": 106.0086},
-    {"name": "Pelabuhan Ciwandan", "lat": -5.9525, "lon": 106.0358},
-    {"name": "Pelabuhan Bojonegara", "lat": -5.8995, "lon": 106.0657},
-    {"name": "Pelabuhan Bakauheni", "lat": -5.8711, "lon": 105.7421},
-    {"name": "Pelabuhan Panjang", "lat": -5.4558, "lon": 105.3134},
-    {"name": "Pelabuhan Ciwandan 2", "lat": -6.02147, "lon": 105.95485},
-]
-
-def is_far_from_ports(lat, lon, ports, min_distance_km=PORT_DISTANCE_THRESHOLD_KM):
-    for port in ports:
-        dist = haversine((lat, lon), (port['lat'], port['lon']), unit=Unit.KILOMETERS)
-        if dist < min_distance_km:
-            return False
-    return True
+# Parameter aturan: preset "fix" (transhipment/params.py)
+P = PRESETS["fix"]
+PROXIMITY_THRESHOLD_KM = P.proximity_km      # 50 meter
+DURATION_THRESHOLD_MIN = P.duration_min      # minimal 30 menit
+SOG_THRESHOLD = P.sog_max                    # kapal hampir diam
+PORT_DISTANCE_THRESHOLD_KM = P.port_km       # minimal 10 km dari pelabuhan
+TIME_GAP_MINUTES = P.gap_min                 # batas waktu antar interaksi dianggap sesi baru
 
 def get_color_hex(mmsi_1, mmsi_2):
     pair_str = f"{mmsi_1}-{mmsi_2}"
@@ -55,64 +40,26 @@ def get_color_hex(mmsi_1, mmsi_2):
     b = int(hex_digest[4:6], 16) % 60         # 0–60 (hindari biru dominan)
     return f"#{r:02x}{g:02x}{b:02x}"
 
-# Deteksi proximity
-df['utc_rounded'] = df['utc'].dt.floor('1min')
-anomalies = []
-
-for time, group in df.groupby('utc_rounded'):
-    if len(group) < 2:
-        continue
-    
-    coords = np.radians(group[['lat', 'lon']])
-    tree = BallTree(coords, metric='haversine')
-    indices = tree.query_radius(coords, r=PROXIMITY_THRESHOLD_KM / 6371.0)
-
-    for i, neighbors in enumerate(indices):
-        for j in neighbors:
-            if i >= j:
-                continue
-
-            row_i = group.iloc[i]
-            row_j = group.iloc[j]
-
-            if row_i['sog'] >= SOG_THRESHOLD or row_j['sog'] >= SOG_THRESHOLD:
-                continue
-
-            anomalies.append({
-                'mmsi_1': min(row_i['mmsi'], row_j['mmsi']),
-                'mmsi_2': max(row_i['mmsi'], row_j['mmsi']),
-                'utc': time,
-                'lat': (row_i['lat'] + row_j['lat']) / 2,
-                'lon': (row_i['lon'] + row_j['lon']) / 2,
-            })
-
-# Agregasi final dengan pemisahan sesi interaksi
-anom_df = pd.DataFrame(anomalies)
-final_anomalies = []
-
-if not anom_df.empty:
-    for (m1, m2), group in anom_df.groupby(['mmsi_1', 'mmsi_2']):
-        group = group.sort_values('utc')
-        group['time_diff'] = group['utc'].diff().fillna(pd.Timedelta(seconds=0))
-        group['gap'] = (group['time_diff'] > pd.Timedelta(minutes=TIME_GAP_MINUTES)).cumsum()
-
-        for _, session in group.groupby('gap'):
-            lat_mean = session['lat'].mean()
-            lon_mean = session['lon'].mean()
-            start_time = session['utc'].min()
-            end_time = session['utc'].max()
-            duration_minutes = (end_time - start_time).total_seconds() / 60
-
-            if duration_minutes >= DURATION_THRESHOLD_MIN and is_far_from_ports(lat_mean, lon_mean, ports):
-                final_anomalies.append({
-                    'mmsi_1': m1,
-                    'mmsi_2': m2,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'duration_min': round(duration_minutes, 2),
-                    'lat': lat_mean,
-                    'lon': lon_mean,
-                })
+# Kontak per menit (frame_pairs, stage grid), bahan sesi interaksi di bawah
+anom_df = frame_pairs(df, PROXIMITY_THRESHOLD_KM, sog_max=SOG_THRESHOLD, bin='1min')
+
+# Agregasi final dengan pemisahan sesi interaksi: tabel pasangan diurutkan sekali
+# per (pasangan, waktu), jeda > TIME_GAP_MINUTES memulai sesi baru, agregat sekaligus
+ts = ((anom_df['utc'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)).to_numpy()
+sessions = build_sessions(anom_df['mmsi_1'], anom_df['mmsi_2'], ts, anom_df['lat'], anom_df['lon'],
+                          anom_df['dist_km'], gap_ms=TIME_GAP_MINUTES * 60_000)
+sessions['duration_min'] = (sessions['end'] - sessions['start']) / 60_000
+far = port_distance_km(sessions['lat'], sessions['lon'], P.ports) >= PORT_DISTANCE_THRESHOLD_KM
+sessions = sessions[(sessions['duration_min'] >= DURATION_THRESHOLD_MIN) & far]
+final_anomalies = pd.DataFrame({
+    'mmsi_1': sessions['mmsi_1'].to_numpy(),
+    'mmsi_2': sessions['mmsi_2'].to_numpy(),
+    'start_time': ms_to_datetime(sessions['start'].to_numpy()),
+    'end_time': ms_to_datetime(sessions['end'].to_numpy()),
+    'duration_min': sessions['duration_min'].round(2).to_numpy(),
+    'lat': sessions['lat'].to_numpy(),
+    'lon': sessions['lon'].to_numpy(),
+})
 
 # Simpan ke CSV
 final_df = pd.DataFrame(final_anomalies)
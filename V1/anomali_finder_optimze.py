@@ -4,8 +4,9 @@ from haversine import haversine_vector, Unit
 from datetime import timedelta
 import matplotlib.pyplot as plt
 import time
-from sklearn.neighbors import BallTree
 import warnings
+
+from transhipment import frame_pairs
 warnings.filterwarnings("ignore")
 
 start = time.time()
@@ -21,44 +22,10 @@ PROXIMITY_THRESHOLD_KM = 1.0
 DURATION_THRESHOLD_MIN = 30
 SOG_THRESHOLD = 0.5  # ≈ 0 knot
 
-# Bikin list hasil anomali
-anomalies = []
-
-# Bikin interval waktu per 1 menit
-df['utc_rounded'] = df['utc'].dt.floor('1min')
-grouped = df.groupby('utc_rounded')
-
-for time, group in grouped:
-    if len(group) < 2:
-        continue
-    
-    coords = np.radians(group[['lat', 'lon']])
-    tree = BallTree(coords, metric='haversine')
-    indices = tree.query_radius(coords, r=PROXIMITY_THRESHOLD_KM / 6371.0)
-
-    for i, neighbors in enumerate(indices):
-        for j in neighbors:
-            if i >= j:
-                continue
-
-            row_i = group.iloc[i]
-            row_j = group.iloc[j]
-
-            # Cek kecepatan rendah
-            if row_i['sog'] >= SOG_THRESHOLD or row_j['sog'] >= SOG_THRESHOLD:
-                continue
-
-            # Simpan hasil awal
-            anomalies.append({
-                'mmsi_1': row_i['mmsi'],
-                'mmsi_2': row_j['mmsi'],
-                'utc': time,
-                'lat': (row_i['lat'] + row_j['lat']) / 2,
-                'lon': (row_i['lon'] + row_j['lon']) / 2,
-            })
+# Kapal diam (SOG < SOG_THRESHOLD) yang berdekatan di menit yang sama; stage grid
+anom_df = frame_pairs(df, PROXIMITY_THRESHOLD_KM, sog_max=SOG_THRESHOLD, bin='1min')
 
 # Masuk ke tahap agregasi durasi per pasangan
-anom_df = pd.DataFrame(anomalies)
 if anom_df.empty:
     print("Tidak ada interaksi mencurigakan.")
 else:
@@ -0,0 +1,62 @@
+"""
+Benchmark pencari pasangan kandidat: BallTree per bin (cara lama), cKDTree per
+bin, dan grid hash (bin, sel) untuk seluruh dataset sekaligus. Semua metode
+harus menghasilkan tabel pasangan yang identik; kalau tidak, script keluar
+dengan status 1.
+
+Pemakaian:
+    python V1/bench_pairs.py                                   # view bin1m, preset fix
+    python V1/bench_pairs.py --dataset data/maritim_selat_sunda_500k.pkl --proximity-km 2
+    python V1/bench_pairs.py --start 2024-08-01 --end 2024-08-08 --no-filter --repeat 3
+"""
+import argparse
+import sys
+import time
+
+from transhipment import METHODS, PRESETS, load, pair_table, resolve_params, time_pairs
+from transhipment.stages import get_stage
+
+
+def bench(pos, p, methods=METHODS, repeat=1):
+    """{method: (detik terbaik, tabel pasangan)} untuk posisi `pos`."""
+    out = {}
+    for m in methods:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            i, j, tick = time_pairs(pos.t, pos.lat, pos.lon, p.proximity_km, int(p.bin_min * 60_000), m)
+            best = min(best, time.perf_counter() - t0)
+        out[m] = best, pair_table(i, j, tick, pos.mmsi, pos.lat, pos.lon)
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bandingkan kecepatan & hasil pencari pasangan kandidat")
+    ap.add_argument("--dataset", default="bin1m", help="tabel ais_store atau path .pkl/.parquet")
+    ap.add_argument("--preset", choices=PRESETS, default="fix")
+    ap.add_argument("--start")
+    ap.add_argument("--end")
+    ap.add_argument("--proximity-km", type=float)
+    ap.add_argument("--method", action="append", choices=METHODS, help="boleh diulang; default semua")
+    ap.add_argument("--no-filter", action="store_true", help="lewati filter posisi preset (SOG / pelabuhan)")
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args()
+
+    overrides = {k: v for k, v in vars(args).items()
+                 if k in ("start", "end", "proximity_km") and v is not None}
+    p = resolve_params(args.preset, **overrides)
+    pos = load(args.dataset, p)
+    if not args.no_filter:
+        for name in p.filters:
+            pos = pos.take(get_stage("filter", name)(pos, p))
+    print(f"➜ {len(pos):,} posisi, radius {p.proximity_km:g} km, bin {p.bin_min:g} menit")
+
+    results = bench(pos, p, args.method or METHODS, args.repeat)
+    ref_name, (ref_s, ref) = next(iter(results.items()))
+    same = True
+    for m, (s, pairs) in results.items():
+        ok = pairs.equals(ref)
+        same &= ok
+        print(f"   {m:<9} {s:8.2f} s   ×{ref_s / s:5.1f}   {len(pairs):,} pasangan   "
+              f"{'✔' if ok else '⛔ beda dengan ' + ref_name}")
+    sys.exit(0 if same else 1)
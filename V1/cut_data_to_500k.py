@@ -1,15 +1,9 @@
-import pandas as pd
+from ais_pipeline import build
 
-# Load data asli (tidak diubah)
-df = pd.read_pickle("data/maritim_selat_sunda.pkl")
+# Subset 500k sekarang dibangun lewat pipeline: sampel track utuh per MMSI
+# (seed tetap) dari ais_store, bukan head(500_000) yang cuma berisi baris
+# paling depan di file. Sampel lain (stratified per hari × kapal, seed / ukuran
+# berbeda) bisa dibuat dengan ais_sample.py.
+build(["maritim_selat_sunda_500k"])
 
-df = df[(df['lat'] >= -6.5) & (df['lat'] <= -5.5) &
-        (df['lon'] >= 105.0) & (df['lon'] <= 106.0)].reset_index(drop=True)
-
-# Ambil subset untuk test (contoh: 500.000 baris pertama)
-df_test = df.head(500_000).copy()
-
-# Simpan sebagai file baru untuk eksperimen
-df_test.to_pickle("data/maritim_selat_sunda_500k.pkl")
-
-print("Test data saved as 'maritim_selat_sunda_500k.pkl' with", len(df_test), "rows.")
+print("Test data saved as 'maritim_selat_sunda_500k.pkl' (sampel track utuh, seed 0).")
@@ -0,0 +1,40 @@
+"""
+Deteksi kandidat transhipment dengan paket `transhipment` (pengganti
+anomali_finder*.py / new_anomali_finder*.py / find_proximity_*.py / spire_logic.py).
+
+Pemakaian:
+    python V1/detect_transhipment.py                               # view bin1m, preset fix
+    python V1/detect_transhipment.py --preset spire --dataset bin10m
+    python V1/detect_transhipment.py --dataset data/maritim_selat_sunda_500k.pkl --proximity-km 0.1
+    python V1/detect_transhipment.py --start 2024-08-01 --end 2024-09-01 --out anomali_agustus.csv
+    python V1/detect_transhipment.py --pairs balltree                # pencari pasangan lama
+    python V1/detect_transhipment.py --dataset positions --align interp --max-gap-min 5
+"""
+import argparse
+import time
+
+from transhipment import PRESETS, STAGES, detect
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Deteksi interaksi kapal-ke-kapal (kandidat transhipment)")
+    ap.add_argument("--dataset", default="bin1m", help="tabel ais_store atau path .pkl/.parquet")
+    ap.add_argument("--preset", choices=PRESETS, default="fix")
+    ap.add_argument("--start")
+    ap.add_argument("--end")
+    ap.add_argument("--proximity-km", type=float)
+    ap.add_argument("--duration-min", type=float)
+    ap.add_argument("--sog-max", type=float)
+    ap.add_argument("--port-km", type=float)
+    ap.add_argument("--gap-min", type=float)
+    ap.add_argument("--align", choices=sorted(STAGES["align"]), help="interpolasi track ke grid bin")
+    ap.add_argument("--max-gap-min", type=float)
+    ap.add_argument("--pairs", choices=sorted(STAGES["pairs"]), help="stage pencari pasangan")
+    ap.add_argument("--out", default="output_transhipment_events.csv")
+    args = ap.parse_args()
+
+    overrides = {k: v for k, v in vars(args).items()
+                 if k not in ("dataset", "preset", "out") and v is not None}
+    t0 = time.time()
+    events = detect(args.dataset, args.preset, verbose=True, **overrides)
+    events.to_csv(args.out, index=False)
+    print(f"✅ {len(events)} event disimpan ke {args.out} ({time.time() - t0:.1f} detik)")
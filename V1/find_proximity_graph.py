@@ -1,11 +1,12 @@
 import pandas as pd
 import numpy as np
-from sklearn.neighbors import BallTree
 from datetime import timedelta
 from haversine import haversine, Unit
 import matplotlib.pyplot as plt
 import warnings
 import time
+
+from transhipment import frame_pairs
 warnings.filterwarnings("ignore")
 
 # Waktu mulai
@@ -43,41 +44,10 @@ def is_far_from_ports(lat, lon, ports, min_distance_km=PORT_DISTANCE_THRESHOLD_K
             return False
     return True
 
-# Buat interval waktu per 1 menit
-df['utc_rounded'] = df['utc'].dt.floor('1min')
-grouped = df.groupby('utc_rounded')
-
-# Cari proximity
-anomalies = []
-for time_key, group in grouped:
-    if len(group) < 2:
-        continue
-
-    coords = np.radians(group[['lat', 'lon']])
-    tree = BallTree(coords, metric='haversine')
-    indices = tree.query_radius(coords, r=PROXIMITY_THRESHOLD_KM / 6371.0)
-
-    for i, neighbors in enumerate(indices):
-        for j in neighbors:
-            if i >= j:
-                continue
-
-            row_i = group.iloc[i]
-            row_j = group.iloc[j]
-
-            if row_i['sog'] >= SOG_THRESHOLD or row_j['sog'] >= SOG_THRESHOLD:
-                continue
-
-            anomalies.append({
-                'mmsi_1': min(row_i['mmsi'], row_j['mmsi']),
-                'mmsi_2': max(row_i['mmsi'], row_j['mmsi']),
-                'utc': time_key,
-                'lat': (row_i['lat'] + row_j['lat']) / 2,
-                'lon': (row_i['lon'] + row_j['lon']) / 2,
-            })
+# Kontak per menit (frame_pairs, stage grid): tiap baris = satu pasangan dalam radius
+anom_df = frame_pairs(df, PROXIMITY_THRESHOLD_KM, sog_max=SOG_THRESHOLD, bin='1min')
 
 # Analisis hubungan proximity–durasi
-anom_df = pd.DataFrame(anomalies)
 final_anomalies = []
 
 if not anom_df.empty:
@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-from sklearn.neighbors import BallTree
 from datetime import timedelta
 import time
 import warnings
+
+from transhipment import frame_pairs
 warnings.filterwarnings("ignore")
 
 start = time.time()
@@ -23,42 +24,8 @@ PROXIMITY_THRESHOLD_KM = 1.0
 DURATION_THRESHOLD_MIN = 30
 SOG_THRESHOLD = 0.5
 
-# Buat interval waktu per 1 menit
-df['utc_rounded'] = df['utc'].dt.floor('1min')
-grouped = df.groupby('utc_rounded')
-
-# Cari anomali proximity
-anomalies = []
-
-for time, group in grouped:
-    if len(group) < 2:
-        continue
-
-    coords = np.radians(group[['lat', 'lon']])
-    tree = BallTree(coords, metric='haversine')
-    indices = tree.query_radius(coords, r=PROXIMITY_THRESHOLD_KM / 6371.0)
-
-    for i, neighbors in enumerate(indices):
-        for j in neighbors:
-            if i >= j:
-                continue
-
-            row_i = group.iloc[i]
-            row_j = group.iloc[j]
-
-            if row_i['sog'] >= SOG_THRESHOLD or row_j['sog'] >= SOG_THRESHOLD:
-                continue
-
-            anomalies.append({
-                'mmsi_1': min(row_i['mmsi'], row_j['mmsi']),
-                'mmsi_2': max(row_i['mmsi'], row_j['mmsi']),
-                'utc': time,
-                'lat': (row_i['lat'] + row_j['lat']) / 2,
-                'lon': (row_i['lon'] + row_j['lon']) / 2,
-            })
-
-# Buat dataframe hasil proximity
-anom_df = pd.DataFrame(anomalies)
+# Pasangan dalam radius per menit (stage grid); durasi = jumlah menit unik per pasangan
+anom_df = frame_pairs(df, PROXIMITY_THRESHOLD_KM, sog_max=SOG_THRESHOLD, bin='1min')
 
 # Proses hanya jika ada data mencurigakan
 if not anom_df.empty:
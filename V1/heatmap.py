@@ -5,20 +5,12 @@ from shapely.geometry import Point
 import contextily as ctx
 import numpy as np
 
-# Load data
-df = pd.read_pickle("data/maritim_selat_sunda_with_type.pkl")
-
-# Pastikan waktu & lokasi valid
-df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
-df = df.dropna(subset=['lat', 'lon', 'created_at'])
-
-# Filter wilayah Selat Sunda dan bulan Agustus–Desember 2024
-df = df[
-    (df['lat'] >= -6.5) & (df['lat'] <= -5.5) &
-    (df['lon'] >= 105.0) & (df['lon'] <= 106.0) &
-    (df['created_at'].dt.year == 2024) &
-    (df['created_at'].dt.month >= 8) & (df['created_at'].dt.month <= 12)
-].copy()
+from ais_store import load_positions, SELAT_SUNDA
+
+# Load data: hanya partisi Agustus–Desember 2024, kolom lat/lon, wilayah Selat Sunda
+df = load_positions(start="2024-08-01", end="2025-01-01", bbox=SELAT_SUNDA,
+                    columns=['lat', 'lon'])
+df = df.dropna(subset=['lat', 'lon'])
 
 # Convert ke GeoDataFrame
 df['geometry'] = df.apply(lambda row: Point(row['lon'], row['lat']), axis=1)
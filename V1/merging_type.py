@@ -1,22 +1,10 @@
-import pandas as pd
+from ais_pipeline import build
 
-# 1. Load data AIS
-df = pd.read_pickle('data/maritim_selat_sunda.pkl')
+# vessel_type sekarang diambil saat query lewat vessel_lookup.attach_vessel_attrs
+# (lookup MMSI → kategori, tanpa menyalin dataset). Pickle gabungan ini hanya
+# dibangun untuk script lama yang masih membaca maritim_selat_sunda_with_type.pkl;
+# dibangun ulang hanya kalau data / scraped_vessel_type.csv / tabel vessels berubah.
+build(["maritim_selat_sunda_with_type"])
 
-# 2. Load hasil scraped vessel_type
-df_type = pd.read_csv('scraped_vessel_type.csv', dtype={'mmsi': str})
-
-# 3. Normalisasi vessel_type
-df_type['vessel_type'] = df_type['vessel_type'].replace(['ERROR', 'NOT_FOUND'], 'UNKNOWN')
-
-# 4. Pastikan MMSI cocok (string)
-df['mmsi'] = df['mmsi'].astype(str)
-
-# 5. Merge dengan left join
-df_merged = df.merge(df_type, on='mmsi', how='left')
-
-# 6. Simpan ke file baru
-df_merged.to_pickle('data/maritim_selat_sunda_with_type.pkl')
-
-print("✅ Merge selesai. Semua 'ERROR' & 'NOT_FOUND' sudah jadi 'UNKNOWN'.")
+print("✅ Merge selesai. vessel_type: hasil scraping, fallback ship_group AIS, sisanya 'UNKNOWN'.")
 print("💾 File disimpan ke: data/maritim_selat_sunda_with_type.pkl")
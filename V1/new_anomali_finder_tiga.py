@@ -6,49 +6,14 @@ import time
 import folium
 from folium.plugins import MarkerCluster
 
-# --- Parameter aturan ---
-PROXIMITY_THRESHOLD_KM = 2.0  # 2000 meter
-DURATION_THRESHOLD_MIN = 30   # minimal 30 menit
-SOG_THRESHOLD = 0.5           # kapal hampir diam (Speed Over Ground < 0.5 knot)
-PORT_DISTANCE_THRESHOLD_KM = 10.0 # minimal 10 km dari pelabuhan
-
-# Daftar pelabuhan
-ports = [
-    {"name": "Pelabuhan Merak", "lat": -5.8933, "lon": 106.0086},
-    {"name": "Pelabuhan Ciwandan", "lat": -5.9525, "lon": 106.0358},
-    {"name": "Pelabuhan Bojonegara", "lat": -5.8995, "lon": 106.0657},
-    {"name": "Pelabuhan Bakauheni", "lat": -5.8711, "lon": 105.7421},
-    {"name": "Pelabuhan Panjang", "lat": -5.4558, "lon": 105.3134},
-    {"name": "Pelabuhan Ciwandan 2", "lat": -6.02147, "lon": 105.95485},
-]
-
-# --- Fungsi Pembantu ---
-
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """
-    Menghitung jarak Haversine antara dua titik koordinat (latitude, longitude)
-    dalam kilometer.
-    """
-    R = 6371  # Radius bumi dalam kilometer
-    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-    return R * c
+from transhipment import PRESETS, drift_windows, haversine_km, ndarray_pairs, port_distance_km
 
-def is_far_from_ports(lat, lon, ports, threshold_km):
-    """
-    Memeriksa apakah sebuah titik koordinat jauh dari semua pelabuhan yang ditentukan.
-    Mengembalikan True jika jarak ke *semua* pelabuhan melebihi threshold_km.
-    """
-    min_dist_to_any_port = float('inf')
-    for port in ports:
-        dist = haversine_distance(lat, lon, port['lat'], port['lon'])
-        if dist < min_dist_to_any_port:
-            min_dist_to_any_port = dist
-    return min_dist_to_any_port > threshold_km
+# --- Parameter aturan: preset "new" (transhipment/params.py) ---
+P = PRESETS["new"]
+PROXIMITY_THRESHOLD_KM = P.proximity_km     # 2000 meter
+DURATION_THRESHOLD_MIN = P.duration_min     # minimal 30 menit
+SOG_THRESHOLD = P.sog_max                   # kapal hampir diam (Speed Over Ground < 0.5 knot)
+PORT_DISTANCE_THRESHOLD_KM = P.port_km      # minimal 10 km dari pelabuhan
 
 # --- Fungsi Utama Deteksi Anomali ---
 
@@ -105,8 +70,8 @@ def detect_illegal_transhipment(file_path="data/maritim_selat_sunda_with_type.pk
     # 2. Deteksi Pasangan Kapal Berdekatan (Proximity)
     print(f"[{time.ctime()}] Memulai deteksi pasangan kapal berdekatan dan berkecepatan rendah...")
     
-    # Membuat list untuk menyimpan anomali
-    anomalies = []
+    # Membuat list untuk menyimpan kontak per tanggal
+    contacts = []
 
     # Grouping by date for efficiency
     df_slow_ships['date'] = df_slow_ships['created_at'].dt.date
@@ -135,114 +100,89 @@ def detect_illegal_transhipment(file_path="data/maritim_selat_sunda_with_type.pk
         # More accurate approach is to use Haversine after KDTree preliminary check.
         approx_radius_deg = PROXIMITY_THRESHOLD_KM / 111.0
         
-        # Query pairs within the approximate radius
-        pairs_indices = tree.query_pairs(approx_radius_deg)
-        
-        contact_points = []
-        for i, j in pairs_indices:
-            row_i = df_today.iloc[i]
-            row_j = df_today.iloc[j]
-
-            if row_i['mmsi'] != row_j['mmsi']:
-                dist = haversine_distance(row_i['lat'], row_i['lon'], row_j['lat'], row_j['lon'])
-                if dist <= PROXIMITY_THRESHOLD_KM:
-                    contact_points.append({
-                        'mmsi1': row_i['mmsi'],
-                        'mmsi2': row_j['mmsi'],
-                        'time1': row_i['created_at'],
-                        'time2': row_j['created_at'],
-                        'lat1': row_i['lat'],
-                        'lon1': row_i['lon'],
-                        'lat2': row_j['lat'],
-                        'lon2': row_j['lon'],
-                        'sog1': row_i['sog'],
-                        'sog2': row_j['sog'],
-                        'distance_km': dist,
-                        'avg_lat': (row_i['lat'] + row_j['lat']) / 2,
-                        'avg_lon': (row_i['lon'] + row_j['lon']) / 2,
-                    })
-
-        if not contact_points:
+        # Query pairs within the approximate radius, langsung sebagai array index (n × 2)
+        i, j = ndarray_pairs(tree.query_pairs(approx_radius_deg, output_type='ndarray'))
+
+        # Mask MMSI sama + jarak haversine sebenarnya, sekaligus untuk semua pasangan
+        mmsi = df_today['mmsi'].to_numpy()
+        lat, lon = df_today['lat'].to_numpy(), df_today['lon'].to_numpy()
+        sog, waktu = df_today['sog'].to_numpy(), df_today['created_at']
+        keep = mmsi[i] != mmsi[j]
+        i, j = i[keep], j[keep]
+        dist = haversine_km(lat[i], lon[i], lat[j], lon[j])
+        near = dist <= PROXIMITY_THRESHOLD_KM
+        i, j, dist = i[near], j[near], dist[near]
+
+        if len(i) == 0:
             continue
 
-        df_contacts_today = pd.DataFrame(contact_points)
-        
-        df_contacts_today['mmsi_pair'] = df_contacts_today.apply(
-            lambda x: tuple(sorted((x['mmsi1'], x['mmsi2']))), axis=1
-        )
-        
-        df_contacts_today.sort_values(by=['mmsi_pair', 'time1'], inplace=True)
+        df_contacts_today = pd.DataFrame({
+            'mmsi1': mmsi[i],
+            'mmsi2': mmsi[j],
+            'time1': waktu.iloc[i].reset_index(drop=True),
+            'time2': waktu.iloc[j].reset_index(drop=True),
+            'lat1': lat[i],
+            'lon1': lon[i],
+            'lat2': lat[j],
+            'lon2': lon[j],
+            'sog1': sog[i],
+            'sog2': sog[j],
+            'distance_km': dist,
+            'avg_lat': (lat[i] + lat[j]) / 2,
+            'avg_lon': (lon[i] + lon[j]) / 2,
+        })
+        contacts.append(df_contacts_today)
+
+    if not contacts:
+        print(f"[{time.ctime()}] Tidak ada anomali 'long duration proximity' terdeteksi.")
+        return pd.DataFrame()
 
-        current_pair_anomalies = {} 
-        
-        for _, row in df_contacts_today.iterrows():
-            mmsi_pair = row['mmsi_pair']
-            current_time = row['time1']
-            current_lat = row['avg_lat']
-            current_lon = row['avg_lon']
-
-            if mmsi_pair not in current_pair_anomalies:
-                current_pair_anomalies[mmsi_pair] = {
-                    'start_time': current_time,
-                    'last_contact_time': current_time,
-                    'start_lat': current_lat,
-                    'start_lon': current_lon,
-                    'mmsi1': row['mmsi1'],
-                    'mmsi2': row['mmsi2'],
-                    'sog1_start': row['sog1'],
-                    'sog2_start': row['sog2'],
-                }
-            else:
-                contact_info = current_pair_anomalies[mmsi_pair]
-                contact_info['last_contact_time'] = current_time
-
-                duration = (current_time - contact_info['start_time']).total_seconds() / 60
-                
-                if duration >= DURATION_THRESHOLD_MIN:
-                    dist_from_start_to_end = haversine_distance(
-                        contact_info['start_lat'], contact_info['start_lon'],
-                        current_lat, current_lon
-                    )
-
-                    if dist_from_start_to_end < PROXIMITY_THRESHOLD_KM:
-                        anomalies.append({
-                            'mmsi1': contact_info['mmsi1'],
-                            'mmsi2': contact_info['mmsi2'],
-                            'start_time': contact_info['start_time'],
-                            'end_time': current_time,
-                            'duration_min': duration,
-                            'start_lat': contact_info['start_lat'],
-                            'start_lon': contact_info['start_lon'],
-                            'end_lat': current_lat,
-                            'end_lon': current_lon,
-                            'distance_from_start_to_end_km': dist_from_start_to_end,
-                            'sog1_start': contact_info['sog1_start'],
-                            'sog2_start': contact_info['sog2_start'],
-                            'sog1_end': row['sog1'],
-                            'sog2_end': row['sog2'],
-                        })
-                        del current_pair_anomalies[mmsi_pair]
-    
-    if not anomalies:
+    # 3. Jendela kontak untuk semua pasangan sekaligus (pengganti state machine iterrows),
+    # aturannya sama: per pasangan per hari, jendela dari kontak awal ditutup di kontak
+    # pertama ≥ DURATION_THRESHOLD_MIN kemudian yang titik tengahnya bergeser
+    # < PROXIMITY_THRESHOLD_KM, lalu jendela baru dimulai di kontak berikutnya
+    df_contacts = pd.concat(contacts, ignore_index=True)
+    t1 = ((df_contacts['time1'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)).to_numpy()
+    sessions = drift_windows(np.minimum(df_contacts['mmsi1'], df_contacts['mmsi2']),
+                             np.maximum(df_contacts['mmsi1'], df_contacts['mmsi2']), t1,
+                             df_contacts['avg_lat'], df_contacts['avg_lon'], df_contacts['distance_km'],
+                             min_ms=DURATION_THRESHOLD_MIN * 60_000, max_drift_km=PROXIMITY_THRESHOLD_KM,
+                             group=t1 // 86_400_000)
+    sessions['duration_min'] = (sessions['end'] - sessions['start']) / 60_000
+    sessions['distance_from_start_to_end_km'] = haversine_km(
+        sessions['start_lat'], sessions['start_lon'], sessions['end_lat'], sessions['end_lon'])
+    first = df_contacts.iloc[sessions['first']].reset_index(drop=True)
+    last = df_contacts.iloc[sessions['last']].reset_index(drop=True)
+    df_anomalies = pd.DataFrame({
+        'mmsi1': sessions['mmsi_1'].to_numpy(),
+        'mmsi2': sessions['mmsi_2'].to_numpy(),
+        'start_time': first['time1'],
+        'end_time': last['time1'],
+        'duration_min': sessions['duration_min'].to_numpy(),
+        'start_lat': sessions['start_lat'].to_numpy(),
+        'start_lon': sessions['start_lon'].to_numpy(),
+        'end_lat': sessions['end_lat'].to_numpy(),
+        'end_lon': sessions['end_lon'].to_numpy(),
+        'distance_from_start_to_end_km': sessions['distance_from_start_to_end_km'].to_numpy(),
+        'sog1_start': first['sog1'],
+        'sog2_start': first['sog2'],
+        'sog1_end': last['sog1'],
+        'sog2_end': last['sog2'],
+    })
+
+    if df_anomalies.empty:
         print(f"[{time.ctime()}] Tidak ada anomali 'long duration proximity' terdeteksi.")
         return pd.DataFrame()
 
-    df_anomalies = pd.DataFrame(anomalies)
-    # Gunakan kombinasi mmsi_pair dan waktu awal sebagai identifikasi unik untuk duplikat
-    df_anomalies['event_id'] = df_anomalies.apply(lambda x: f"{x['mmsi1']}-{x['mmsi2']}-{x['start_time']}", axis=1)
-    df_anomalies.drop_duplicates(subset=['event_id'], inplace=True)
-    df_anomalies.drop(columns=['event_id'], inplace=True) # Hapus kolom bantu
-    
     print(f"[{time.ctime()}] Jumlah potensi anomali terdeteksi sebelum filter jarak pelabuhan: {len(df_anomalies)}")
 
-    # 3. Filter Anomali Jauh dari Pelabuhan
+    # 4. Filter Anomali Jauh dari Pelabuhan
     print(f"[{time.ctime()}] Melakukan filtering anomali berdasarkan jarak dari pelabuhan...")
-    
-    df_anomalies['is_far_from_port'] = df_anomalies.apply(
-        lambda row: is_far_from_ports(row['start_lat'], row['start_lon'], ports, PORT_DISTANCE_THRESHOLD_KM),
-        axis=1
+
+    df_anomalies['is_far_from_port'] = (
+        port_distance_km(df_anomalies['start_lat'], df_anomalies['start_lon'], P.ports) > PORT_DISTANCE_THRESHOLD_KM
     )
-    
+
     final_anomalies = df_anomalies[df_anomalies['is_far_from_port']].copy()
 
     print(f"[{time.ctime()}] Deteksi anomali selesai.")
@@ -291,7 +231,7 @@ def visualize_anomalies_on_map(anomalies_df, map_output_path="anomalies_map.html
         ).add_to(marker_cluster)
     
     # Tambahkan lokasi pelabuhan sebagai marker biru
-    for port in ports:
+    for port in P.ports:
         folium.Marker(
             location=[port['lat'], port['lon']],
             icon=folium.Icon(color='blue', icon='info-sign'),
@@ -0,0 +1,190 @@
+"""
+Decode massal payload NMEA (kolom `original`) jadi kolom bertipe.
+
+Payload mentah membawa field yang selama ini tidak pernah dipakai: status
+navigasi (berlabuh / tambat), ROT, COG, true heading dan akurasi posisi.
+Satu-satunya jalur decode sebelumnya adalah `ship_type_code()` di
+extract_ship_type.py yang memanggil `pyais.decode` per baris lewat `apply`.
+
+Di sini payload didecode per chunk di process pool. Payload yang sama (laporan
+yang ditangkap beberapa receiver, pesan ulang) hanya didecode sekali: hasil
+di-cache per hash payload, baik di dalam chunk maupun lintas chunk.
+
+Hasilnya disimpan sebagai tabel `dynamic` di ais_store, satu partisi per hari,
+baris sejajar dengan partisi positions (kolom `_id` untuk join):
+
+    data/ais_store/dynamic/year=2024/month=08/day=01/data.parquet
+
+Baca dengan `load_positions(table="dynamic")`.
+
+Pemakaian:
+    python V1/nmea_decode.py                 # hari yang belum / sudah basi
+    python V1/nmea_decode.py -j 8 --force    # decode ulang semua hari
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyais import decode
+
+from ais_store import POSITIONS, ROW_GROUP, STORE, list_partitions, partition_dir
+from payload_store import PayloadStore
+
+DYNAMIC = "dynamic"
+JOBS = os.cpu_count() or 1
+BATCH = 20_000               # payload per tugas worker
+CACHE_SIZE = 2_000_000       # entri cache hash payload → hasil decode
+
+# kolom hasil: nama → (key di asdict() pyais, dtype)
+FIELDS = {
+    "nav_status": ("status", "UInt8"),
+    "rot": ("turn", "float32"),
+    "cog": ("course", "float32"),
+    "heading": ("heading", "float32"),
+    "accuracy": ("accuracy", "boolean"),
+}
+HEADING_NOT_AVAILABLE = 511
+COG_NOT_AVAILABLE = 360
+
+
+# ────────────────────────── worker ──────────────────────────
+def _num(v):
+    if v is None or (isinstance(v, Enum) and not isinstance(v, int)):
+        return np.nan            # TurnRate (ROT ±127 / -128) = tanpa indikator / tidak tersedia
+    return float(v)
+
+
+def _decode_batch(payloads):
+    """Decode list payload → matriks float64 (baris × FIELDS); field kosong / payload rusak → NaN."""
+    keys = [k for k, _ in FIELDS.values()]
+    out = np.full((len(payloads), len(keys)), np.nan)
+    for i, p in enumerate(payloads):
+        if not p:
+            continue
+        try:
+            msg = decode(p).asdict()
+        except Exception:
+            continue                 # payload rusak / fragmen multi-part → abaikan
+        out[i] = [_num(msg.get(k)) for k in keys]
+    return out
+
+
+# ────────────────────────── decoder ──────────────────────────
+class NmeaDecoder:
+    """Decode payload per chunk di process pool, dengan cache per hash payload."""
+
+    def __init__(self, jobs=JOBS, batch=BATCH, cache_size=CACHE_SIZE):
+        self.jobs = jobs
+        self.batch = batch
+        self.cache_size = cache_size
+        self.cache = {}
+        self.pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+        self.rows_in = 0
+        self.decoded = 0
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self, payloads):
+        batches = [payloads[i:i + self.batch] for i in range(0, len(payloads), self.batch)]
+        if self.pool is None or len(batches) == 1:
+            return np.vstack([_decode_batch(b) for b in batches])
+        return np.vstack(list(self.pool.map(_decode_batch, batches)))
+
+    def decode(self, payloads):
+        """Payload (pa.StringArray / list / Series) → DataFrame kolom FIELDS, urutan sama dengan input."""
+        payloads = pd.Series(payloads.to_pylist() if isinstance(payloads, pa.Array) else payloads,
+                             dtype=object)
+        if payloads.empty:
+            return self._frame(np.empty((0, len(FIELDS))))
+        hashes = pd.util.hash_array(payloads.fillna("").to_numpy())
+        uniq, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+
+        missing = [k for k, h in enumerate(uniq) if h not in self.cache]
+        if missing:
+            todo = payloads.iloc[first[missing]].tolist()
+            if len(self.cache) + len(todo) > self.cache_size:
+                self.cache.clear()
+            self.cache.update(zip(uniq[missing].tolist(), self._run(todo)))
+        values = np.vstack([self.cache[h] for h in uniq.tolist()])
+
+        self.rows_in += len(payloads)
+        self.decoded += len(missing)
+        return self._frame(values[inverse])
+
+    @staticmethod
+    def _frame(values):
+        df = pd.DataFrame(values, columns=list(FIELDS))
+        df.loc[df["heading"] == HEADING_NOT_AVAILABLE, "heading"] = np.nan
+        df.loc[df["cog"] >= COG_NOT_AVAILABLE, "cog"] = np.nan
+        return df.astype({name: dtype for name, (_, dtype) in FIELDS.items()})
+
+    def report(self):
+        pct = 100 * self.decoded / self.rows_in if self.rows_in else 0.0
+        return f"{self.decoded:,} payload unik didecode dari {self.rows_in:,} baris ({pct:.1f}%)"
+
+
+# ────────────────────────── tabel dynamic ──────────────────────────
+def _is_stale(src, out, force):
+    dst = out / "data.parquet"
+    if force or not dst.exists():
+        return True
+    return max(f.stat().st_mtime for f in src.glob("*.parquet")) > dst.stat().st_mtime
+
+
+def decode_store(root=STORE, jobs=JOBS, force=False):
+    """Isi / perbarui tabel `dynamic` untuk partisi hari yang basi; return jumlah hari yang diproses."""
+    payloads = PayloadStore(root)
+    n = 0
+    with NmeaDecoder(jobs) as decoder:
+        for day, src in list_partitions(root, POSITIONS):
+            out = partition_dir(root, DYNAMIC, day.year, day.month, day.day)
+            if not _is_stale(src, out, force):
+                continue
+            files = [str(f) for f in sorted(src.glob("*.parquet"))]
+            tbl = ds.dataset(files, format="parquet").to_table(columns=["_id", "mmsi", "ts", "payload_ref"])
+
+            col = tbl.column("payload_ref")
+            has_ref = col.is_valid().to_numpy(zero_copy_only=False)
+            raw = np.full(tbl.num_rows, None, dtype=object)
+            raw[has_ref] = payloads.get_many(col.fill_null(0).to_numpy()[has_ref]).to_pylist()
+            decoded = pa.Table.from_pandas(decoder.decode(raw), preserve_index=False)
+
+            result = tbl.drop_columns(["payload_ref"])
+            for name in decoded.column_names:
+                result = result.append_column(name, decoded.column(name))
+            out.mkdir(parents=True, exist_ok=True)
+            tmp = out / "data.parquet.tmp"
+            pq.write_table(result, tmp, row_group_size=ROW_GROUP, compression="zstd")
+            tmp.replace(out / "data.parquet")
+            n += 1
+            print(f"   ✔  {day:%Y-%m-%d}  {tbl.num_rows:,} baris")
+        print(f"   {decoder.report()}")
+    return n
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Decode payload NMEA ke tabel dynamic (COG, heading, status, ROT)")
+    ap.add_argument("--root", type=Path, default=STORE)
+    ap.add_argument("-j", "--jobs", type=int, default=JOBS, help="jumlah proses decoder")
+    ap.add_argument("--force", action="store_true", help="decode ulang semua hari")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    n = decode_store(args.root, args.jobs, args.force)
+    print(f"✅  {n} partisi hari didecode dalam {time.time() - t0:.1f} detik")
@@ -0,0 +1,140 @@
+"""
+Gabungkan ulang pesan AIS multi-part (terutama tipe 5) secara streaming.
+
+Pesan tipe 5 (static & voyage) hampir selalu dikirim sebagai dua kalimat NMEA:
+
+    !AIVDM,2,1,3,B,55P5TL01VIaAL@7WKO@mBplU@<PDhh000000001S;AJ::4A80?4i@E53,0*3E
+    !AIVDM,2,2,3,B,1@0000000000000,2*55
+
+`ship_type_code()` dulu mendecode tiap `original` sendiri-sendiri, jadi
+fragmen gagal didecode tanpa pesan apa pun dan kapalnya tidak dapat ship type.
+
+`Reassembler.feed` menerima payload per chunk (urut waktu), menyimpan fragmen
+yang belum lengkap di buffer dengan kunci (mmsi, channel, sequence id, jumlah
+fragmen), dan mengembalikan pesan lengkap sekaligus per chunk. Fragmen lanjutan
+sering datang tanpa MMSI (MMSI hanya ada di bit awal fragmen pertama); fragmen
+seperti itu disambung ke pesan terbuka terbaru dengan (channel, sequence id,
+jumlah) yang sama, selama masih di dalam jendela umur. Buffer dibatasi
+jumlah entri dan umur fragmen, jadi memori tetap kecil walau seluruh dataset
+dialirkan lewat sini. Satu `original` yang sudah berisi semua fragmen (dipisah
+baris baru) juga ditangani.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_PENDING = 10_000         # pesan belum lengkap yang ditahan di buffer
+MAX_AGE_MS = 60_000          # fragmen lebih tua dari ini (relatif chunk terkini) dibuang
+
+
+def parse_sentence(line):
+    """'!AIVDM,2,1,3,B,...' → (jumlah, nomor, seq_id, channel) atau None kalau bukan kalimat AIVDM/AIVDO."""
+    parts = line.split(",", 6)
+    if len(parts) < 7 or not parts[0].endswith(("VDM", "VDO")):
+        return None
+    try:
+        return int(parts[1]), int(parts[2]), parts[3], parts[4]
+    except ValueError:
+        return None
+
+
+def _missing(mmsi):
+    return mmsi is None or mmsi != mmsi         # None / NaN
+
+
+class Reassembler:
+    """Buffer fragmen NMEA lintas chunk; `feed` mengembalikan pesan yang sudah lengkap."""
+
+    def __init__(self, max_pending=MAX_PENDING, max_age_ms=MAX_AGE_MS):
+        self.max_pending = max_pending
+        self.max_age_ms = max_age_ms
+        self.pending = OrderedDict()        # kunci → (ts fragmen pertama, {nomor: kalimat})
+        self.open = {}                      # (channel, seq, jumlah) → kunci terbuka terbaru
+        self.owner = {}                     # kunci tanpa MMSI → MMSI dari fragmen berikutnya
+        self.single = 0
+        self.joined = 0
+        self.expired = 0
+        self.invalid = 0
+
+    def feed(self, payloads, ts=None, mmsi=None):
+        """
+        Proses satu chunk payload (urut waktu).
+
+        `ts` (epoch ms) dipakai untuk membuang fragmen basi; `mmsi` (opsional)
+        ikut jadi kunci supaya sequence id yang sama dari kapal lain tidak tertukar.
+        Return (rows, owners, messages): posisi baris fragmen terakhir di chunk,
+        MMSI pesan (dari fragmen mana pun yang membawanya; None kalau tidak ada)
+        dan tuple kalimat NMEA yang siap untuk `pyais.decode(*kalimat)`.
+        """
+        n = len(payloads)
+        ts = np.zeros(n, dtype=np.int64) if ts is None else np.asarray(ts, dtype=np.int64)
+        mmsi = [None] * n if mmsi is None else list(mmsi)
+
+        rows, owners, messages = [], [], []
+        for i, payload in enumerate(payloads):
+            if not payload:
+                continue
+            for line in payload.split():
+                head = parse_sentence(line)
+                if head is None:
+                    self.invalid += 1
+                    continue
+                count, num, seq, channel = head
+                if count == 1:
+                    rows.append(i)
+                    owners.append(None if _missing(mmsi[i]) else mmsi[i])
+                    messages.append((line,))
+                    self.single += 1
+                    continue
+
+                key = self._key(mmsi[i], (channel, seq, count), num, ts[i])
+                # entri baru masuk di ujung; update tidak memindahkan posisi,
+                # jadi urutan buffer = urutan fragmen pertama (t0)
+                t0, frags = self.pending.setdefault(key, (ts[i], {}))
+                frags[num] = line
+                if len(frags) == count:
+                    del self.pending[key]
+                    if self.open.get(key[1:]) == key:
+                        del self.open[key[1:]]
+                    rows.append(i)
+                    owners.append(key[0] if key[0] is not None else self.owner.pop(key, None))
+                    messages.append(tuple(frags[k] for k in sorted(frags)))
+                    self.joined += 1
+
+        if n:
+            self._evict(int(ts.max()))
+        return np.asarray(rows, dtype=np.int64), owners, messages
+
+    def _key(self, mmsi, tail, num, ts):
+        # fragmen tanpa MMSI ikut pesan terbuka terbaru dengan ekor yang sama;
+        # sebaliknya fragmen ber-MMSI boleh mengadopsi pesan yang dibuka tanpa MMSI.
+        # Nomor fragmen yang sudah ada berarti pesan baru, bukan lanjutan.
+        own = None if _missing(mmsi) else (mmsi, *tail)
+        if own is None or own not in self.pending:
+            alt = self.open.get(tail)
+            if (alt in self.pending and (own is None or alt[0] is None)
+                    and num not in self.pending[alt][1]
+                    and ts - self.pending[alt][0] <= self.max_age_ms):
+                if own is not None:                 # kunci tetap, urutan buffer tidak berubah
+                    self.owner[alt] = mmsi
+                return alt
+        key = own if own is not None else (None, *tail)
+        self.open[tail] = key
+        return key
+
+    def _evict(self, now):
+        # umur dicek di semua entri (chunk tidak dijamin urut sempurna), lalu
+        # kalau buffer masih penuh buang entri dengan fragmen pertama paling lama
+        stale = [key for key, (t0, _) in self.pending.items() if now - t0 > self.max_age_ms]
+        for key in stale:
+            del self.pending[key]
+        self.expired += len(stale)
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            self.expired += 1
+        self.open = {tail: key for tail, key in self.open.items() if key in self.pending}
+        self.owner = {key: m for key, m in self.owner.items() if key in self.pending}
+
+    def report(self):
+        return (f"{self.single:,} pesan tunggal, {self.joined:,} pesan multi-part digabung, "
+                f"{self.expired:,} tidak lengkap dibuang, {len(self.pending):,} masih di buffer")
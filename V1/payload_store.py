@@ -0,0 +1,148 @@
+"""
+Side store untuk kolom `original` (kalimat NMEA mentah).
+
+Kolom `original` adalah bagian terbesar dataset (~2 GB di RAM), padahal hampir
+semua analisis cuma butuh mmsi/ts/lat/lon/sog. Saat ingest payload dipindah ke
+sini dan tabel posisi hanya menyimpan `payload_ref` (int64):
+
+    payload_ref = (nomor_segmen << 32) | baris_dalam_segmen
+
+Tiap segmen = satu file Parquet satu kolom, dikompres zstd per blok
+BLOCK_ROWS baris (row group). Ambil payload = buka blok yang memuat baris itu
+saja, jadi konsumen yang memang decode NMEA bisa ambil satu per satu atau
+per batch tanpa memuat semua payload.
+
+    data/ais_store/payloads/seg-000000.parquet
+
+Payload yang tidak dirujuk lagi (baris yang dibuang dedup saat compact)
+dikosongkan dengan `discard`: barisnya dijadikan null di tempat, jadi
+payload_ref lain tidak berubah, dan segmen yang seluruhnya kosong dihapus.
+"""
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ais_store import STORE
+
+PAYLOADS = "payloads"
+BLOCK_ROWS = 4_096
+CACHE_BLOCKS = 32            # blok terdekompresi yang disimpan di memori
+
+
+def make_ref(segment, rows):
+    return (np.int64(segment) << np.int64(32)) | np.asarray(rows, dtype=np.int64)
+
+
+def split_ref(refs):
+    refs = np.asarray(refs, dtype=np.int64)
+    return refs >> np.int64(32), refs & np.int64(0xFFFFFFFF)
+
+
+class PayloadStore:
+    """Tulis segmen baru dan baca payload secara lazy berdasarkan `payload_ref`."""
+
+    def __init__(self, root=STORE):
+        self.path = Path(root) / PAYLOADS
+        self._files = {}
+        self._blocks = OrderedDict()
+
+    # ────────────────────────── tulis ──────────────────────────
+    def _segment_path(self, segment):
+        return self.path / f"seg-{segment:06d}.parquet"
+
+    def next_segment(self):
+        ids = [int(p.stem.split("-")[1]) for p in self.path.glob("seg-*.parquet")]
+        return max(ids) + 1 if ids else 0
+
+    def append(self, payloads):
+        """Simpan array string sebagai segmen baru; return array payload_ref (int64) yang sejajar."""
+        payloads = pa.array(payloads, type=pa.string()) if not isinstance(payloads, pa.Array) else payloads
+        if len(payloads) == 0:
+            return np.empty(0, dtype=np.int64)
+        self.path.mkdir(parents=True, exist_ok=True)
+        segment = self.next_segment()
+        pq.write_table(pa.table({"original": payloads}), self._segment_path(segment),
+                       row_group_size=BLOCK_ROWS, compression="zstd")
+        return make_ref(segment, np.arange(len(payloads)))
+
+    def discard(self, refs):
+        """
+        Kosongkan payload `refs` yang tidak dirujuk lagi. Segmen ditulis ulang
+        dengan baris itu null (nomor baris tetap); segmen yang jadi kosong semua
+        dihapus. Return (payload dikosongkan, segmen dihapus).
+        """
+        refs = np.unique(np.asarray(refs, dtype=np.int64))
+        seg, row = split_ref(refs)
+        removed = 0
+        for s in np.unique(seg).tolist():
+            path = self._segment_path(s)
+            col = pq.read_table(path, columns=["original"]).column(0).combine_chunks()
+            dead = col.is_null().to_numpy(zero_copy_only=False)
+            dead[row[seg == s]] = True
+            self._files.pop(s, None)
+            for key in [k for k in self._blocks if k[0] == s]:
+                del self._blocks[key]
+            if dead.all():
+                path.unlink()
+                removed += 1
+                continue
+            col = pc.if_else(pa.array(dead), pa.scalar(None, type=pa.string()), col)
+            tmp = path.with_name(path.name + ".tmp")
+            pq.write_table(pa.table({"original": col}), tmp, row_group_size=BLOCK_ROWS, compression="zstd")
+            tmp.replace(path)
+        return len(refs), removed
+
+    # ────────────────────────── baca ──────────────────────────
+    def _file(self, segment):
+        if segment not in self._files:
+            self._files[segment] = pq.ParquetFile(self._segment_path(segment))
+        return self._files[segment]
+
+    def _block(self, segment, block):
+        key = (segment, block)
+        if key in self._blocks:
+            self._blocks.move_to_end(key)
+            return self._blocks[key]
+        col = self._file(segment).read_row_group(block, columns=["original"]).column(0).combine_chunks()
+        self._blocks[key] = col
+        if len(self._blocks) > CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+        return col
+
+    def get(self, ref):
+        """Satu payload (str atau None)."""
+        seg, row = split_ref([ref])
+        block, pos = divmod(int(row[0]), BLOCK_ROWS)
+        return self._block(int(seg[0]), block)[pos].as_py()
+
+    def get_many(self, refs):
+        """
+        Payload untuk banyak ref sekaligus, urutan sama dengan `refs` (pa.StringArray).
+        Ref dikelompokkan per (segmen, blok) sehingga tiap blok hanya didekompresi sekali.
+        """
+        refs = np.asarray(refs, dtype=np.int64)
+        if len(refs) == 0:
+            return pa.array([], type=pa.string())
+        seg, row = split_ref(refs)
+        block = row // BLOCK_ROWS
+        key = (seg << np.int64(20)) | block
+        order = np.argsort(key, kind="stable")
+        uniq, first = np.unique(key[order], return_index=True)
+        bounds = np.append(first, len(order))
+
+        parts, positions = [], []
+        for k in range(len(uniq)):
+            idx = order[bounds[k]:bounds[k + 1]]
+            col = self._block(int(seg[idx[0]]), int(block[idx[0]]))
+            parts.append(col.take(pa.array(row[idx] - block[idx] * BLOCK_ROWS)))
+            positions.append(idx)
+
+        # kembalikan ke urutan input
+        gathered = pa.concat_arrays(parts)
+        inverse = np.empty(len(refs), dtype=np.int64)
+        inverse[np.concatenate(positions)] = np.arange(len(refs))
+        return gathered.take(pa.array(inverse))
@@ -0,0 +1,170 @@
+"""
+Journal append-only untuk hasil scraping.
+
+Dulu kedua scraper menggabungkan semua hasil lama + batch baru (`pd.concat`,
+`drop_duplicates`) lalu menulis ulang seluruh scraped_vessel_type.csv tiap
+20 / 100 MMSI: total I/O kuadratik terhadap jumlah MMSI, dan crash di tengah
+penulisan bisa merusak file.
+
+Sekarang tiap hasil ditambahkan sebagai satu baris JSON ke journal milik
+scraper-nya sendiri,
+
+    data/scrape_journal.<nama>.jsonl      (mis. scrape_journal.bs4.jsonl)
+
+dengan fsync per FSYNC_EVERY baris / FSYNC_SECONDS detik. Kedua scraper
+menulis ke source cache yang sama ("vesselfinder"), jadi nama journal diambil
+dari scraper, bukan dari source. Selama run berjalan journal dikunci (flock
+eksklusif); `compact` mengambil kunci yang sama sebelum membaca dan menghapus
+journal, jadi run lain tidak pernah memadatkan journal yang masih ditulis
+(kunci gagal → RuntimeError, bukan data hilang). Journal baru
+dipadatkan (`compact`) ke cache SQLite (vessel_cache) + CSV sekali di akhir
+run, atau manual lewat CLI. Saat start, sisa journal dari run yang crash
+dibaca ulang sekali secara sekuensial dan dimasukkan ke cache, jadi done-set
+tetap lengkap. Baris terakhir yang terpotong (crash saat menulis) dilewati.
+
+Pemakaian:
+    python V1/scrape_journal.py                        # padatkan semua journal ke cache + CSV
+    python V1/scrape_journal.py --journal data/scrape_journal.bs4.jsonl
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:          # Windows: tanpa kunci, jangan jalankan dua scraper bersamaan
+    fcntl = None
+
+from vessel_cache import CACHE_DB, VesselCache
+
+JOURNAL_DIR = Path("data")
+FSYNC_EVERY = 50
+FSYNC_SECONDS = 5.0
+
+
+def journal_path(name, root=JOURNAL_DIR):
+    """Path journal untuk satu scraper: <root>/scrape_journal.<name>.jsonl."""
+    return Path(root) / f"scrape_journal.{name}.jsonl"
+
+
+def journals(root=JOURNAL_DIR):
+    """Semua journal di `root` (termasuk scrape_journal.jsonl lama bersama)."""
+    return sorted(Path(root).glob("scrape_journal*.jsonl"))
+
+
+def _lock(f, path):
+    """Kunci eksklusif non-blocking pada file journal yang terbuka."""
+    if fcntl is None:
+        return
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        raise RuntimeError(f"journal {path} sedang dipakai run lain") from None
+
+
+class Journal:
+    """File JSONL append-only; fsync dibatch per jumlah baris / selang waktu."""
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_seconds=FSYNC_SECONDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+        self.f = open(self.path, "a", encoding="utf-8")
+        _lock(self.f, self.path)
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def append(self, source, result):
+        """Tambahkan satu hasil {mmsi, vessel_type[, status]} untuk `source`."""
+        record = {"source": source, "fetched_at": time.time(), **result, "mmsi": str(result["mmsi"])}
+        self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_every or time.monotonic() - self.synced_at >= self.fsync_seconds:
+            self.sync()
+
+    def sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def close(self):
+        if not self.f.closed:
+            self.sync()
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def replay(path):
+    """Semua record journal dalam satu baca sekuensial (baris rusak / terpotong dilewati)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def compact(cache, path, csv=None, source=None):
+    """
+    Masukkan isi journal ke `cache` (per source, hasil terakhir menang), tulis
+    CSV gaya lama untuk `source` kalau diminta, lalu kosongkan journal.
+    Journal yang masih dikunci run lain → RuntimeError (tidak disentuh).
+    Return jumlah record yang dipadatkan.
+    """
+    path = Path(path)
+    records = []
+    if path.exists():
+        with open(path, "a", encoding="utf-8") as lock:
+            _lock(lock, path)
+            records = replay(path)
+            by_source = {}
+            for r in records:
+                by_source.setdefault(r.pop("source"), []).append(r)
+            for src, results in by_source.items():
+                cache.put_many(src, results)
+            # hapus selagi kunci dipegang: journal baru dari run lain = file baru
+            path.unlink()
+    if csv is not None and source is not None:
+        write_csv(cache, csv, source)
+    return len(records)
+
+
+def write_csv(cache, csv, source):
+    """Tulis isi cache untuk `source` ke CSV gaya lama (atomik lewat file .tmp)."""
+    tmp = Path(f"{csv}.{os.getpid()}.tmp")     # dua scraper bisa menulis CSV yang sama
+    cache.frame(source).to_csv(tmp, index=False)
+    tmp.replace(csv)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Padatkan journal hasil scraping ke cache + CSV")
+    ap.add_argument("--journal", type=Path, nargs="*", help=f"default: semua journal di {JOURNAL_DIR}")
+    ap.add_argument("--cache", type=Path, default=CACHE_DB)
+    ap.add_argument("--csv", default="scraped_vessel_type.csv")
+    ap.add_argument("--source", default="vesselfinder")
+    args = ap.parse_args()
+
+    n = 0
+    with VesselCache(args.cache) as cache:
+        for path in args.journal or journals():
+            try:
+                n += compact(cache, path)
+            except RuntimeError as e:
+                print(f"⚠  {e}, dilewati")
+        write_csv(cache, args.csv, args.source)
+    print(f"✅ {n} record journal dipadatkan → {args.cache}, {args.csv}")
@@ -1,110 +1,196 @@
-import pandas as pd
-import time
-import random
+"""
+Scraping vessel_type per MMSI dari VesselFinder dengan Playwright (Chromium).
+
+Dulu satu page dijalankan serial: tiap MMSI dua kali page load penuh (gambar,
+font, script ikut dimuat) lalu sleep 3–6 detik. Sekarang:
+
+- pool POOL_SIZE worker, masing-masing satu browser context + page sendiri,
+  mengambil MMSI dari satu antrian terbatas (done-set dan output bersama);
+- resource non-esensial (gambar, font, CSS, script, media, ...) diblok lewat
+  request interception, jadi yang dimuat hanya dokumen HTML;
+- halaman detail dibuka langsung (DETAIL_PATH), halaman search hanya dipakai
+  kalau URL detail tidak memuat tabel kapal.
+
+Tiap hasil ditambahkan ke journal append-only (scrape_journal.py, fsync per
+BATCH_SIZE hasil; menggantikan scraper_log.txt dan penulisan ulang CSV per
+batch) lalu dipadatkan ke cache SQLite bersama (vessel_cache.py, source sama
+dengan scrapping_with_bs4.py) + CSV_OUTPUT sekali di akhir run. MMSI yang
+entrinya masih berlaku tidak dibuka lagi; ERROR dan halaman blokir dicoba
+ulang setelah TTL-nya lewat.
+
+Pemakaian:
+    python V1/scrapping_mmsi.py                        # pool default
+    python V1/scrapping_mmsi.py --pool 1 --no-block --no-direct   # seperti versi serial lama
+    python V1/scrapping_mmsi.py --pool 6 --base-url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
 import os
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+import random
+import time
+from pathlib import Path
+
+import pandas as pd
+from playwright.async_api import TimeoutError as PlaywrightTimeout, async_playwright
+
+from scrape_journal import Journal, compact, journal_path
+from vessel_cache import BLOCKED, CACHE_DB, ERROR, VesselCache, is_blocked
 
 # ======================== CONFIG =========================
 CSV_SOURCE = "mmsi_list_unique.csv"
 CSV_OUTPUT = "scraped_vessel_type.csv"
-LOG_FILE = "scraper_log.txt"
-BATCH_SIZE = 100
+SOURCE = "vesselfinder"  # kunci source di vessel_cache (sama dengan scrapping_with_bs4.py)
+JOURNAL = journal_path("mmsi")  # journal sendiri, aman dijalankan bersamaan scraper lain
+BATCH_SIZE = 100      # fsync journal tiap N hasil
 HEADLESS_MODE = True  # Ubah ke False kalau mau debugging
+BASE_URL = "https://www.vesselfinder.com"
+DETAIL_PATH = "/vessels/details/{mmsi}"
+POOL_SIZE = 4
+DELAY = (1.0, 2.0)    # jeda acak per worker antar MMSI (detik)
+BLOCKED_TYPES = {"image", "media", "font", "stylesheet", "script", "xhr", "fetch",
+                 "websocket", "eventsource", "manifest", "texttrack", "other"}
 # =========================================================
 
-# Load MMSI list
-df_mmsi = pd.read_csv(CSV_SOURCE)
-mmsi_list = df_mmsi["mmsi"].dropna().astype(str).unique().tolist()
-total_mmsi = len(mmsi_list)
-
-# Load previous data
-if os.path.exists(CSV_OUTPUT):
-    df_existing = pd.read_csv(CSV_OUTPUT)
-    done_mmsi = set(df_existing["mmsi"].astype(str))
-else:
-    df_existing = pd.DataFrame(columns=["mmsi", "vessel_type"])
+# ambil nilai kolom .tpc2 di baris yang kolom .tpc1-nya "Ship Type" (satu round-trip ke browser)
+SHIP_TYPE_JS = """rows => {
+    for (const row of rows) {
+        const th = row.querySelector('.tpc1'), td = row.querySelector('.tpc2');
+        if (th && th.textContent.trim() === 'Ship Type') return td ? td.textContent.trim() : '';
+    }
+    return null;
+}"""
+
+
+class Blocked(Exception):
+    """Halaman blokir / captcha / 403."""
+
+
+async def _ship_type(page, url):
+    """Buka `url`; return Ship Type, atau None kalau halaman tidak punya tabel kapal."""
+    res = await page.goto(url, timeout=60000)
+    if res is not None and (res.status == 403 or is_blocked(await page.content())):
+        raise Blocked(f"HTTP {res.status} {url}")
+    if res is None or not res.ok:
+        return None
+    return await page.eval_on_selector_all("tr", SHIP_TYPE_JS)
+
+
+async def scrape_one(page, mmsi, base_url=BASE_URL, direct=True):
+    # Step 1: langsung ke halaman detail kalau tersedia
+    if direct:
+        vessel_type = await _ship_type(page, base_url + DETAIL_PATH.format(mmsi=mmsi))
+        if vessel_type is not None:
+            return vessel_type
+
+    # Step 2: lewat halaman pencarian → link detail kapal
+    res = await page.goto(f"{base_url}/vessels?name={mmsi}", timeout=60000)
+    if res is not None and (res.status == 403 or is_blocked(await page.content())):
+        raise Blocked(f"HTTP {res.status} search")
+    await page.wait_for_selector("a.ship-link", timeout=10000)
+    href = await page.get_attribute("a.ship-link", "href")
+    if not href:
+        raise Exception("Link kapal tidak ditemukan.")
+    vessel_type = await _ship_type(page, href if href.startswith("http") else base_url + href)
+    return vessel_type or ""
+
+
+async def scrape(mmsi_list, output=CSV_OUTPUT, base_url=BASE_URL, pool=POOL_SIZE,
+                 block=True, direct=True, headless=HEADLESS_MODE, cache_db=CACHE_DB, journal_path=JOURNAL):
+    # Load previous data (sisa journal + CSV lama ikut masuk cache supaya resume tetap jalan)
+    cache = VesselCache(cache_db)
+    n = compact(cache, journal_path)
+    if n:
+        print(f"♻  {n} hasil dari journal run sebelumnya dipadatkan ke cache")
+    if os.path.exists(output):
+        cache.import_frame(SOURCE, pd.read_csv(output, dtype=str), os.path.getmtime(output))
+    todo = set(cache.stale(SOURCE, mmsi_list))
     done_mmsi = set()
 
-print(f"🚀 Total MMSI: {total_mmsi}")
-print(f"✅ Sudah diproses sebelumnya: {len(done_mmsi)}")
-
-current_idx = 0
-
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=HEADLESS_MODE)
-    context = browser.new_context()
-    page = context.new_page()
-
-    while current_idx < total_mmsi:
-        results = []
-        print(f"\n🔁 Batch mulai dari index {current_idx}")
-
-        for i in range(current_idx, min(current_idx + BATCH_SIZE, total_mmsi)):
-            mmsi = mmsi_list[i]
+    print(f"🚀 Total MMSI: {len(mmsi_list)}")
+    print(f"✅ Masih berlaku di cache: {len(mmsi_list) - len(todo)}")
+
+    queue = asyncio.Queue(maxsize=pool * 2)
+    journal = Journal(journal_path, fsync_every=BATCH_SIZE)
+    blocked = 0
+
+    async def block_resources(route):
+        nonlocal blocked
+        if route.request.resource_type in BLOCKED_TYPES:
+            blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def producer():
+        for i, mmsi in enumerate(mmsi_list):
+            if mmsi in todo:
+                await queue.put((i, mmsi))
+        for _ in range(pool):
+            await queue.put(None)
+
+    async def worker(browser):
+        context = await browser.new_context()
+        if block:
+            await context.route("**/*", block_resources)
+        page = await context.new_page()
+        while (item := await queue.get()) is not None:
+            i, mmsi = item
             if mmsi in done_mmsi:
-                print(f"[{i}] Skip (sudah ada): {mmsi}")
                 continue
-
             print(f"[{i}] Scraping MMSI: {mmsi}")
+            status = None
             try:
-                # Step 1: buka halaman pencarian
-                search_url = f"https://www.vesselfinder.com/vessels?name={mmsi}"
-                page.goto(search_url, timeout=60000)
-                page.wait_for_selector("a.ship-link", timeout=10000)
-
-                # Step 2: klik ke detail kapal
-                ship_link = page.query_selector("a.ship-link")
-                if not ship_link:
-                    raise Exception("Link kapal tidak ditemukan.")
-                href = ship_link.get_attribute("href")
-                page.goto(href, timeout=60000)
-                page.wait_for_selector("tr", timeout=10000)
-
-                # Step 3: ekstrak Ship Type
-                vessel_type = ""
-                rows = page.query_selector_all("tr")
-                for row in rows:
-                    try:
-                        th = row.query_selector(".tpc1")
-                        td = row.query_selector(".tpc2")
-                        if th and th.inner_text().strip() == "Ship Type":
-                            vessel_type = td.inner_text().strip()
-                            break
-                    except:
-                        continue
-
+                vessel_type = await scrape_one(page, mmsi, base_url, direct)
                 print(f"✅ {mmsi} → {vessel_type}")
-                result = {"mmsi": mmsi, "vessel_type": vessel_type}
-                results.append(result)
-                done_mmsi.add(mmsi)
-
+            except Blocked as e:
+                print(f"⛔ {mmsi} DIBLOK → {str(e)[:100]}")
+                vessel_type, status = ERROR, BLOCKED
             except PlaywrightTimeout as e:
                 print(f"❌ {mmsi} GAGAL (timeout) → {str(e)[:100]}")
-                result = {"mmsi": mmsi, "vessel_type": "ERROR"}
-                results.append(result)
-                done_mmsi.add(mmsi)
-
+                vessel_type = ERROR
             except Exception as e:
                 print(f"❌ {mmsi} GAGAL (lainnya) → {str(e)[:100]}")
-                result = {"mmsi": mmsi, "vessel_type": "ERROR"}
-                results.append(result)
-                done_mmsi.add(mmsi)
-
-            # Simpan log
-            with open(LOG_FILE, "a") as f:
-                f.write(f"{mmsi},{result['vessel_type']}\n")
-
-            time.sleep(random.uniform(3, 6))
-
-        # Simpan hasil ke CSV
-        df_batch = pd.DataFrame(results)
-        df_existing = pd.concat([df_existing, df_batch], ignore_index=True)
-        df_existing.drop_duplicates(subset="mmsi", inplace=True)
-        df_existing.to_csv(CSV_OUTPUT, index=False)
-        print(f"💾 Batch disimpan ({len(df_existing)} total hasil)")
-
-        current_idx += BATCH_SIZE
-
-    browser.close()
-
-print("\n✅ Semua MMSI sudah diproses.")
+                vessel_type = ERROR
+
+            journal.append(SOURCE, {"mmsi": mmsi, "vessel_type": vessel_type, "status": status})
+            done_mmsi.add(mmsi)
+
+            await asyncio.sleep(random.uniform(*DELAY))
+        await context.close()
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless)
+            await asyncio.gather(producer(), *(worker(browser) for _ in range(pool)))
+            await browser.close()
+        if block:
+            print(f"🚫 {blocked} resource non-esensial diblok")
+    finally:
+        journal.close()
+        compact(cache, journal_path, output, SOURCE)
+        total = len(cache.frame(SOURCE))
+        cache.close()
+    return total
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Scrape vessel_type per MMSI dengan pool Playwright")
+    ap.add_argument("--source", default=CSV_SOURCE)
+    ap.add_argument("--output", default=CSV_OUTPUT)
+    ap.add_argument("--base-url", default=BASE_URL)
+    ap.add_argument("--pool", type=int, default=POOL_SIZE, help="jumlah page yang jalan bersamaan")
+    ap.add_argument("--no-block", action="store_true", help="muat semua resource (gambar, CSS, script)")
+    ap.add_argument("--no-direct", action="store_true", help="selalu lewat halaman search")
+    ap.add_argument("--show", action="store_true", help="browser tidak headless (debugging)")
+    ap.add_argument("--cache", type=Path, default=CACHE_DB, help="database SQLite vessel_cache")
+    ap.add_argument("--journal", type=Path, default=JOURNAL, help="journal append-only hasil scraping")
+    args = ap.parse_args()
+
+    # Load MMSI list
+    df_mmsi = pd.read_csv(args.source)
+    mmsi_list = df_mmsi["mmsi"].dropna().astype(str).unique().tolist()
+
+    t0 = time.time()
+    total = asyncio.run(scrape(mmsi_list, args.output, args.base_url.rstrip("/"), args.pool,
+                               not args.no_block, not args.no_direct, not args.show, args.cache, args.journal))
+    print(f"\n✅ Semua MMSI sudah diproses ({total} total hasil, {time.time() - t0:.0f} detik).")
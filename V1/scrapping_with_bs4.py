@@ -1,84 +1,217 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import random
+"""
+Scraping vessel_type per MMSI dari VesselFinder (halaman search → halaman detail).
+
+Dulu MMSI diambil satu per satu dengan `requests.get` + sleep 1,5–3,5 detik,
+jadi refresh ~7.757 MMSI makan hampir seharian. Sekarang pakai asyncio +
+aiohttp: satu connection pool, beberapa request jalan bersamaan (dibatasi per
+host), laju request dijaga token bucket, dan error sementara (timeout, 429,
+5xx) dicoba ulang dengan backoff eksponensial.
+
+Tiap hasil ditambahkan ke journal append-only (scrape_journal.py, fsync per
+SAVE_EVERY hasil) dan baru dipadatkan ke cache SQLite bersama (vessel_cache.py)
++ CSV_OUTPUT sekali di akhir run; sisa journal dari run yang crash dipadatkan
+saat start. MMSI yang entrinya masih berlaku di cache dilewati, jadi NOT_FOUND
+tidak dicoba lagi selama beberapa minggu sedangkan ERROR / halaman blokir
+dicoba ulang setelah beberapa menit. Isi CSV_OUTPUT lama diimpor ke cache saat
+start supaya resume dari CSV tetap jalan.
+
+`--base-url` bisa diarahkan ke server lokal yang menyajikan halaman search /
+detail tiruan (path sama: /vessels?name=<mmsi> dan link a.ship-link).
+
+Pemakaian:
+    python V1/scrapping_with_bs4.py
+    python V1/scrapping_with_bs4.py --concurrency 4 --rate 2
+    python V1/scrapping_with_bs4.py --base-url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
 import os
+import random
+import time
+from pathlib import Path
+
+import aiohttp
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from scrape_journal import Journal, compact, journal_path
+from vessel_cache import BLOCKED, CACHE_DB, ERROR, NOT_FOUND, VesselCache, is_blocked
 
 CSV_SOURCE = "mmsi_list_unique.csv"
 CSV_OUTPUT = "scraped_vessel_type.csv"
+SOURCE = "vesselfinder"  # kunci source di vessel_cache (sama dengan scrapping_mmsi.py)
+JOURNAL = journal_path("bs4")  # journal sendiri, aman dijalankan bersamaan scraper lain
+BASE_URL = "https://www.vesselfinder.com"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/115 Safari/537.36"
 }
 
-# Load MMSI
-df_mmsi = pd.read_csv(CSV_SOURCE)
-mmsi_list = df_mmsi["mmsi"].dropna().astype(str).unique().tolist()
-total_mmsi = len(mmsi_list)
-
-# Load hasil sebelumnya (kalau ada)
-if os.path.exists(CSV_OUTPUT):
-    df_existing = pd.read_csv(CSV_OUTPUT)
-    done_mmsi = set(df_existing["mmsi"].astype(str))
-else:
-    df_existing = pd.DataFrame(columns=["mmsi", "vessel_type"])
-    done_mmsi = set()
-
-print(f"🚀 Total MMSI: {total_mmsi}")
-print(f"✅ Sudah diproses: {len(done_mmsi)}")
-
-results = []
-
-for idx, mmsi in enumerate(mmsi_list):
-    if mmsi in done_mmsi:
-        print(f"[{idx}] Skip (done): {mmsi}")
-        continue
-
-    print(f"[{idx}] Fetching: {mmsi}")
-
+CONCURRENCY = 4          # request bersamaan per host
+RATE = 1.5               # request per detik (rata-rata, token bucket)
+BURST = 4                # token maksimum di bucket
+RETRIES = 4
+BACKOFF = 2.0            # detik, dikali 2 tiap percobaan ulang (+ jitter)
+TIMEOUT = 30
+SAVE_EVERY = 20          # fsync journal tiap N hasil
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TransientError(Exception):
+    """Respons yang layak dicoba ulang (429 / 5xx)."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.retry_after = retry_after
+
+
+class Blocked(TransientError):
+    """Halaman blokir / captcha / 403; dicoba ulang, kalau tetap diblok dicatat BLOCKED."""
+
+
+class TokenBucket:
+    """Batasi laju request: rata-rata `rate` per detik, lonjakan sampai `burst`."""
+
+    def __init__(self, rate=RATE, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# ────────────────────────── parsing ──────────────────────────
+def parse_search(html):
+    """href halaman detail kapal pertama di hasil search, atau None."""
+    link_tag = BeautifulSoup(html, "html.parser").select_one("a.ship-link")
+    return link_tag["href"] if link_tag else None
+
+
+def parse_detail(html):
+    """Nilai baris 'Ship Type' di tabel halaman detail (default UNKNOWN)."""
+    for row in BeautifulSoup(html, "html.parser").select("tr"):
+        cols = row.find_all("td")
+        if len(cols) == 2 and "Ship Type" in cols[0].text:
+            return cols[1].text.strip()
+    return "UNKNOWN"
+
+
+# ────────────────────────── fetch ──────────────────────────
+async def fetch(session, url, bucket, retries=RETRIES, params=None):
+    """GET teks halaman; error sementara dicoba ulang dengan backoff eksponensial + jitter."""
+    for attempt in range(retries + 1):
+        await bucket.acquire()
+        try:
+            async with session.get(url, params=params) as res:
+                if res.status == 403:
+                    raise Blocked(res.status, res.headers.get("Retry-After"))
+                if res.status in RETRY_STATUS:
+                    raise TransientError(res.status, res.headers.get("Retry-After"))
+                res.raise_for_status()
+                text = await res.text()
+                if is_blocked(text):
+                    raise Blocked(res.status)
+                return text
+        except (TransientError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise
+            delay = BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5)
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after and str(retry_after).isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+
+
+async def scrape_one(session, mmsi, bucket, base_url=BASE_URL, retries=RETRIES):
     try:
-        search_url = f"https://www.vesselfinder.com/vessels?name={mmsi}"
-        res = requests.get(search_url, headers=HEADERS, timeout=30)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        link_tag = soup.select_one("a.ship-link")
-        if not link_tag:
+        html = await fetch(session, f"{base_url}/vessels", bucket, retries, params={"name": mmsi})
+        href = parse_search(html)
+        if not href:
             print(f"❌ {mmsi} Not Found")
-            results.append({"mmsi": mmsi, "vessel_type": "NOT_FOUND"})
-            continue
-
-        detail_url = "https://www.vesselfinder.com" + link_tag["href"]
-        detail_res = requests.get(detail_url, headers=HEADERS, timeout=30)
-        detail_soup = BeautifulSoup(detail_res.text, "html.parser")
-
-        rows = detail_soup.select("tr")
-        vessel_type = "UNKNOWN"
-
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) == 2 and "Ship Type" in cols[0].text:
-                vessel_type = cols[1].text.strip()
-                break
-
+            return {"mmsi": mmsi, "vessel_type": NOT_FOUND}
+        vessel_type = parse_detail(await fetch(session, base_url + href, bucket, retries))
         print(f"✅ {mmsi} → {vessel_type}")
-        results.append({"mmsi": mmsi, "vessel_type": vessel_type})
-
+        return {"mmsi": mmsi, "vessel_type": vessel_type}
+    except Blocked as e:
+        print(f"⛔ {mmsi} BLOCKED: {e}")
+        return {"mmsi": mmsi, "vessel_type": ERROR, "status": BLOCKED}
     except Exception as e:
         print(f"❌ {mmsi} ERROR: {str(e)[:100]}")
-        results.append({"mmsi": mmsi, "vessel_type": "ERROR"})
-
-    # Optional: delay untuk hindari rate limit
-    time.sleep(random.uniform(1.5, 3.5))
-
-    # Simpan bertahap tiap 20 hasil
-    if len(results) % 20 == 0:
-        df_temp = pd.DataFrame(results)
-        df_combined = pd.concat([df_existing, df_temp], ignore_index=True).drop_duplicates(subset="mmsi")
-        df_combined.to_csv(CSV_OUTPUT, index=False)
-        print("💾 Disimpan sementara...")
-
-# Final save
-df_temp = pd.DataFrame(results)
-df_combined = pd.concat([df_existing, df_temp], ignore_index=True).drop_duplicates(subset="mmsi")
-df_combined.to_csv(CSV_OUTPUT, index=False)
-print("\n✅ Selesai semua! File tersimpan di scraped_vessel_type.csv")
+        return {"mmsi": mmsi, "vessel_type": ERROR}
+
+
+# ────────────────────────── scrape ──────────────────────────
+async def scrape(mmsi_list, output=CSV_OUTPUT, base_url=BASE_URL, concurrency=CONCURRENCY,
+                 rate=RATE, retries=RETRIES, cache_db=CACHE_DB, journal_path=JOURNAL):
+    """Scrape MMSI yang belum ada / sudah basi di cache; return list hasil baru."""
+    cache = VesselCache(cache_db)
+    n = compact(cache, journal_path)
+    if n:
+        print(f"♻  {n} hasil dari journal run sebelumnya dipadatkan ke cache")
+    if os.path.exists(output):
+        cache.import_frame(SOURCE, pd.read_csv(output, dtype=str), os.path.getmtime(output))
+    todo = cache.stale(SOURCE, mmsi_list)
+    print(f"🚀 Total MMSI: {len(mmsi_list)}")
+    print(f"✅ Masih berlaku di cache: {len(mmsi_list) - len(todo)}")
+
+    bucket = TokenBucket(rate, max(BURST, concurrency))
+    queue = asyncio.Queue()
+    for mmsi in todo:
+        queue.put_nowait(mmsi)
+    results = []
+    journal = Journal(journal_path, fsync_every=SAVE_EVERY)
+
+    async def worker(session):
+        while True:
+            try:
+                mmsi = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await scrape_one(session, mmsi, bucket, base_url, retries)
+            results.append(result)
+            journal.append(SOURCE, result)
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    try:
+        async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    finally:
+        journal.close()
+        compact(cache, journal_path, output, SOURCE)
+        cache.close()
+    return results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Scrape vessel_type per MMSI dari VesselFinder")
+    ap.add_argument("--source", default=CSV_SOURCE)
+    ap.add_argument("--output", default=CSV_OUTPUT)
+    ap.add_argument("--base-url", default=BASE_URL)
+    ap.add_argument("--concurrency", type=int, default=CONCURRENCY, help="request bersamaan per host")
+    ap.add_argument("--rate", type=float, default=RATE, help="request per detik")
+    ap.add_argument("--retries", type=int, default=RETRIES)
+    ap.add_argument("--cache", type=Path, default=CACHE_DB, help="database SQLite vessel_cache")
+    ap.add_argument("--journal", type=Path, default=JOURNAL, help="journal append-only hasil scraping")
+    args = ap.parse_args()
+
+    # Load MMSI
+    df_mmsi = pd.read_csv(args.source)
+    mmsi_list = df_mmsi["mmsi"].dropna().astype(str).unique().tolist()
+
+    t0 = time.time()
+    results = asyncio.run(scrape(mmsi_list, args.output, args.base_url.rstrip("/"),
+                                 args.concurrency, args.rate, args.retries, args.cache, args.journal))
+    print(f"\n✅ Selesai semua! {len(results)} MMSI baru dalam {time.time() - t0:.0f} detik, "
+          f"file tersimpan di {args.output}")
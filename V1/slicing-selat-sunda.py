@@ -1,11 +1,15 @@
 import pandas as pd
 
-# Load data utama
-df = pd.read_pickle('data/maritim.pkl')
+from ais_store import load_positions, SELAT_SUNDA_LUAS
 
-# Filter berdasarkan koordinat Selat Sunda
-df_sunda = df[(df['lat'] >= -8.0) & (df['lat'] <= -4.5) &
-              (df['lon'] >= 104.0) & (df['lon'] <= 107.0)]
+# Catatan: script baru cukup panggil load_positions(bbox=...) langsung.
+# Partisi di ais_store sudah diurutkan Z-order dengan statistik bbox per row group,
+# jadi query wilayah hanya membaca row group yang beririsan dengan kotak.
+# File .pkl di bawah hanya untuk script lama yang masih pakai read_pickle.
+
+# Ambil data wilayah Selat Sunda dari store
+# (kolom created_at datetime dibuat ulang dari ts supaya script lama tetap jalan)
+df_sunda = load_positions(bbox=SELAT_SUNDA_LUAS, utc=True).rename(columns={'utc': 'created_at'})
 
 # Simpan hasilnya ke file .pkl baru
 df_sunda.to_pickle('data/maritim_selat_sunda_dua.pkl')
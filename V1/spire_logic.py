@@ -1,93 +1,44 @@
 import pandas as pd
-import numpy as np
-from haversine import haversine
-from sklearn.neighbors import BallTree
 import matplotlib.pyplot as plt
 import folium
 import hashlib
 import time
 
-start = time.time()
-
-# Load AIS data
-df = pd.read_pickle('data/maritim_selat_sunda.pkl')
-df = df[(df['lat'] >= -6.5) & (df['lat'] <= -5.5) & 
-        (df['lon'] >= 105.0) & (df['lon'] <= 106.0)].reset_index(drop=True)
-df = df.dropna(subset=['mmsi', 'lat', 'lon', 'created_at', 'sog'])
-df['utc'] = pd.to_datetime(df['created_at'])
+from ais_schema import ms_to_datetime
+from ais_store import SELAT_SUNDA, load_positions
+from transhipment import build_sessions, frame_pairs
 
-# Step 1: Time binning (10-minute bins)
-df['bin10'] = df['utc'].dt.floor('10T')
+start = time.time()
 
-# Step 2: Select one position per ship per bin (first position)
-df_bin = df.sort_values('utc').groupby(['bin10', 'mmsi']).first().reset_index()
+# Step 1–2: Satu posisi per kapal per bin 10 menit (posisi pertama), langsung
+# dari view bin10m di ais_store — tidak perlu floor('10T') + groupby().first()
+df_bin = load_positions(table='bin10m', bbox=SELAT_SUNDA, columns=['mmsi', 'lat', 'lon', 'sog'], utc=True)
+df_bin = df_bin.rename(columns={'utc': 'bin10'})
 
-# Step 3: Detect close ship pairs per bin
+# Step 3: Detect close ship pairs per bin (grid hash untuk semua bin sekaligus)
 proximity_threshold_km = 0.05
-pairs = []
-
-for ts, g in df_bin.groupby('bin10'):
-    coords = np.radians(g[['lat', 'lon']])
-    tree = BallTree(coords, metric='haversine')
-    idxs = tree.query_radius(coords, r=proximity_threshold_km / 6371.0)
-    mmsis = g['mmsi'].values
-    for i, neighbors in enumerate(idxs):
-        for j in neighbors:
-            if i < j:
-                pairs.append({
-                    'm1': min(mmsis[i], mmsis[j]),
-                    'm2': max(mmsis[i], mmsis[j]),
-                    'bin10': ts
-                })
-
-pairs_df = pd.DataFrame(pairs)
+pairs_df = frame_pairs(df_bin, proximity_threshold_km, bin='10min', time_col='bin10')
 print("🔍 Jumlah proximity pairs ditemukan:", len(pairs_df))
 
-# Step 4: Detect STS candidates based on streak
-sts_candidates = []
-
-for (m1, m2), group in pairs_df.groupby(['m1', 'm2']):
-    bins = sorted(group['bin10'])
-    streak = 1
-    start_bin = bins[0]
-    for i in range(1, len(bins)):
-        if (bins[i] - bins[i-1]) == pd.Timedelta('10min'):
-            streak += 1
-        else:
-            if streak >= 12:
-                sts_candidates.append({
-                    'm1': m1,
-                    'm2': m2,
-                    'start': start_bin,
-                    'end': bins[i-1],
-                    'duration_min': streak * 10
-                })
-            streak = 1
-            start_bin = bins[i]
-    if streak >= 12:
-        sts_candidates.append({
-            'm1': m1,
-            'm2': m2,
-            'start': start_bin,
-            'end': bins[-1],
-            'duration_min': streak * 10
-        })
-
-sts_df = pd.DataFrame(sts_candidates)
+# Step 4: Detect STS candidates based on streak — semua pasangan sekaligus:
+# bin berturut-turut (jeda ≤ 10 menit) satu sesi, ≥ 12 bin = ≥ 2 jam.
+# lat / lon = rata-rata titik tengah pasangan selama streak.
+ts = ((pairs_df['bin10'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)).to_numpy()
+sess = build_sessions(pairs_df['mmsi_1'], pairs_df['mmsi_2'], ts,
+                      pairs_df['lat'], pairs_df['lon'], pairs_df['dist_km'], gap_ms=10 * 60_000)
+sess = sess[sess['n_ticks'] >= 12]
+sts_df = pd.DataFrame({
+    'm1': sess['mmsi_1'].to_numpy(),
+    'm2': sess['mmsi_2'].to_numpy(),
+    'start': ms_to_datetime(sess['start'].to_numpy()),
+    'end': ms_to_datetime(sess['end'].to_numpy()),
+    'duration_min': sess['n_ticks'].to_numpy() * 10,
+    'lat': sess['lat'].to_numpy(),
+    'lon': sess['lon'].to_numpy(),
+})
 print(f"✅ Jumlah kandidat STS (durasi ≥ 2 jam): {len(sts_df)}")
 
-# Optional: Calculate mean lat/lon for mapping
 if not sts_df.empty:
-    locs = []
-    for idx, row in sts_df.iterrows():
-        subset = df[(df['mmsi'].isin([row['m1'], row['m2']])) & 
-                    (df['utc'] >= row['start']) & (df['utc'] <= row['end'])]
-        lat_mean = subset['lat'].mean()
-        lon_mean = subset['lon'].mean()
-        locs.append({'lat': lat_mean, 'lon': lon_mean})
-
-    locs_df = pd.DataFrame(locs)
-    sts_df = pd.concat([sts_df, locs_df], axis=1)
     sts_df.to_csv("output_sts_candidates.csv", index=False)
 
     # Folium map
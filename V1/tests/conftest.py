@@ -0,0 +1,18 @@
+"""Test dijalankan dari root repo: `python -m pytest -q V1/tests`; script V1 di-import langsung."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def vesselfinder():
+    """Server lokal VesselFinder tiruan (lihat fake_vesselfinder.py)."""
+    from fake_vesselfinder import FakeVesselFinder
+    server = FakeVesselFinder()
+    server.thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,86 @@
+"""Server HTTP lokal pengganti VesselFinder: halaman search / detail / blokir / 403 / 5xx tiruan."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SHIPS = {"111": "Cargo", "222": "Tanker", "333": "Fishing"}
+SEARCH_ONLY = {"444": ("imo9000004", "Tug")}   # URL detail per MMSI 404, hanya lewat search
+BLOCKED_MMSI = "555"                            # search → halaman "You have been blocked"
+FORBIDDEN_MMSI = "666"                          # search → 403
+RESOURCES = ("/static/site.css", "/static/app.js", "/static/ship.png")
+
+PAGE = "<html><head><link rel='stylesheet' href='{0}'><script src='{1}'></script></head>" \
+       "<body><img src='{2}'>{{body}}</body></html>".format(*RESOURCES)
+
+
+def detail_page(vessel_type):
+    return PAGE.format(body="<table><tr><td class='tpc1'>Ship Type</td>"
+                            f"<td class='tpc2'>{vessel_type}</td></tr></table>")
+
+
+def search_page(href):
+    link = f"<a class='ship-link' href='{href}'>kapal</a>" if href else "<p>No results</p>"
+    return PAGE.format(body=link)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=""):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.hits.append((time.monotonic(), self.path))
+        if url.path in RESOURCES:
+            return self._send(200, "")
+
+        if url.path == "/vessels":
+            mmsi = parse_qs(url.query).get("name", [""])[0]
+            with server.lock:
+                failures = server.flaky.get(mmsi, 0)
+                if failures:
+                    server.flaky[mmsi] = failures - 1
+            if failures:
+                return self._send(503, "Service Unavailable")
+            if mmsi == FORBIDDEN_MMSI:
+                return self._send(403, "Forbidden")
+            if mmsi == BLOCKED_MMSI:
+                return self._send(200, "<html><body>You have been blocked</body></html>")
+            if mmsi in SEARCH_ONLY:
+                return self._send(200, search_page(f"/vessels/details/{SEARCH_ONLY[mmsi][0]}"))
+            return self._send(200, search_page(f"/vessels/details/{mmsi}" if mmsi in SHIPS else None))
+
+        if url.path.startswith("/vessels/details/"):
+            key = url.path.rsplit("/", 1)[1]
+            types = {**SHIPS, **dict(SEARCH_ONLY.values())}
+            if key in types:
+                return self._send(200, detail_page(types[key]))
+        return self._send(404, "Not Found")
+
+
+class FakeVesselFinder(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.lock = threading.Lock()
+        self.hits = []          # (waktu monotonic, path) tiap request
+        self.flaky = {}         # mmsi → jumlah 503 sebelum search berhasil
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def paths(self, prefix=""):
+        return [p for _, p in self.hits if p.startswith(prefix)]
@@ -0,0 +1,37 @@
+"""Kalimat NMEA contoh (dibuat dengan pyais.encode_dict) dan pembuat export / store kecil untuk test."""
+import json
+from itertools import count
+
+import pandas as pd
+
+from ais_ingest import ingest
+
+# msg 5 dua fragmen: mmsi 525000001, ship_type 70 (Cargo)
+TYPE5 = ("!AIVDM,2,1,3,A,57lcM@@00001T;40001@E=B1<5AD00000000001600000000003ADPBh0000,0*31",
+         "!AIVDM,2,2,3,A,00000000000,2*27")
+# msg 24 part B satu fragmen: mmsi 525000002, ship_type 30 (Fishing)
+TYPE24 = "!AIVDM,1,1,,B,H7lcM@TN0000000I2j0000000000,0*63"
+# msg 1: mmsi 525000003 di -6.1, 105.6, sog 0.2
+TYPE1 = "!AIVDM,1,1,,A,17lcM@wP027SIP1tPW800001P000,0*51"
+# msg 1: mmsi 525000004 tambat (status 5), ROT 0, COG 123.4, heading 120, akurasi tinggi
+TYPE1_MOORED = "!AIVDM,1,1,,A,17lcMA5001WSIP1tPW84lSh1P000,0*72"
+# msg 18 (class B): mmsi 525000005, COG 360 dan heading 511 = tidak tersedia, tanpa status / ROT
+TYPE18 = "!AIVDM,1,1,,B,B7lcMA@07QpudhO7?<3Q3wP00000,0*71"
+
+_oid = count(1)
+
+
+def record(mmsi, ts, original, aistype=None, lat=None, lon=None, sog=None):
+    """Satu dokumen export MongoDB (Extended JSON) seperti di data/maritim.ais.json."""
+    return {"_id": {"$oid": f"{next(_oid):024x}"}, "mmsi": mmsi, "lat": lat, "lon": lon, "sog": sog,
+            "aistype": aistype, "original": original,
+            "created_at": {"$date": pd.Timestamp(ts, tz="UTC").strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"}}
+
+
+def ingest_records(tmp_path, records, **kw):
+    """Tulis export JSON ke tmp_path lalu ingest ke tmp_path/ais_store; return path store."""
+    src = tmp_path / "export.json"
+    src.write_text(json.dumps(records))
+    dst = tmp_path / "ais_store"
+    ingest(src, dst, **kw)
+    return dst
@@ -0,0 +1,48 @@
+import pyarrow.parquet as pq
+
+from ais_dedup import Deduplicator
+from ais_store import load_positions
+from payload_store import PAYLOADS, PayloadStore
+from samples import TYPE1, ingest_records, record
+
+
+def _pos(ts):
+    return record(525000003, ts, TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2)
+
+
+def test_duplicates_across_unsorted_chunks_are_dropped(tmp_path):
+    # export tidak urut waktu: duplikat 00:00 baru muncul setelah chunk berisi 03:00,
+    # jauh di luar jendela streaming 10 menit
+    records = [_pos("2024-06-01 00:00:00"), _pos("2024-06-01 00:01:00"),
+               _pos("2024-06-01 03:00:00"), _pos("2024-06-01 03:05:00"),
+               _pos("2024-06-01 00:00:00"), _pos("2024-06-01 00:01:00")]
+    dedup = Deduplicator()
+    root = ingest_records(tmp_path, records, chunk_rows=2, dedup=dedup)
+    df = load_positions(root=root)
+    assert len(df) == 4
+    assert dedup.dropped == 2
+
+
+def test_dedup_keeps_distinct_reports(tmp_path):
+    records = [_pos("2024-06-01 00:00:00"), _pos("2024-06-01 00:00:05"),
+               _pos("2024-06-02 00:00:00")]
+    root = ingest_records(tmp_path, records, chunk_rows=2, dedup=Deduplicator())
+    assert len(load_positions(root=root)) == 3
+
+
+def test_dropped_duplicates_leave_no_orphan_payloads(tmp_path):
+    # chunk 2 berisi satu duplikat + satu laporan baru, chunk 3 hanya duplikat;
+    # keduanya di luar jendela streaming, jadi baru dibuang saat compact
+    records = [_pos("2024-06-01 00:00:00"), _pos("2024-06-01 00:01:00"),
+               _pos("2024-06-01 03:00:00"), _pos("2024-06-01 03:05:00"),
+               _pos("2024-06-01 00:00:00"), _pos("2024-06-01 04:00:00"),
+               _pos("2024-06-01 00:01:00"), _pos("2024-06-01 03:00:00")]
+    root = ingest_records(tmp_path, records, chunk_rows=2, dedup=Deduplicator())
+    df = load_positions(root=root)
+    assert len(df) == 5
+
+    segments = sorted(p.name for p in (root / PAYLOADS).glob("seg-*.parquet"))
+    assert segments == ["seg-000000.parquet", "seg-000001.parquet", "seg-000002.parquet"]
+    live = sum(len(pq.read_table(root / PAYLOADS / s).column(0).drop_null()) for s in segments)
+    assert live == len(df)
+    assert PayloadStore(root).get_many(df["payload_ref"]).to_pylist() == [TYPE1] * 5
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from ais_ingest import normalize_extended_json
+
+MS = 1717200000123                      # 2024-06-01 00:00:00.123 UTC
+ISO = "2024-06-01T00:00:00.123Z"
+
+
+@pytest.mark.parametrize("values", [
+    [{"$date": {"$numberLong": str(MS)}}, {"$date": {"$numberLong": str(MS + 1)}}],   # semua epoch
+    [MS, MS + 1],                                                                    # epoch int polos
+    [{"$date": ISO}, {"$date": "2024-06-01T00:00:00.124Z"}],                         # semua ISO
+    [{"$date": ISO}, {"$date": {"$numberLong": str(MS + 1)}}],                       # campuran
+])
+def test_created_at_chunk_kinds(values):
+    df = normalize_extended_json(pd.DataFrame({"created_at": values}))
+    assert str(df["created_at"].dtype) == "datetime64[ms, UTC]"
+    expected = pd.to_datetime([MS, MS + 1], unit="ms", utc=True)
+    assert list(df["created_at"]) == list(expected)
+
+
+def test_created_at_invalid_becomes_nat():
+    df = normalize_extended_json(pd.DataFrame({"created_at": [{"$date": ISO}, None, "bukan tanggal"]}))
+    assert df["created_at"].isna().tolist() == [False, True, True]
@@ -0,0 +1,23 @@
+import pandas as pd
+
+import ais_pipeline
+from samples import TYPE1, TYPE24, ingest_records, record
+
+
+def test_vessel_dim_feeds_mapper_without_spurious_rebuild(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    ingest_records(tmp_path / "data", [
+        record(525000003, "2024-06-01 00:00:00", TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2),
+        record(525000002, "2024-06-01 00:00:05", TYPE24, aistype=24),
+    ])
+    assert ais_pipeline.NODES["ship_type_mapper"].deps == ("vessel_dim",)
+    assert "vessel_dim" in ais_pipeline.NODES["maritim_selat_sunda_with_type"].deps
+
+    assert ais_pipeline.build(["ship_type_mapper"], jobs=1) == ["vessel_dim", "ship_type_mapper"]
+    # update_vessels menulis ulang vessels.parquet di store; key tidak boleh ikut berubah
+    assert ais_pipeline.build(["ship_type_mapper"], jobs=1) == []
+
+    key = (ais_pipeline.DERIVED / "ship_type_mapper" / "latest").read_text()
+    mapper = pd.read_parquet(ais_pipeline.output_dir("ship_type_mapper", key) / "data.parquet")
+    assert dict(zip(mapper["mmsi"], mapper["ship_type_code"])) == {525000002: 30}
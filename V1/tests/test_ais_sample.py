@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from ais_sample import strata_take
+
+
+def _mmsi(small, big):
+    # `small` strata berisi 1 baris + satu strata besar
+    return np.r_[np.arange(1, small + 1), np.full(big, 999)].astype(np.uint32)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_min_per_does_not_exceed_target(seed):
+    mmsi = _mmsi(10, 1000)
+    idx = strata_take(mmsi, 0.1, np.random.default_rng(seed), min_per=1)
+    assert len(idx) == 101                              # floor(1010 × 0.1 + u)
+    taken = mmsi[idx]
+    assert set(taken) == set(mmsi)                      # tiap strata tetap terwakili
+    assert (taken == 999).sum() == 91                   # kelebihan diambil dari strata terbesar
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_min_per_dominates_when_strata_exceed_target():
+    mmsi = _mmsi(100, 100)
+    idx = strata_take(mmsi, 0.05, np.random.default_rng(0), min_per=1)
+    assert len(idx) == 101                              # satu baris per strata, tidak bisa lebih kecil
+
+
+def test_proportional_without_cap():
+    mmsi = np.repeat(np.arange(1, 11), 100).astype(np.uint32)
+    idx = strata_take(mmsi, 0.2, np.random.default_rng(0), min_per=1)
+    assert len(idx) == 200
+    assert np.all(np.bincount(mmsi[idx])[1:] >= 19)
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from ais_views import bin1m
+
+
+def test_bins_take_first_position_inside_selat_sunda():
+    # posisi pertama di bin masih di luar wilayah (Laut Jawa), posisi kedua sudah di Selat Sunda
+    df = pd.DataFrame({
+        "ts": [0, 20_000, 40_000],
+        "mmsi": [525000003] * 3,
+        "lat": [-5.0, -6.1, -6.2],
+        "lon": [108.5, 105.6, 105.7],
+        "sog": [5.0, 4.0, 3.0],
+    })
+    row = bin1m(df).iloc[0]
+    assert (row["lat"], row["lon"]) == (np.float32(-6.1), np.float32(105.6))
+    assert row["n"] == 2
+    assert row["ts_first"] == 20_000
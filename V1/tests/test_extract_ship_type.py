@@ -0,0 +1,41 @@
+import runpy
+from pathlib import Path
+
+import pandas as pd
+
+import ais_pipeline
+import extract_ship_type
+from extract_ship_type import build_mapper
+from samples import TYPE1, TYPE24, ingest_records, record
+
+
+def test_mapper_reads_static_messages_without_position(tmp_path):
+    # pesan statis tidak punya lat/lon: mapping harus global, bukan dipotong bbox
+    root = ingest_records(tmp_path, [
+        record(525000003, "2024-06-01 00:00:00", TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2),
+        record(525000002, "2024-06-01 00:00:05", TYPE24, aistype=24),
+    ])
+    mapper = build_mapper(root)
+    assert dict(zip(mapper["mmsi"], mapper["ship_type_code"])) == {525000002: 30}
+
+
+def test_script_does_not_overwrite_published_artefact(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    ingest_records(tmp_path / "data", [
+        record(525000003, "2024-06-01 00:00:00", TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2),
+        record(525000002, "2024-06-01 00:00:05", TYPE24, aistype=24),
+    ])
+    ais_pipeline.build(["maritim_with_ship_type"], jobs=1)
+    published = Path("data/maritim_with_ship_type.pkl")
+    old = published.resolve()
+    before = old.read_bytes()
+
+    ingest_records(tmp_path / "data", [
+        record(525000003, "2024-06-02 00:00:00", TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2),
+    ], append=True)
+    runpy.run_path(str(Path(extract_ship_type.__file__)), run_name="__main__")
+
+    assert old.read_bytes() == before
+    assert published.resolve() != old
+    assert len(pd.read_pickle(published)) == 2
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from ais_store import load_positions
+from nmea_decode import FIELDS, NmeaDecoder, decode_store
+from samples import TYPE1, TYPE1_MOORED, TYPE5, TYPE18, ingest_records, record
+
+DTYPES = {name: dtype for name, (_, dtype) in FIELDS.items()}
+
+
+def test_decoded_columns_and_dtypes():
+    with NmeaDecoder(jobs=1) as decoder:
+        df = decoder.decode([TYPE1_MOORED, TYPE18, "!AIVDM,1,1,,A,rusak,0*00", None, TYPE5[0]])
+    assert list(df.columns) == list(FIELDS)
+    assert {c: str(t) for c, t in df.dtypes.items()} == DTYPES
+
+    moored = df.iloc[0]
+    assert moored["nav_status"] == 5
+    assert moored["rot"] == 0
+    assert np.isclose(moored["cog"], 123.4, atol=1e-4)
+    assert moored["heading"] == 120
+    assert moored["accuracy"]
+
+    # class B: COG 360 / heading 511 = tidak tersedia → null, tanpa status / ROT
+    assert df.iloc[1][["nav_status", "rot", "cog", "heading"]].isna().all()
+    assert not df.iloc[1]["accuracy"]
+    # payload rusak, kosong, dan fragmen multi-part → semua null
+    assert df.iloc[2:].isna().all().all()
+
+
+def test_pool_matches_single_process():
+    payloads = [TYPE1, TYPE1_MOORED, TYPE18, None] * 3
+    with NmeaDecoder(jobs=1) as single, NmeaDecoder(jobs=2, batch=2) as pool:
+        pd.testing.assert_frame_equal(single.decode(payloads), pool.decode(payloads))
+
+
+def test_cache_hit_and_overflow():
+    with NmeaDecoder(jobs=1, cache_size=3) as decoder:
+        first = decoder.decode([TYPE1, TYPE1, TYPE18])
+        assert decoder.decoded == 2                  # duplikat dalam chunk didecode sekali
+        pd.testing.assert_frame_equal(decoder.decode([TYPE1, TYPE18, TYPE18]), first.iloc[[0, 2, 2]]
+                                      .reset_index(drop=True))
+        assert decoder.decoded == 2                  # lintas chunk: semua dari cache
+        decoder.decode([TYPE1_MOORED, TYPE5[0]])     # cache penuh → dikosongkan dulu
+        assert set(decoder.cache) == set(pd.util.hash_array(np.array([TYPE1_MOORED, TYPE5[0]], dtype=object)))
+        decoder.decode([TYPE1])
+        assert decoder.decoded == 5                  # TYPE1 didecode ulang setelah cache dikosongkan
+
+
+def test_decode_store_only_redecodes_stale_days(tmp_path):
+    root = ingest_records(tmp_path, [
+        record(525000004, "2024-06-01 00:00:00", TYPE1_MOORED, aistype=1, lat=-6.1, lon=105.6, sog=0.1),
+        record(525000005, "2024-06-02 00:00:00", TYPE18, aistype=18, lat=-6.2, lon=105.7, sog=3.0),
+    ])
+    assert decode_store(root, jobs=1) == 2
+    assert decode_store(root, jobs=1) == 0
+
+    ingest_records(tmp_path, [
+        record(525000004, "2024-06-02 00:10:00", TYPE1_MOORED, aistype=1, lat=-6.1, lon=105.6, sog=0.1),
+    ], append=True)
+    assert decode_store(root, jobs=1) == 1           # hanya hari yang berubah
+    assert decode_store(root, jobs=1, force=True) == 2
+
+    dyn = load_positions(root, table="dynamic").sort_values("ts")
+    pos = load_positions(root).sort_values("ts")
+    assert dyn["_id"].tolist() == pos["_id"].tolist()
+    assert dyn["nav_status"].isna().tolist() == [False, True, False]
+    assert dyn["nav_status"].dropna().tolist() == [5, 5]
@@ -0,0 +1,66 @@
+from nmea_reassemble import Reassembler
+from samples import TYPE5
+from vessel_dim import ship_type_code
+
+
+def test_two_part_type5_gives_ship_type():
+    r = Reassembler()
+    rows, owners, messages = r.feed(list(TYPE5), ts=[0, 10], mmsi=[525000001, 525000001])
+    assert rows.tolist() == [1]
+    assert owners == [525000001]
+    assert ship_type_code(*messages[0]) == 70
+    assert not r.pending
+
+
+def test_stale_fragment_expires_even_if_recently_touched():
+    # fragmen A (t0=0) disentuh lagi setelah B (t0=50_000) masuk; dulu A pindah ke
+    # ujung buffer dan _evict berhenti di B yang belum basi, jadi A tidak pernah dibuang
+    a = "!AIVDM,3,{},1,A,000,0*00"
+    b = "!AIVDM,2,1,2,A,000,0*00"
+    r = Reassembler(max_age_ms=60_000)
+    r.feed([a.format(1)], ts=[0], mmsi=[1])
+    r.feed([b], ts=[50_000], mmsi=[2])
+    r.feed([a.format(2)], ts=[55_000], mmsi=[1])
+    r.feed(["!AIVDM,1,1,,A,000,0*00"], ts=[70_000], mmsi=[3])
+    assert list(r.pending) == [(2, "A", "2", 2)]
+    assert r.expired == 1
+
+
+def test_buffer_limit_drops_oldest_first_fragment():
+    frag = "!AIVDM,3,{},{},A,000,0*00"
+    r = Reassembler(max_pending=2, max_age_ms=10**9)
+    r.feed([frag.format(1, 1), frag.format(1, 2)], ts=[0, 1], mmsi=[1, 1])
+    # seq 1 disentuh lagi, tapi fragmen pertamanya tetap yang paling lama
+    r.feed([frag.format(2, 1), frag.format(1, 3)], ts=[2, 3], mmsi=[1, 1])
+    assert [key[2] for key in r.pending] == ["2", "3"]
+    assert r.expired == 1
+
+
+def test_trailing_fragment_without_mmsi_joins_open_message():
+    r = Reassembler()
+    r.feed([TYPE5[0]], ts=[0], mmsi=[525000001])
+    rows, owners, messages = r.feed([TYPE5[1]], ts=[10], mmsi=[None])
+    assert rows.tolist() == [0]
+    assert owners == [525000001]
+    assert ship_type_code(*messages[0]) == 70
+    assert not r.pending
+
+
+def test_nan_mmsi_fragments_pair_within_age_window_only():
+    nan = float("nan")
+    r = Reassembler(max_age_ms=60_000)
+    # dua-duanya tanpa MMSI dalam satu chunk
+    rows, owners, messages = r.feed(list(TYPE5), ts=[0, 10], mmsi=[nan, nan])
+    assert rows.tolist() == [1] and owners == [None]
+    # fragmen lanjutan yang datang setelah jendela umur tidak disambung
+    r.feed([TYPE5[0]], ts=[100_000], mmsi=[525000001])
+    rows, _, _ = r.feed([TYPE5[1]], ts=[200_000], mmsi=[nan])
+    assert rows.tolist() == []
+
+
+def test_repeated_fragment_number_opens_new_message():
+    first = "!AIVDM,2,1,3,B,000,0*00"
+    r = Reassembler()
+    r.feed([first], ts=[0], mmsi=[None])
+    r.feed([first], ts=[5], mmsi=[525000009])
+    assert set(r.pending) == {(None, "B", "3", 2), (525000009, "B", "3", 2)}
@@ -0,0 +1,38 @@
+import pytest
+
+from scrape_journal import Journal, compact, journal_path, journals
+from vessel_cache import VesselCache
+
+
+def test_replay_after_crash_mid_write(tmp_path):
+    path = journal_path("bs4", tmp_path)
+    journal = Journal(path, fsync_every=1)
+    journal.append("vesselfinder", {"mmsi": 1, "vessel_type": "Cargo"})
+    journal.append("vesselfinder", {"mmsi": 2, "vessel_type": "Tanker"})
+    # crash saat menulis baris ketiga: baris terpotong, journal tidak pernah dipadatkan
+    journal.f.write('{"source": "vesselfinder", "mmsi": "3", "vess')
+    journal.f.flush()
+    journal.f.close()
+
+    csv = tmp_path / "scraped.csv"
+    with VesselCache(tmp_path / "cache.sqlite") as cache:
+        assert compact(cache, path, csv, "vesselfinder") == 2
+        assert cache.stale("vesselfinder", ["1", "2", "3"]) == ["3"]
+    assert not path.exists()
+    assert sorted(csv.read_text().splitlines()[1:]) == ["1,Cargo", "2,Tanker"]
+
+
+def test_compact_leaves_live_journal_of_other_run(tmp_path):
+    bs4, mmsi = journal_path("bs4", tmp_path), journal_path("mmsi", tmp_path)
+    assert bs4 != mmsi
+    with VesselCache(tmp_path / "cache.sqlite") as cache, Journal(mmsi) as live:
+        live.append("vesselfinder", {"mmsi": 5, "vessel_type": "Fishing"})
+        with Journal(bs4) as done:
+            done.append("vesselfinder", {"mmsi": 4, "vessel_type": "Cargo"})
+        assert compact(cache, bs4) == 1
+        with pytest.raises(RuntimeError):
+            compact(cache, mmsi)
+        live.append("vesselfinder", {"mmsi": 6, "vessel_type": "Tug"})
+    assert journals(tmp_path) == [mmsi]
+    with VesselCache(tmp_path / "cache.sqlite") as cache:
+        assert compact(cache, mmsi) == 2
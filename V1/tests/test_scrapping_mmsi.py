@@ -0,0 +1,51 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scrapping_mmsi.py"
+
+
+def _has_chromium():
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            return Path(p.chromium.executable_path).exists()
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _has_chromium(), reason="Chromium Playwright tidak terpasang")
+
+
+def test_pool_against_stand_in_server(vesselfinder, tmp_path):
+    pd.DataFrame({"mmsi": ["111", "222", "333", "444", "555"]}).to_csv(tmp_path / "mmsi.csv", index=False)
+    # 333 sudah ada di CSV lama → tidak dibuka lagi
+    pd.DataFrame({"mmsi": ["333"], "vessel_type": ["Fishing"]}).to_csv(tmp_path / "out.csv", index=False)
+
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT), "--pool", "2", "--base-url", vesselfinder.url,
+         "--source", str(tmp_path / "mmsi.csv"), "--output", str(tmp_path / "out.csv"),
+         "--cache", str(tmp_path / "cache.sqlite"), "--journal", str(tmp_path / "journal.jsonl")],
+        capture_output=True, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    out = pd.read_csv(tmp_path / "out.csv", dtype=str)
+    assert dict(zip(out["mmsi"], out["vessel_type"])) == {
+        "333": "Fishing", "111": "Cargo", "222": "Tanker", "444": "Tug", "555": "ERROR"}
+
+    # resource gambar / CSS / script diblok di browser, tidak pernah sampai ke server
+    blocked = int(re.search(r"🚫 (\d+) resource", proc.stdout).group(1))
+    assert blocked >= 3
+    assert vesselfinder.paths("/static/") == []
+
+    # halaman detail dibuka langsung; search hanya untuk yang detail-nya 404 (444) atau diblok (555)
+    searched = sorted(p.split("=")[1] for p in vesselfinder.paths("/vessels?name="))
+    assert searched == ["444", "555"]
+    details = vesselfinder.paths("/vessels/details/")
+    assert sorted(details) == sorted(set(details))     # tiap MMSI hanya dikerjakan satu page
+    assert "/vessels/details/333" not in details
+    assert "/vessels/details/imo9000004" in details
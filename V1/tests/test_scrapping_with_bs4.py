@@ -0,0 +1,69 @@
+import asyncio
+
+import pandas as pd
+
+import scrapping_with_bs4 as bs4
+from vessel_cache import BLOCKED, ERROR, NOT_FOUND, VesselCache
+
+
+def run(server, tmp_path, mmsi_list, **kw):
+    kw = {"concurrency": 2, "rate": 100.0, "retries": 2, **kw}
+    return asyncio.run(bs4.scrape(mmsi_list, tmp_path / "out.csv", server.url,
+                                  cache_db=tmp_path / "cache.sqlite",
+                                  journal_path=tmp_path / "journal.jsonl", **kw))
+
+
+def by_mmsi(results):
+    return {r["mmsi"]: r for r in results}
+
+
+def test_results_and_blocked_pages(vesselfinder, tmp_path, monkeypatch):
+    monkeypatch.setattr(bs4, "BACKOFF", 0.01)
+    results = by_mmsi(run(vesselfinder, tmp_path, ["111", "999", "555", "666"]))
+    assert results["111"]["vessel_type"] == "Cargo"
+    assert results["999"]["vessel_type"] == NOT_FOUND
+    for mmsi in ("555", "666"):
+        assert results[mmsi] == {"mmsi": mmsi, "vessel_type": ERROR, "status": BLOCKED}
+    with VesselCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get(bs4.SOURCE, "555")["status"] == BLOCKED
+    assert not (tmp_path / "journal.jsonl").exists()
+
+
+def test_resume_from_csv(vesselfinder, tmp_path):
+    pd.DataFrame({"mmsi": ["111"], "vessel_type": ["Cargo"]}).to_csv(tmp_path / "out.csv", index=False)
+    results = run(vesselfinder, tmp_path, ["111", "222"])
+    assert [r["mmsi"] for r in results] == ["222"]
+    assert vesselfinder.paths("/vessels?name=111") == []
+    out = pd.read_csv(tmp_path / "out.csv", dtype=str)
+    assert dict(zip(out["mmsi"], out["vessel_type"])) == {"111": "Cargo", "222": "Tanker"}
+
+
+def test_retry_with_backoff_on_5xx(vesselfinder, tmp_path, monkeypatch):
+    monkeypatch.setattr(bs4, "BACKOFF", 0.1)
+    monkeypatch.setattr(bs4.random, "uniform", lambda a, b: 1.0)
+    vesselfinder.flaky["222"] = 2
+    results = by_mmsi(run(vesselfinder, tmp_path, ["222"]))
+    assert results["222"]["vessel_type"] == "Tanker"
+
+    t = [when for when, path in vesselfinder.hits if path == "/vessels?name=222"]
+    assert len(t) == 3
+    gaps = [b - a for a, b in zip(t, t[1:])]
+    assert gaps[0] >= 0.1 and gaps[1] >= 0.2        # BACKOFF * 2 ** attempt
+
+
+def test_gives_up_after_retries(vesselfinder, tmp_path, monkeypatch):
+    monkeypatch.setattr(bs4, "BACKOFF", 0.01)
+    vesselfinder.flaky["222"] = 10
+    results = by_mmsi(run(vesselfinder, tmp_path, ["222"], retries=2))
+    assert results["222"]["vessel_type"] == ERROR
+    assert len(vesselfinder.paths("/vessels?name=222")) == 3
+
+
+def test_rate_limit_is_respected(vesselfinder, tmp_path):
+    rate, burst = 10.0, bs4.BURST
+    run(vesselfinder, tmp_path, ["111", "222", "333", "444"], rate=rate)
+    t = sorted(when for when, _ in vesselfinder.hits)
+    assert len(t) == 8                              # search + detail per MMSI
+    # token bucket: setelah `burst` request pertama, paling cepat `rate` request per detik
+    for k in range(burst, len(t)):
+        assert t[k] - t[0] >= (k + 1 - burst) / rate * 0.9
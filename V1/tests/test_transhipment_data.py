@@ -0,0 +1,13 @@
+import numpy as np
+
+from transhipment import Positions, load, resolve_params
+
+
+def test_load_clips_positions_to_params():
+    pos = Positions(np.array([0, 60_000, 120_000], dtype=np.int64),
+                    np.array([1, 2, 3], dtype=np.uint32),
+                    np.array([-6.0, -6.0, 10.0]), np.array([105.5, 105.5, 105.5]), np.zeros(3))
+    p = resolve_params("fix", end="1970-01-01 00:01:00")
+    clipped = load(pos, p)
+    # baris ke-2 lewat batas waktu, baris ke-3 di luar bbox Selat Sunda
+    assert clipped.mmsi.tolist() == [1]
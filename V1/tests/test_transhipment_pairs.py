@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from transhipment import grid_pairs, pair_table
+from transhipment.pairs import bin_pairs
+
+MIN = 60_000
+
+
+def _positions(n, lat, lon, seed=0):
+    rng = np.random.default_rng(seed)
+    t = rng.integers(0, 60 * MIN, n)
+    lon = (rng.uniform(*lon, n) + 180) % 360 - 180
+    return t, rng.uniform(*lat, n), lon, rng.integers(1, n // 3, n)
+
+
+@pytest.mark.parametrize("lat, lon, radius_km", [
+    ((-8.0, -4.5), (104.0, 107.0), 1.0),        # Selat Sunda
+    ((-60.0, 60.0), (-180.0, 180.0), 200.0),    # global: fallback cKDTree
+    ((70.0, 90.0), (-180.0, 180.0), 50.0),      # sekitar kutub
+    ((-20.0, 20.0), (170.0, 190.0), 20.0),      # melintasi antimeridian
+])
+def test_grid_matches_balltree(lat, lon, radius_km):
+    t, la, lo, mmsi = _positions(20_000, lat, lon)
+    grid = pair_table(*grid_pairs(t, la, lo, radius_km, 10 * MIN), mmsi, la, lo)
+    tree = pair_table(*bin_pairs(t, la, lo, radius_km, 10 * MIN, "balltree"), mmsi, la, lo)
+    assert len(tree) > 0
+    assert grid.equals(tree), f"grid {len(grid)} pasangan, balltree {len(tree)}"
@@ -0,0 +1,55 @@
+import numpy as np
+
+from transhipment import build_sessions, drift_windows, haversine_km
+
+MIN = 60_000
+DAY = 86_400_000
+
+
+def _track(minutes, lat, lon=105.5, t0=0):
+    """Kontak satu pasangan (1, 2) per menit dengan titik tengah di lat / lon."""
+    minutes = np.asarray(minutes, dtype=np.int64)
+    lat = np.broadcast_to(np.asarray(lat, dtype=np.float64), minutes.shape)
+    lon = np.broadcast_to(np.asarray(lon, dtype=np.float64), minutes.shape)
+    one = np.ones(len(minutes), dtype=np.int64)
+    return one, 2 * one, t0 + minutes * MIN, lat, lon, np.full(len(minutes), 0.05)
+
+
+def _windows(*track, **kw):
+    return drift_windows(*track, min_ms=30 * MIN, max_drift_km=2.0, **kw)
+
+
+def test_slow_drift_transfer_reported_per_30_minute_window():
+    # transfer 3 jam, titik tengah bergeser 1,5 km/jam (total 4,5 km): dilaporkan per jendela
+    minutes = np.arange(181)
+    lat = -6.0 + (1.5 * minutes / 60) / 111.2
+    w = _windows(*_track(minutes, lat))
+    assert w["start"].tolist() == [m * MIN for m in (0, 31, 62, 93, 124)]
+    assert ((w["end"] - w["start"]) == 30 * MIN).all()
+    drift = haversine_km(w["start_lat"], w["start_lon"], w["end_lat"], w["end_lon"])
+    assert (drift < 2.0).all()
+
+
+def test_window_waits_for_drift_to_return_below_threshold():
+    minutes = np.arange(61)
+    lat = np.where((minutes >= 20) & (minutes < 50), -6.0 + 3.0 / 111.2, -6.0)
+    w = _windows(*_track(minutes, lat))
+    assert w[["start", "end"]].values.tolist() == [[0, 50 * MIN]]
+
+
+def test_gaps_do_not_split_but_days_do():
+    w = _windows(*_track([0, 10, 20, 60], -6.0))
+    assert w[["start", "end", "n_ticks"]].values.tolist() == [[0, 60 * MIN, 4]]
+
+    track = _track(np.arange(-10, 21), -6.0, t0=DAY)         # 23:50 → 00:20
+    assert len(_windows(*track)) == 1
+    assert _windows(*track, group=track[2] // DAY).empty
+
+
+def test_build_sessions_group_and_gap():
+    m1, m2, t, lat, lon, dist = _track([0, 1, 2, 30, 31], -6.0, t0=DAY - 2 * MIN)
+    s = build_sessions(m1, m2, t, lat, lon, dist, gap_ms=10 * MIN)
+    assert s["n_ticks"].tolist() == [3, 2]
+    s = build_sessions(m1, m2, t, lat, lon, dist, gap_ms=None, group=t // DAY)
+    assert s["n_ticks"].tolist() == [2, 3]
+    assert s["first"].tolist() == [0, 2] and s["last"].tolist() == [1, 4]
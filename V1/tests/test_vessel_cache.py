@@ -0,0 +1,27 @@
+from vessel_cache import BLOCKED, OK, is_blocked, status_of
+
+FILLER = "<p>" + "Vessel particulars, voyage data and port calls. " * 60 + "</p>"
+
+
+def test_normal_page_mentioning_block_words_is_not_blocked():
+    html = ("<html><head><title>KM SINAR BAHARI, Cargo - IMO 0, MMSI 525000001 - VesselFinder</title>"
+            '<script src="https://www.google.com/recaptcha/api.js"></script></head><body>'
+            "<p>Access denied to the bridge for unauthorised crew.</p>" + FILLER +
+            '<form><div class="captcha-box"></div></form></body></html>')
+    assert not is_blocked(html)
+
+
+def test_block_pages():
+    cloudflare = ("<html><head><title>Attention Required! | Cloudflare</title></head><body>"
+                  '<div id="cf-error-details">' + FILLER + "</div></body></html>")
+    challenge = ("<html><head><title>Just a moment...</title></head><body>"
+                 '<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1"></script>'
+                 + FILLER + "</body></html>")
+    assert is_blocked(cloudflare)
+    assert is_blocked(challenge)
+    assert is_blocked("<html><body>You have been blocked</body></html>")
+
+
+def test_legacy_csv_values():
+    assert status_of("Access Denied") == BLOCKED
+    assert status_of("Cargo") == OK
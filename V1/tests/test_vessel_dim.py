@@ -0,0 +1,34 @@
+from ais_validate import MMSI_INVALID, load_quarantine
+from samples import TYPE1, TYPE5, ingest_records, record
+from vessel_dim import load_vessels, update_vessels
+
+
+def test_type5_with_untyped_second_fragment(tmp_path):
+    # fragmen kedua tipe 5 tidak bisa didecode sendiri → aistype null, tanpa posisi
+    root = ingest_records(tmp_path, [
+        record(525000001, "2024-06-01 00:00:00", TYPE5[0], aistype=5),
+        record(525000001, "2024-06-01 00:00:00", TYPE5[1]),
+    ])
+    assert load_quarantine(root).empty
+    update_vessels(root)
+    vessels = load_vessels(root)
+    assert dict(zip(vessels["mmsi"], vessels["ship_type_code"])) == {525000001: 70}
+
+
+def test_type5_second_fragment_without_mmsi(tmp_path):
+    # MMSI hanya ada di fragmen pertama; fragmen kedua tidak boleh di-quarantine / dibuang
+    root = ingest_records(tmp_path, [
+        record(525000001, "2024-06-01 00:00:00", TYPE5[0], aistype=5),
+        record(None, "2024-06-01 00:00:01", TYPE5[1]),
+    ])
+    assert load_quarantine(root).empty
+    update_vessels(root)
+    vessels = load_vessels(root)
+    assert dict(zip(vessels["mmsi"], vessels["ship_type_code"])) == {525000001: 70}
+
+
+def test_typed_report_without_mmsi_is_quarantined(tmp_path):
+    root = ingest_records(tmp_path, [
+        record(None, "2024-06-01 00:00:00", TYPE1, aistype=1, lat=-6.1, lon=105.6, sog=0.2),
+    ])
+    assert load_quarantine(root)["reason"].tolist() == [MMSI_INVALID]
@@ -0,0 +1,132 @@
+"""
+Track store per MMSI: posisi tiap kapal disimpan bersebelahan dan urut waktu
+di array NumPy (.npy) yang dibuka memory-mapped.
+
+Layout di disk (satu file per kolom, semua sepanjang jumlah baris):
+    data/ais_tracks/mmsi.npy      MMSI unik, urut naik
+    data/ais_tracks/offsets.npy   offset awal track tiap MMSI (+ 1 elemen penutup)
+    data/ais_tracks/t.npy         waktu epoch milidetik (int64), urut per kapal
+    data/ais_tracks/lat.npy, lon.npy, sog.npy   (float32, sama dengan store)
+
+Ambil track satu kapal = binary search di mmsi.npy lalu di t.npy, hasilnya
+slice (view) dari memmap tanpa copy — bukan boolean mask ke jutaan baris.
+
+Pemakaian:
+    python V1/track_store.py                         # bangun dari ais_store, wilayah Selat Sunda
+    python V1/track_store.py --region semua --dst data/ais_tracks_all
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ais_schema import ms_to_datetime, to_epoch_ms
+from ais_store import STORE, SELAT_SUNDA, load_positions
+
+TRACKS = Path("data/ais_tracks")
+VALUE_COLS = ("lat", "lon", "sog")
+REGIONS = {"selat_sunda": SELAT_SUNDA, "semua": None}
+
+
+# ────────────────────────── build ──────────────────────────
+def build_tracks(root=STORE, dst=TRACKS, start=None, end=None, bbox=SELAT_SUNDA, value_cols=VALUE_COLS):
+    """Baca ais_store sekali, urutkan (mmsi, waktu), tulis array per kolom + index offset."""
+    df = load_positions(root, start=start, end=end, bbox=bbox,
+                        columns=["mmsi", "ts", *value_cols])
+    df = df.dropna(subset=["mmsi"])
+
+    mmsi = df["mmsi"].to_numpy(dtype=np.uint32)
+    t = df["ts"].to_numpy(dtype=np.int64)
+    order = np.lexsort((t, mmsi))
+
+    dst = Path(dst)
+    dst.mkdir(parents=True, exist_ok=True)
+    mmsi = mmsi[order]
+    uniq, first = np.unique(mmsi, return_index=True)
+    offsets = np.append(first, len(mmsi)).astype(np.int64)
+
+    np.save(dst / "mmsi.npy", uniq)
+    np.save(dst / "offsets.npy", offsets)
+    np.save(dst / "t.npy", t[order])
+    for c in value_cols:
+        np.save(dst / f"{c}.npy", df[c].to_numpy(dtype=np.float32, na_value=np.nan)[order])
+
+    meta = {"rows": int(len(mmsi)), "vessels": int(len(uniq)), "columns": list(value_cols),
+            "bbox": bbox, "start": str(start) if start else None, "end": str(end) if end else None}
+    (dst / "meta.json").write_text(json.dumps(meta, indent=2))
+    return meta
+
+
+# ────────────────────────── baca ──────────────────────────
+class TrackStore:
+    """Akses read-only ke track per MMSI; semua array di-memmap."""
+
+    def __init__(self, path=TRACKS):
+        path = Path(path)
+        self.path = path
+        self.meta = json.loads((path / "meta.json").read_text())
+        self.mmsis = np.load(path / "mmsi.npy", mmap_mode="r")
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self.t = np.load(path / "t.npy", mmap_mode="r")
+        self.columns = {c: np.load(path / f"{c}.npy", mmap_mode="r") for c in self.meta["columns"]}
+
+    def __len__(self):
+        return len(self.mmsis)
+
+    def __contains__(self, mmsi):
+        i = np.searchsorted(self.mmsis, mmsi)
+        return i < len(self.mmsis) and self.mmsis[i] == mmsi
+
+    def bounds(self, mmsi, start=None, end=None):
+        """(lo, hi) baris track `mmsi` dengan waktu di [start, end); (0, 0) kalau tidak ada."""
+        i = np.searchsorted(self.mmsis, int(mmsi))
+        if i >= len(self.mmsis) or self.mmsis[i] != int(mmsi):
+            return 0, 0
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        seg = self.t[lo:hi]
+        if start is not None:
+            lo = lo + int(np.searchsorted(seg, to_epoch_ms(start), side="left"))
+            seg = self.t[lo:hi]
+        if end is not None:
+            hi = lo + int(np.searchsorted(seg, to_epoch_ms(end), side="left"))
+        return lo, hi
+
+    def track(self, mmsi, start=None, end=None):
+        """Dict {'t', 'lat', 'lon', ...} berisi view memmap (tanpa copy) untuk satu kapal."""
+        lo, hi = self.bounds(mmsi, start, end)
+        out = {"t": self.t[lo:hi]}
+        out.update({c: a[lo:hi] for c, a in self.columns.items()})
+        return out
+
+    def track_frame(self, mmsi, start=None, end=None):
+        """Sama seperti track() tapi sebagai DataFrame (kolom utc datetime); ini yang meng-copy."""
+        tr = self.track(mmsi, start, end)
+        df = pd.DataFrame({c: np.asarray(v) for c, v in tr.items() if c != "t"})
+        df.insert(0, "utc", ms_to_datetime(np.asarray(tr["t"])))
+        df.insert(0, "mmsi", int(mmsi))
+        return df
+
+    def iter_tracks(self, start=None, end=None, min_points=1):
+        """Yield (mmsi, track) untuk semua kapal yang punya ≥ min_points titik di rentang waktu."""
+        for m in self.mmsis:
+            tr = self.track(m, start, end)
+            if len(tr["t"]) >= min_points:
+                yield int(m), tr
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bangun track store per MMSI dari ais_store")
+    ap.add_argument("--root", type=Path, default=STORE)
+    ap.add_argument("--dst", type=Path, default=TRACKS)
+    ap.add_argument("--region", choices=REGIONS, default="selat_sunda")
+    ap.add_argument("--start")
+    ap.add_argument("--end")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    print(f"➜  Bangun track store {args.dst} (wilayah {args.region}) ...")
+    meta = build_tracks(args.root, args.dst, args.start, args.end, REGIONS[args.region])
+    print(f"✅  {meta['rows']:,} posisi, {meta['vessels']:,} kapal dalam {time.time() - t0:.1f} detik")
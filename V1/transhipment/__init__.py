@@ -0,0 +1,27 @@
+"""
+Mesin deteksi transhipment (interaksi kapal-ke-kapal) yang bisa di-import.
+
+Dulu logika deteksi disalin di anomali_finder*.py, new_anomali_finder*.py,
+find_proximity_*.py dan spire_logic.py, masing-masing dengan konstanta,
+daftar pelabuhan, fungsi haversine dan titik lambat sendiri. Di sini satu API
+berbasis array kolom NumPy:
+
+    from transhipment import detect
+    events = detect("bin1m", "fix")                  # view bin1m di ais_store, preset "fix"
+    events = detect("data/maritim_selat_sunda_500k.pkl", proximity_km=0.1)
+
+Alurnya stage yang bisa diganti lewat Params (lihat stages.py):
+(opsional) interpolasi track ke grid waktu bersama → filter posisi (SOG
+rendah, jauh dari pelabuhan) → pasangan kandidat per bin waktu → sesi
+interaksi → filter event. Hasilnya selalu tabel event dengan
+kolom EVENT_COLUMNS, apa pun datasetnya atau stage yang dipakai.
+"""
+from .align import interpolate
+from .data import Positions, load
+from .engine import detect, resolve_params
+from .geo import EARTH_RADIUS_KM, PORTS, haversine_km, port_distance_km
+from .pairs import (METHODS, PAIR_COLUMNS, frame_pairs, grid_pairs, ndarray_pairs, pair_table, radius_pairs,
+                    time_pairs, tree_pairs)
+from .params import PRESETS, Params
+from .sessions import SESSION_COLUMNS, build_sessions, drift_windows
+from .stages import EVENT_COLUMNS, STAGES, stage
@@ -0,0 +1,59 @@
+"""
+Penyelarasan track ke grid waktu bersama.
+
+Dulu pasangan kapal dibandingkan lewat `merge_asof` per kombinasi MMSI
+(anomali_finder.py, kuadratik di jumlah kapal) atau hanya kalau timestamp-nya
+persis sama (anomali_finder_optimize_tiga.py, pasangan dengan laju lapor AIS
+berbeda hilang). Di sini semua track diinterpolasi sekaligus ke tick
+kelipatan `step_ms`, sehingga tiap kapal punya tepat satu posisi per tick dan
+pencarian pasangan jadi spatial join per tick (lihat pairs.py).
+"""
+import numpy as np
+
+from .data import Positions
+from .pairs import _expand
+
+
+def interpolate(pos, step_ms, max_gap_ms):
+    """
+    Positions → Positions di tick kelipatan `step_ms` (satu baris per kapal × tick).
+
+    Tick di antara dua posisi berurutan kapal yang sama yang berjarak ≤ max_gap_ms
+    diisi interpolasi linear lat / lon / sog. Tick lain hanya diisi posisi
+    terdekat dalam ± step_ms / 2 (seperti merge_asof nearest); di luar itu kosong.
+    Semua kapal diproses dalam satu pass array: urut (mmsi, waktu) sekali,
+    rentang tick per posisi dibentangkan lewat repeat, duplikat (kapal, tick)
+    dipilih lewat satu lexsort.
+    """
+    if len(pos) == 0:
+        return pos
+    order = np.lexsort((pos.t, pos.mmsi))
+    p = pos.take(order)
+    keep = np.r_[True, (p.mmsi[1:] != p.mmsi[:-1]) | (p.t[1:] != p.t[:-1])]
+    p = p.take(keep) if not keep.all() else p
+    t, n = p.t, len(p)
+
+    nxt = np.minimum(np.arange(n) + 1, n - 1)
+    linked = np.r_[(p.mmsi[1:] == p.mmsi[:-1]) & (np.diff(t) <= max_gap_ms), False]
+    tol = step_ms // 2
+    lo = -((tol - t) // step_ms)                                  # ceil((t - tol) / step)
+    hi = np.where(linked, t[nxt], t + tol) // step_ms + 1
+    o, tick = _expand(lo, np.maximum(hi, lo))
+    tau = tick * step_ms
+
+    # tick di segmen [t_o, t_o+1] → interpolasi; selain itu posisi o sendiri kalau dalam toleransi
+    inner = linked[o] & (tau >= t[o])
+    dt = np.abs(tau - t[o])
+    ok = inner | (dt <= tol)
+    o, tau, inner, dt = o[ok], tau[ok], inner[ok], dt[ok]
+
+    # satu baris per (kapal, tick): utamakan interpolasi, lalu posisi terdekat
+    sel = np.lexsort((dt, ~inner, tau, p.mmsi[o]))
+    first = np.r_[True, (p.mmsi[o][sel][1:] != p.mmsi[o][sel][:-1]) | (tau[sel][1:] != tau[sel][:-1])]
+    sel = sel[first]
+    o, tau, inner = o[sel], tau[sel], inner[sel]
+
+    b = nxt[o]
+    w = np.where(inner, (tau - t[o]) / np.where(inner, t[b] - t[o], 1), 0.0)
+    lerp = lambda a: a[o] + w * (a[b] - a[o])
+    return Positions(tau, p.mmsi[o], lerp(p.lat), lerp(p.lon), lerp(p.sog))
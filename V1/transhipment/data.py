@@ -0,0 +1,93 @@
+"""Input detektor sebagai array kolom NumPy (bukan DataFrame per baris)."""
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ais_schema import to_epoch_ms
+from ais_store import STORE, load_positions
+from track_store import TrackStore
+
+COLUMNS = ["ts", "mmsi", "lat", "lon", "sog"]
+
+
+@dataclass
+class Positions:
+    t: np.ndarray       # epoch ms, int64
+    mmsi: np.ndarray    # uint32
+    lat: np.ndarray     # float64
+    lon: np.ndarray
+    sog: np.ndarray
+
+    def __len__(self):
+        return len(self.t)
+
+    def take(self, idx):
+        """Subset dengan boolean mask atau array index."""
+        return Positions(self.t[idx], self.mmsi[idx], self.lat[idx], self.lon[idx], self.sog[idx])
+
+    @classmethod
+    def from_frame(cls, df):
+        """DataFrame dengan kolom mmsi, lat, lon, sog dan ts (epoch ms) / utc / created_at."""
+        if "ts" not in df.columns:
+            col = "utc" if "utc" in df.columns else "created_at"
+            utc = pd.to_datetime(df[col], utc=True)
+            df = df.assign(ts=(utc - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1))
+        df = df.dropna(subset=COLUMNS)
+        return cls(df["ts"].to_numpy(dtype=np.int64),
+                   df["mmsi"].to_numpy(dtype=np.uint32),
+                   df["lat"].to_numpy(dtype=np.float64),
+                   df["lon"].to_numpy(dtype=np.float64),
+                   df["sog"].to_numpy(dtype=np.float64))
+
+    @classmethod
+    def from_tracks(cls, tracks):
+        """Seluruh isi TrackStore (sudah urut mmsi, waktu); baris tanpa lat / lon / sog dibuang."""
+        pos = cls(np.asarray(tracks.t, dtype=np.int64),
+                  np.repeat(np.asarray(tracks.mmsis, dtype=np.uint32), np.diff(tracks.offsets)),
+                  *(np.asarray(tracks.columns[c], dtype=np.float64) for c in ("lat", "lon", "sog")))
+        keep = ~(np.isnan(pos.lat) | np.isnan(pos.lon) | np.isnan(pos.sog))
+        return pos if keep.all() else pos.take(keep)
+
+
+def _clip(pos, params):
+    """Potong Positions ke bbox / rentang waktu params."""
+    keep = np.ones(len(pos), dtype=bool)
+    if params.bbox is not None:
+        lat_min, lat_max, lon_min, lon_max = params.bbox
+        keep &= (pos.lat >= lat_min) & (pos.lat <= lat_max) & (pos.lon >= lon_min) & (pos.lon <= lon_max)
+    if params.start is not None:
+        keep &= pos.t >= to_epoch_ms(params.start)
+    if params.end is not None:
+        keep &= pos.t < to_epoch_ms(params.end)
+    return pos if keep.all() else pos.take(keep)
+
+
+def _in_scope(df, params):
+    """Potong DataFrame yang dibawa pemanggil ke bbox / rentang waktu params."""
+    return _clip(Positions.from_frame(df), params)
+
+
+def load(dataset, params, root=STORE):
+    """
+    `dataset` boleh:
+      - Positions / DataFrame yang sudah dimuat, atau TrackStore,
+      - path .pkl / .parquet,
+      - nama tabel di ais_store ("positions", "selat_sunda", "bin1m", "bin10m", ...).
+    Bbox dan rentang waktu dari `params` diterapkan di semua kasus.
+    """
+    if isinstance(dataset, Positions):
+        return _clip(dataset, params)
+    if isinstance(dataset, TrackStore):
+        return _clip(Positions.from_tracks(dataset), params)
+    if isinstance(dataset, pd.DataFrame):
+        return _in_scope(dataset, params)
+    path = Path(dataset)
+    if path.suffix == ".pkl":
+        return _in_scope(pd.read_pickle(path), params)
+    if path.suffix == ".parquet":
+        return _in_scope(pd.read_parquet(path), params)
+    df = load_positions(root, start=params.start, end=params.end, bbox=params.bbox,
+                        columns=COLUMNS, table=str(dataset))
+    return Positions.from_frame(df)
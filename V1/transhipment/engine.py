@@ -0,0 +1,64 @@
+"""`detect(dataset, params)`: jalankan stage align → filter → pasangan → sesi → filter event."""
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from ais_store import STORE
+
+from .data import load
+from .params import PRESETS, Params
+from .stages import get_stage
+
+
+def resolve_params(params=None, **overrides):
+    """Params, nama preset, atau None (default) + override per field."""
+    if params is None:
+        params = Params()
+    elif isinstance(params, str):
+        if params not in PRESETS:
+            raise ValueError(f"preset {params!r} tidak dikenal; pilihan: {sorted(PRESETS)}")
+        params = PRESETS[params]
+    return replace(params, **overrides) if overrides else params
+
+
+def detect(dataset="bin1m", params=None, root=STORE, verbose=False, return_pairs=False, **overrides):
+    """
+    Deteksi interaksi kapal-ke-kapal (kandidat transhipment).
+
+    dataset : nama tabel ais_store, path .pkl/.parquet, DataFrame, TrackStore, atau Positions
+    params  : Params, nama preset (lihat params.PRESETS), atau None; field bisa
+              di-override lewat keyword, mis. detect("bin1m", "fix", proximity_km=0.1)
+    Return DataFrame event dengan kolom stages.EVENT_COLUMNS (selalu sama, juga kalau kosong);
+    dengan return_pairs=True juga tabel pasangan per bin: (events, pairs).
+    """
+    p = resolve_params(params, **overrides)
+    log = print if verbose else (lambda *a, **k: None)
+
+    t0 = time.time()
+    pos = load(dataset, p, root)
+    log(f"   ✔  {len(pos):,} posisi dimuat ({time.time() - t0:.1f} s)")
+
+    if p.align is not None:
+        t0 = time.time()
+        pos = get_stage("align", p.align)(pos, p)
+        log(f"   ✔  align {p.align}: {len(pos):,} posisi × tick {p.bin_min:g} menit ({time.time() - t0:.1f} s)")
+
+    for name in p.filters:
+        t0 = time.time()
+        pos = pos.take(get_stage("filter", name)(pos, p))
+        log(f"   ✔  filter {name}: {len(pos):,} posisi ({time.time() - t0:.1f} s)")
+
+    t0 = time.time()
+    pairs = get_stage("pairs", p.pairs)(pos, p)
+    log(f"   ✔  pasangan ({p.pairs}): {len(pairs):,} pasangan × bin ({time.time() - t0:.1f} s)")
+
+    t0 = time.time()
+    events = get_stage("sessions", p.sessions)(pairs, p)
+    log(f"   ✔  sesi ({p.sessions}): {len(events):,} sesi ≥ {p.duration_min:g} menit ({time.time() - t0:.1f} s)")
+
+    for name in p.event_filters:
+        keep = np.asarray(get_stage("event_filter", name)(events, p), dtype=bool)
+        events = events[keep].reset_index(drop=True)
+        log(f"   ✔  filter event {name}: {len(events):,} event")
+    return (events, pairs) if return_pairs else events
@@ -0,0 +1,33 @@
+"""Geometri bersama: haversine vektor dan daftar pelabuhan Selat Sunda."""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Daftar pelabuhan (sama dengan yang dulu disalin di tiap script detektor)
+PORTS = (
+    {"name": "Pelabuhan Merak", "lat": -5.8933, "lon": 106.0086},
+    {"name": "Pelabuhan Ciwandan", "lat": -5.9525, "lon": 106.0358},
+    {"name": "Pelabuhan Bojonegara", "lat": -5.8995, "lon": 106.0657},
+    {"name": "Pelabuhan Bakauheni", "lat": -5.8711, "lon": 105.7421},
+    {"name": "Pelabuhan Panjang", "lat": -5.4558, "lon": 105.3134},
+    {"name": "Pelabuhan Ciwandan 2", "lat": -6.02147, "lon": 105.95485},
+)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak great-circle (km) antar titik derajat; semua argumen boleh array (broadcast)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def port_distance_km(lat, lon, ports=PORTS):
+    """Jarak (km) tiap titik ke pelabuhan terdekat."""
+    lat = np.asarray(lat, dtype=np.float64)
+    if not ports:
+        return np.full(lat.shape, np.inf)
+    p_lat = np.array([p["lat"] for p in ports])
+    p_lon = np.array([p["lon"] for p in ports])
+    d = haversine_km(lat[..., None], np.asarray(lon, dtype=np.float64)[..., None], p_lat, p_lon)
+    return d.min(axis=-1)
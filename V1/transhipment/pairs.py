@@ -0,0 +1,210 @@
+"""
+Ekstraksi pasangan kandidat dari hasil BallTree / KDTree tanpa loop Python per tetangga.
+
+Dulu index spasialnya cepat, tapi tiap tetangga lalu dijalani dengan loop
+bersarang: `group.iloc[i]`, cek SOG per pasangan, lalu append dict. Di sini
+hasil `query_radius` / `query_pairs(output_type='ndarray')` langsung diubah
+jadi array index datar (i, j), mask SOG / MMSI sama diterapkan ke array itu,
+dan jarak + titik tengah dihitung sekali untuk semua pasangan.
+
+`grid_pairs` menggantikan tree per bin: join radius tetap berbasis grid hash
+di bidang singgung untuk seluruh dataset sekaligus (lihat bench_pairs.py untuk
+perbandingan dengan BallTree per bin); hanya data yang terbentang terlalu
+lebar (mis. global) yang kembali ke cKDTree per bin.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from sklearn.neighbors import BallTree
+
+from .geo import EARTH_RADIUS_KM, haversine_km
+
+PAIR_COLUMNS = ["t", "mmsi_1", "mmsi_2", "lat", "lon", "dist_km"]
+TREES = ("balltree", "kdtree")
+METHODS = (*TREES, "grid")
+
+
+# ────────────────────────── hasil tree → (i, j) ──────────────────────────
+def radius_pairs(ind):
+    """Output `query_radius` (array object berisi array index) → (i, j) datar, i < j."""
+    n = np.fromiter(map(len, ind), dtype=np.int64, count=len(ind))
+    i = np.repeat(np.arange(len(ind), dtype=np.int64), n)
+    j = np.concatenate(ind).astype(np.int64) if len(ind) else np.empty(0, dtype=np.int64)
+    keep = i < j
+    return i[keep], j[keep]
+
+
+def ndarray_pairs(pairs):
+    """Output `query_pairs(output_type='ndarray')` (n × 2) → (i, j), i < j."""
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    return pairs.min(axis=1), pairs.max(axis=1)
+
+
+def unit_xyz(lat, lon):
+    """Titik derajat → vektor satuan 3D; jarak Euclid (chord) monoton dengan jarak haversine."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord(radius_km):
+    """Radius great-circle (km) → panjang chord di bola satuan."""
+    return 2 * np.sin(radius_km / (2 * EARTH_RADIUS_KM))
+
+
+def tree_pairs(lat, lon, radius_km, method="balltree"):
+    """Semua (i, j), i < j, dengan jarak haversine ≤ radius_km, lewat satu index spasial."""
+    if len(lat) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if method == "balltree":
+        coords = np.radians(np.column_stack([lat, lon]))
+        ind = BallTree(coords, metric="haversine").query_radius(coords, r=radius_km / EARTH_RADIUS_KM)
+        return radius_pairs(ind)
+    if method == "kdtree":
+        return ndarray_pairs(cKDTree(unit_xyz(lat, lon)).query_pairs(chord(radius_km), output_type="ndarray"))
+    raise ValueError(f"method harus salah satu dari {TREES}, bukan {method!r}")
+
+
+def bin_pairs(t, lat, lon, radius_km, bin_ms, method="balltree"):
+    """
+    Pasangan dalam bin waktu yang sama: satu tree per bin, hasilnya digabung
+    jadi (i, j, tick) datar dengan index ke array input.
+    """
+    b = t - t % bin_ms
+    order = np.argsort(b, kind="stable")
+    sb = b[order]
+    first = np.flatnonzero(np.r_[len(sb) > 0, sb[1:] != sb[:-1]])
+    last = np.append(first[1:], len(sb))[:len(first)]
+    ii, jj = [], []
+    for s in np.flatnonzero(last - first >= 2):
+        idx = order[first[s]:last[s]]
+        i, j = tree_pairs(lat[idx], lon[idx], radius_km, method)
+        ii.append(idx[i])
+        jj.append(idx[j])
+    if not ii:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), b
+    return np.concatenate(ii), np.concatenate(jj), b
+
+
+# ────────────────────────── grid hash ──────────────────────────
+GRID_MAX_ANGLE = 60.0   # derajat dari pusat data; lebih lebar → sel di tepi terlalu padat, pakai tree
+
+
+def _expand(lo, hi):
+    """Rentang [lo, hi) per elemen → (index pemilik, posisi) datar."""
+    n = hi - lo
+    owner = np.repeat(np.arange(len(lo), dtype=np.int64), n)
+    offset = np.arange(n.sum(), dtype=np.int64) - np.repeat(np.cumsum(n) - n, n)
+    return owner, np.repeat(lo, n) + offset
+
+
+def tangent_plane(lat, lon):
+    """
+    Proyeksi ortografik ke bidang singgung di arah rata-rata data → (x, y) km dan
+    cos sudut terbesar titik dari pusat. Proyeksi tidak pernah memperpanjang jarak
+    (jarak bidang ≤ chord ≤ great-circle), jadi grid selebar radius di bidang ini
+    tidak kehilangan pasangan di lintang / bujur mana pun.
+    """
+    xyz = unit_xyz(lat, lon)
+    center = xyz.mean(axis=0)
+    center /= np.linalg.norm(center) or 1.0
+    east = np.cross([0.0, 0.0, 1.0], center)
+    if np.linalg.norm(east) < 1e-9:                  # pusat di kutub
+        east = np.array([1.0, 0.0, 0.0])
+    east /= np.linalg.norm(east)
+    north = np.cross(center, east)
+    return EARTH_RADIUS_KM * (xyz @ east), EARTH_RADIUS_KM * (xyz @ north), (xyz @ center).min()
+
+
+def grid_pairs(t, lat, lon, radius_km, bin_ms):
+    """
+    Fixed-radius join untuk semua bin sekaligus tanpa tree: posisi diproyeksikan
+    ke bidang singgung (`tangent_plane`) dan di-hash ke sel grid selebar radius,
+    kunci (bin, sel) diurutkan sekali, lalu tiap sel terisi hanya dipasangkan
+    dengan dirinya dan 4 sel tetangga "setengah" (sisanya simetris). Join sel
+    lewat searchsorted di kunci unik, ekspansi ke posisi lewat repeat; jarak
+    haversine pastinya dicek di akhir. Data yang terbentang lebih dari
+    GRID_MAX_ANGLE dari pusatnya (mis. global) diserahkan ke cKDTree per bin.
+    Return (i, j, tick) seperti `bin_pairs`.
+    """
+    b = t - t % bin_ms
+    empty = np.empty(0, dtype=np.int64)
+    if len(t) < 2:
+        return empty, empty, b
+    x, y, spread = tangent_plane(lat, lon)
+    if spread < np.cos(np.radians(GRID_MAX_ANGLE)):
+        return bin_pairs(t, lat, lon, radius_km, bin_ms, "kdtree")
+    cx = np.floor((x - x.min()) / radius_km).astype(np.int64) + 1
+    cy = np.floor((y - y.min()) / radius_km).astype(np.int64) + 1
+    nx, ny = cx.max() + 2, cy.max() + 2
+    bi = (b - b.min()) // bin_ms
+    code = (bi * ny + cy) * nx + cx
+
+    order = np.argsort(code, kind="stable")
+    cells, start, count = np.unique(code[order], return_index=True, return_counts=True)
+    ii, jj = [], []
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        other = np.searchsorted(cells, cells + dy * nx + dx)
+        other[other == len(cells)] = 0
+        a = np.flatnonzero(cells[other] == cells + dy * nx + dx)
+        c, p = _expand(start[a], start[a] + count[a])             # posisi di sel a
+        k, q = _expand(start[other[a]][c], (start + count)[other[a]][c])  # × posisi di sel tetangga
+        p = p[k]
+        if (dx, dy) == (0, 0):
+            p, q = p[p < q], q[p < q]
+        ii.append(order[p])
+        jj.append(order[q])
+    i, j = np.concatenate(ii), np.concatenate(jj)
+    near = haversine_km(lat[i], lon[i], lat[j], lon[j]) <= radius_km
+    i, j = np.minimum(i[near], j[near]), np.maximum(i[near], j[near])
+    return i, j, b
+
+
+# ────────────────────────── (i, j) → tabel pasangan ──────────────────────────
+def pair_table(i, j, tick, mmsi, lat, lon, sog=None, sog_max=None, radius_km=None, dedup=True):
+    """
+    Index pasangan → DataFrame kolom PAIR_COLUMNS, semua operasi array:
+    pasangan MMSI sama dibuang, opsional keduanya SOG < sog_max dan jarak ≤ radius_km;
+    dengan dedup, per (tick, pasangan) hanya yang terdekat disimpan.
+    """
+    i, j = np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64)
+    keep = mmsi[i] != mmsi[j]
+    if sog_max is not None:
+        keep &= (sog[i] < sog_max) & (sog[j] < sog_max)
+    i, j = i[keep], j[keep]
+    dist = haversine_km(lat[i], lon[i], lat[j], lon[j])
+    if radius_km is not None:
+        near = dist <= radius_km
+        i, j, dist = i[near], j[near], dist[near]
+    df = pd.DataFrame({
+        "t": tick[i],
+        "mmsi_1": np.minimum(mmsi[i], mmsi[j]),
+        "mmsi_2": np.maximum(mmsi[i], mmsi[j]),
+        "lat": (lat[i] + lat[j]) / 2,
+        "lon": (lon[i] + lon[j]) / 2,
+        "dist_km": dist,
+    })
+    if dedup:
+        df = df.sort_values("dist_km", kind="stable").drop_duplicates(["t", "mmsi_1", "mmsi_2"])
+    return df.sort_values(["t", "mmsi_1", "mmsi_2"], ignore_index=True)
+
+
+def time_pairs(t, lat, lon, radius_km, bin_ms, method="grid"):
+    """(i, j, tick) pasangan dalam bin waktu yang sama dengan metode `method` (lihat METHODS)."""
+    if method == "grid":
+        return grid_pairs(t, lat, lon, radius_km, bin_ms)
+    return bin_pairs(t, lat, lon, radius_km, bin_ms, method)
+
+
+def frame_pairs(df, radius_km, sog_max=None, bin="1min", method="grid", time_col="utc"):
+    """
+    Versi DataFrame untuk script lama: kolom mmsi, lat, lon, sog, `time_col`
+    (datetime) → tabel pasangan per bin dengan kolom waktu `time_col` (awal bin).
+    """
+    t = (pd.to_datetime(df[time_col], utc=True) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+    t = t.to_numpy(dtype=np.int64)
+    lat, lon = df["lat"].to_numpy(dtype=np.float64), df["lon"].to_numpy(dtype=np.float64)
+    i, j, tick = time_pairs(t, lat, lon, radius_km, pd.Timedelta(bin) // pd.Timedelta(milliseconds=1), method)
+    out = pair_table(i, j, tick, df["mmsi"].to_numpy(), lat, lon,
+                     df["sog"].to_numpy(dtype=np.float64), sog_max)
+    out[time_col] = pd.to_datetime(out.pop("t"), unit="ms", utc=True)
+    return out
@@ -0,0 +1,42 @@
+"""Parameter deteksi (satu tempat untuk konstanta yang dulu beda-beda per script)."""
+from dataclasses import dataclass
+
+from ais_store import SELAT_SUNDA
+
+from .geo import PORTS
+
+
+@dataclass(frozen=True)
+class Params:
+    proximity_km: float = 0.05      # 50 meter
+    duration_min: float = 30        # minimal 30 menit
+    sog_max: float = 0.5            # kapal hampir diam (knot, SOG < sog_max)
+    port_km: float = 10.0           # minimal 10 km dari pelabuhan
+    gap_min: float = 10             # jeda antar kontak > gap_min → sesi baru
+    bin_min: float = 1              # lebar bin waktu untuk mencari pasangan
+    max_gap_min: float = 5          # align: posisi berjarak ≤ max_gap_min masih diinterpolasi
+    bbox: tuple = SELAT_SUNDA
+    start: str = None
+    end: str = None
+    ports: tuple = PORTS
+    # stage yang dipakai (nama di registry stages.py), berurutan
+    align: str = None               # None: posisi mentah per bin; "interp": track ke grid bin_min
+    filters: tuple = ("slow",)      # filter posisi sebelum mencari pasangan
+    pairs: str = "grid"             # pencari pasangan kandidat per bin (grid / kdtree / balltree)
+    sessions: str = "gap"           # pasangan per bin → sesi interaksi
+    event_filters: tuple = ("port",)
+
+
+PRESETS = {
+    # anomali_finder_optimize_dua.py / find_proximity_*.py
+    "fix": Params(),
+    # anomali_finder.py: merge_asof per kombinasi MMSI → interpolasi ke grid 1 menit, radius 1 km
+    "asof": Params(proximity_km=1.0, align="interp", event_filters=()),
+    # anomali_finder_optimize_tiga.py: pelabuhan dicek per posisi sebelum dipasangkan;
+    # timestamp persis sama diganti grid 1 menit
+    "tiga": Params(align="interp", filters=("slow", "port"), event_filters=()),
+    # new_anomali_finder*.py: radius 2 km
+    "new": Params(proximity_km=2.0),
+    # spire_logic.py: bin 10 menit, ≥ 12 bin berturut-turut, tanpa filter SOG / pelabuhan
+    "spire": Params(bin_min=10, gap_min=10, duration_min=110, filters=(), event_filters=()),
+}
@@ -0,0 +1,166 @@
+"""
+Sesi interaksi per pasangan kapal, untuk semua pasangan sekaligus.
+
+Dulu tiap script membangun sesi dengan loop Python: streak per (m1, m2) di
+spire_logic.py, groupby pasangan lalu groupby 'gap' di
+anomali_finder_optimize_dua.py, state machine `iterrows` di
+new_anomali_finder_tiga.py. Di sini tabel observasi pasangan diurutkan sekali
+menurut (pasangan, waktu) lewat satu kunci int64, batas sesi ditandai
+dengan diff, dan semua agregat dihitung dengan satu `np.*.reduceat` per kolom.
+
+`drift_windows` mempertahankan aturan state machine new_anomali_finder_tiga.py:
+di dalam tiap sesi, jendela dimulai di kontak pertama dan ditutup di kontak
+pertama yang ≥ min_ms setelahnya dengan pergeseran titik tengah < max_drift_km,
+lalu jendela berikutnya dimulai di kontak sesudahnya.
+"""
+import numpy as np
+import pandas as pd
+
+from .geo import haversine_km
+
+SESSION_COLUMNS = ["mmsi_1", "mmsi_2", "start", "end", "n_ticks", "lat", "lon",
+                   "start_lat", "start_lon", "end_lat", "end_lon", "dist_min_km", "dist_mean_km",
+                   "first", "last"]
+
+
+def _empty():
+    return pd.DataFrame({c: pd.Series(dtype=np.float64 if c in ("lat", "lon") else np.int64)
+                         for c in SESSION_COLUMNS})
+
+
+def _sorted_sessions(mmsi_1, mmsi_2, t, gap_ms, group):
+    """Urutan baris (pasangan, waktu) dan posisi awal / akhir tiap sesi di urutan itu."""
+    m1, m2, t = np.asarray(mmsi_1), np.asarray(mmsi_2), np.asarray(t, dtype=np.int64)
+    # satu argsort int64 atas (kode pasangan, waktu) — jauh lebih cepat dari lexsort 3 kolom
+    key = (m1.astype(np.uint64) << np.uint64(32)) | m2.astype(np.uint64)
+    code = pd.factorize(key, sort=True)[0].astype(np.int64)
+    span = int(t.max()) - int(t.min()) + 1
+    if int(code.max()) < np.iinfo(np.int64).max // span:
+        order = np.argsort(code * span + (t - t.min()))
+    else:
+        order = np.lexsort((t, code))
+    code, ts = code[order], t[order]
+
+    new = np.r_[True, code[1:] != code[:-1]]
+    if gap_ms is not None:
+        new[1:] |= np.diff(ts) > gap_ms
+    if group is not None:
+        g = np.asarray(group)[order]
+        new[1:] |= g[1:] != g[:-1]
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(ts)) - 1
+    return order, first, last
+
+
+def _frame(m1, m2, t, lat, lon, dist, order, first, last):
+    """Satu baris SESSION_COLUMNS per rentang [first, last] (posisi di array yang sudah diurutkan)."""
+    n = last - first + 1
+    # reduceat atas indeks [first, last+1] berselang-seling: elemen genap = agregat
+    # rentang [first, last], jadi rentang tidak harus bersambung (jendela drift_windows)
+    idx = np.empty(2 * len(first), dtype=np.int64)
+    idx[0::2], idx[1::2] = first, last + 1
+
+    def reduce(ufunc, x):
+        return ufunc.reduceat(np.append(x, 0.0), idx)[0::2]
+
+    return pd.DataFrame({
+        "mmsi_1": m1[first],
+        "mmsi_2": m2[first],
+        "start": t[first],
+        "end": t[last],
+        "n_ticks": n,
+        "lat": reduce(np.add, lat) / n,
+        "lon": reduce(np.add, lon) / n,
+        "start_lat": lat[first],
+        "start_lon": lon[first],
+        "end_lat": lat[last],
+        "end_lon": lon[last],
+        "dist_min_km": reduce(np.minimum, dist),
+        "dist_mean_km": reduce(np.add, dist) / n,
+        "first": order[first],
+        "last": order[last],
+    })
+
+
+def build_sessions(mmsi_1, mmsi_2, t, lat, lon, dist, gap_ms, group=None):
+    """
+    Observasi pasangan (satu baris per pasangan × waktu, t epoch ms) → satu baris per sesi.
+
+    Sesi baru dimulai saat pasangan berganti, jeda ke observasi sebelumnya
+    > gap_ms (None = tanpa pemisahan jeda), atau `group` berganti (opsional,
+    kunci yang naik bersama waktu, mis. hari). Kolom SESSION_COLUMNS: start /
+    end (ms), n_ticks, titik tengah lat / lon (rata-rata), posisi awal / akhir,
+    jarak min / rata-rata, serta `first` / `last` = index baris input
+    observasi pertama / terakhir sesi (untuk mengambil kolom lain, mis. SOG awal).
+    """
+    if len(t) == 0:
+        return _empty()
+    order, first, last = _sorted_sessions(mmsi_1, mmsi_2, t, gap_ms, group)
+    m1, m2, t = np.asarray(mmsi_1)[order], np.asarray(mmsi_2)[order], np.asarray(t, dtype=np.int64)[order]
+    lat, lon, dist = (np.asarray(a, dtype=np.float64)[order] for a in (lat, lon, dist))
+    return _frame(m1, m2, t, lat, lon, dist, order, first, last)
+
+
+def _first_hit(lat, lon, s, j, b, max_drift_km, block=256):
+    """Posisi pertama di [j, b] yang jaraknya ke `s` < max_drift_km (dicek per blok yang membesar)."""
+    while j <= b:
+        e = min(j + block, b + 1)
+        ok = np.flatnonzero(haversine_km(lat[s], lon[s], lat[j:e], lon[j:e]) < max_drift_km)
+        if len(ok):
+            return j + int(ok[0])
+        j, block = e, block * 2
+    return None
+
+
+def _scan(lat, lon, a, b, j0, ok0, max_drift_km):
+    """Jendela (awal, akhir) greedy di satu sesi [a, b], mulai dari kandidat akhir j0 yang sudah dihitung."""
+    out = []
+    s = a
+    while s < b:
+        hit = j0[s] if ok0[s] else _first_hit(lat, lon, s, j0[s] + 1, b, max_drift_km)
+        if hit is None:
+            break
+        out.append((s, hit))
+        s = hit + 1
+    return out
+
+
+def drift_windows(mmsi_1, mmsi_2, t, lat, lon, dist, min_ms, max_drift_km, gap_ms=None, group=None):
+    """
+    Jendela ≥ min_ms per sesi (lihat build_sessions untuk gap_ms / group) yang titik
+    tengah awal → akhirnya bergeser < max_drift_km; satu baris SESSION_COLUMNS per jendela.
+
+    Kandidat akhir pertama tiap kontak (≥ min_ms kemudian, di sesi yang sama) dan
+    cek pergeserannya dihitung sekaligus dengan satu searchsorted; loop greedy
+    per jendela hanya melompat antar indeks, dan baru memindai blok kontak
+    berikutnya kalau kandidat pertama bergeser terlalu jauh.
+    """
+    if len(t) == 0:
+        return _empty()
+    order, first, last = _sorted_sessions(mmsi_1, mmsi_2, t, gap_ms, group)
+    m1, m2, t = np.asarray(mmsi_1)[order], np.asarray(mmsi_2)[order], np.asarray(t, dtype=np.int64)[order]
+    lat, lon, dist = (np.asarray(a, dtype=np.float64)[order] for a in (lat, lon, dist))
+
+    # kunci (sesi, waktu) naik monoton; stride > rentang waktu + min_ms supaya
+    # pencarian t + min_ms tidak melewati batas sesi
+    n_ticks = last - first + 1
+    end_of = np.repeat(last, n_ticks)
+    stride = int(t.max()) - int(t.min()) + int(min_ms) + 1
+    if len(first) < np.iinfo(np.int64).max // stride:
+        key = np.repeat(np.arange(len(first), dtype=np.int64), n_ticks) * stride + (t - t.min())
+        j0 = np.searchsorted(key, key + int(min_ms))
+    else:
+        j0 = np.concatenate([a + np.searchsorted(t[a:b + 1], t[a:b + 1] + min_ms)
+                             for a, b in zip(first, last)])
+    ok0 = j0 <= end_of
+    jc = np.minimum(j0, len(t) - 1)
+    ok0 &= haversine_km(lat, lon, lat[jc], lon[jc]) < max_drift_km
+
+    long_enough = t[last] - t[first] >= min_ms
+    j0, ok0 = j0.tolist(), ok0.tolist()
+    windows = [w for a, b in zip(first[long_enough].tolist(), last[long_enough].tolist())
+               for w in _scan(lat, lon, a, b, j0, ok0, max_drift_km)]
+    if not windows:
+        return _empty()
+    w_first, w_last = (np.array(c, dtype=np.int64) for c in zip(*windows))
+    return _frame(m1, m2, t, lat, lon, dist, order, w_first, w_last)
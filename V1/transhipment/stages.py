@@ -0,0 +1,110 @@
+"""
+Stage detektor, didaftarkan per jenis lewat decorator `stage(kind, name)`:
+
+    align         Positions → Positions       (mis. "interp": track ke grid waktu bersama)
+    filter        Positions → mask bool       (mis. "slow", "port")
+    pairs         Positions → tabel pasangan   (kolom pairs.PAIR_COLUMNS, satu baris per bin × pasangan)
+    sessions      tabel pasangan → event       (kolom EVENT_COLUMNS)
+    event_filter  event → mask bool            (mis. "port")
+
+Params memilih stage lewat namanya, jadi stage baru cukup didaftarkan di sini
+(atau dari luar paket dengan decorator yang sama) tanpa mengubah `detect`.
+"""
+import numpy as np
+import pandas as pd
+
+from ais_schema import ms_to_datetime
+
+from .align import interpolate
+from .geo import port_distance_km
+from .pairs import pair_table, time_pairs
+from .sessions import build_sessions
+
+STAGES = {"align": {}, "filter": {}, "pairs": {}, "sessions": {}, "event_filter": {}}
+
+EVENT_COLUMNS = ["mmsi_1", "mmsi_2", "start_time", "end_time", "duration_min", "n_ticks",
+                 "lat", "lon", "dist_min_km", "dist_mean_km", "port_dist_km"]
+
+
+def stage(kind, name):
+    """Daftarkan fungsi sebagai stage `kind` dengan nama `name`."""
+    def register(fn):
+        STAGES[kind][name] = fn
+        return fn
+    return register
+
+
+def get_stage(kind, name):
+    try:
+        return STAGES[kind][name]
+    except KeyError:
+        raise ValueError(f"stage {kind} {name!r} tidak dikenal; pilihan: {sorted(STAGES[kind])}") from None
+
+
+# ────────────────────────── penyelarasan ──────────────────────────
+@stage("align", "interp")
+def interp(pos, params):
+    """Interpolasi tiap track ke tick kelipatan bin_min (jeda ≤ max_gap_min)."""
+    return interpolate(pos, int(params.bin_min * 60_000), int(params.max_gap_min * 60_000))
+
+
+# ────────────────────────── filter posisi ──────────────────────────
+@stage("filter", "slow")
+def slow(pos, params):
+    return pos.sog < params.sog_max
+
+
+@stage("filter", "port")
+def far_from_port(pos, params):
+    return port_distance_km(pos.lat, pos.lon, params.ports) >= params.port_km
+
+
+# ────────────────────────── pasangan kandidat ──────────────────────────
+def _pair_stage(pos, params, method):
+    i, j, tick = time_pairs(pos.t, pos.lat, pos.lon, params.proximity_km,
+                            int(params.bin_min * 60_000), method)
+    return pair_table(i, j, tick, pos.mmsi, pos.lat, pos.lon)
+
+
+@stage("pairs", "balltree")
+def balltree_pairs(pos, params):
+    """BallTree haversine per bin waktu (cara anomali_finder_optimize_dua.py)."""
+    return _pair_stage(pos, params, "balltree")
+
+
+@stage("pairs", "kdtree")
+def kdtree_pairs(pos, params):
+    """cKDTree per bin di koordinat 3D bola satuan, `query_pairs(output_type='ndarray')`."""
+    return _pair_stage(pos, params, "kdtree")
+
+
+@stage("pairs", "grid")
+def grid_hash_pairs(pos, params):
+    """Grid hash (bin, sel) untuk seluruh dataset sekaligus, tanpa tree per bin."""
+    return _pair_stage(pos, params, "grid")
+
+
+# ────────────────────────── sesi ──────────────────────────
+def empty_events():
+    return pd.DataFrame({c: pd.Series(dtype=object) for c in EVENT_COLUMNS})
+
+
+@stage("sessions", "gap")
+def gap_sessions(pairs, params):
+    """Urut (pasangan, waktu) sekali; jeda > gap_min memulai sesi baru; agregat lewat reduceat."""
+    ev = build_sessions(*(pairs[c].to_numpy() for c in ("mmsi_1", "mmsi_2", "t", "lat", "lon", "dist_km")),
+                        params.gap_min * 60_000)
+    ev["duration_min"] = (ev["end"] - ev["start"]) / 60_000
+    ev = ev[ev["duration_min"] >= params.duration_min]
+    if ev.empty:
+        return empty_events()
+    ev = ev.assign(start_time=ms_to_datetime(ev["start"]), end_time=ms_to_datetime(ev["end"]),
+                   port_dist_km=port_distance_km(ev["lat"], ev["lon"], params.ports))
+    return ev[EVENT_COLUMNS].reset_index(drop=True)
+
+
+# ────────────────────────── filter event ──────────────────────────
+@stage("event_filter", "port")
+def event_far_from_port(events, params):
+    """Titik tengah sesi harus ≥ port_km dari semua pelabuhan."""
+    return events["port_dist_km"].to_numpy(dtype=np.float64) >= params.port_km
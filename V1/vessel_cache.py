@@ -0,0 +1,231 @@
+"""
+Cache metadata kapal hasil scraping (SQLite), dipakai bersama oleh
+scrapping_with_bs4.py dan scrapping_mmsi.py.
+
+Dulu ada lima output scraping dengan format berbeda (scraped_vessel_type.csv,
+vessel_type_vesselfinder.csv, ship_info_scraped.csv,
+ship_info_from_marinetraffic.csv, scraper_log.txt), dan NOT_FOUND / ERROR
+entah dicoba ulang terus atau tidak pernah dicoba lagi. Di sini satu tabel
+
+    data/vessel_cache.sqlite   vessel_meta(source, mmsi, status, vessel_type, fetched_at)
+
+dengan kunci (source, mmsi) dan TTL per status: hasil yang valid disimpan
+lama, NOT_FOUND beberapa minggu, ERROR / BLOCKED hanya beberapa menit. Run
+berikutnya hanya mengambil MMSI yang entrinya belum ada atau sudah basi.
+
+Pemakaian:
+    python V1/vessel_cache.py --import-legacy       # masukkan kelima file lama
+    python V1/vessel_cache.py                       # ringkasan status per source
+"""
+import argparse
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DB = Path("data/vessel_cache.sqlite")
+
+OK = "OK"
+UNKNOWN = "UNKNOWN"          # halaman detail ada, tapi tanpa Ship Type
+NOT_FOUND = "NOT_FOUND"
+ERROR = "ERROR"
+BLOCKED = "BLOCKED"          # halaman "you have been blocked" / captcha / 403
+
+DAY = 86_400
+TTL = {                      # detik
+    OK: 180 * DAY,
+    UNKNOWN: 30 * DAY,
+    NOT_FOUND: 21 * DAY,
+    ERROR: 10 * 60,
+    BLOCKED: 5 * 60,
+}
+RANK = {OK: 0, UNKNOWN: 1, NOT_FOUND: 2, BLOCKED: 3, ERROR: 4}   # dipakai saat import file lama
+
+BLOCKED_PATTERN = re.compile(
+    r"you have been blocked|access denied|attention required|captcha|unusual traffic|too many requests",
+    re.IGNORECASE)
+# penanda struktur halaman challenge / error Cloudflare (tidak muncul di halaman hasil)
+BLOCK_MARKERS = re.compile(
+    r'id="cf-error-details"|id="challenge-form"|cf-browser-verification|/cdn-cgi/challenge-platform/',
+    re.IGNORECASE)
+TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+SHORT_TEXT = 2_000           # teks sependek ini tanpa <title>: nilai CSV lama / halaman blokir polos
+
+
+def is_blocked(html):
+    """
+    True kalau isi halaman adalah halaman blokir / captcha, bukan hasil.
+    Pola kata hanya dicek di <title> (halaman hasil bisa saja memuat kata
+    "captcha" di script / form); teks pendek tanpa <title> dicek seluruhnya.
+    """
+    if not html:
+        return False
+    head = html[:20_000]
+    title = TITLE.search(head)
+    text = title.group(1) if title else (html if len(html) <= SHORT_TEXT else "")
+    return BLOCKED_PATTERN.search(text) is not None or BLOCK_MARKERS.search(head) is not None
+
+
+def status_of(vessel_type):
+    """Nilai kolom vessel_type gaya CSV lama → status cache."""
+    if vessel_type is None or pd.isna(vessel_type) or not str(vessel_type).strip():
+        return UNKNOWN
+    v = str(vessel_type).strip()
+    if v in (UNKNOWN, NOT_FOUND, ERROR, BLOCKED):
+        return v
+    if is_blocked(v):
+        return BLOCKED
+    return OK
+
+
+def csv_value(status, vessel_type):
+    """Status cache → nilai vessel_type di CSV lama (BLOCKED ditulis sebagai ERROR)."""
+    if status == OK:
+        return vessel_type
+    return ERROR if status == BLOCKED else status
+
+
+class VesselCache:
+    """Tabel (source, mmsi) → status, vessel_type, waktu ambil; dengan TTL per status."""
+
+    def __init__(self, path=CACHE_DB, ttl=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = {**TTL, **(ttl or {})}
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS vessel_meta (
+                source      TEXT NOT NULL,
+                mmsi        TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                vessel_type TEXT,
+                fetched_at  REAL NOT NULL,
+                PRIMARY KEY (source, mmsi)
+            )""")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ────────────────────────── baca ──────────────────────────
+    def get(self, source, mmsi):
+        row = self.db.execute(
+            "SELECT status, vessel_type, fetched_at FROM vessel_meta WHERE source = ? AND mmsi = ?",
+            (source, str(mmsi))).fetchone()
+        return None if row is None else dict(zip(("status", "vessel_type", "fetched_at"), row))
+
+    def fresh(self, source, now=None):
+        """Set MMSI yang entrinya masih berlaku (belum lewat TTL status-nya)."""
+        now = time.time() if now is None else now
+        rows = self.db.execute("SELECT mmsi, status, fetched_at FROM vessel_meta WHERE source = ?", (source,))
+        return {m for m, status, t in rows if now - t < self.ttl.get(status, 0)}
+
+    def stale(self, source, mmsi_list, now=None):
+        """MMSI dari `mmsi_list` yang perlu diambil ulang (belum ada / basi), urutan dipertahankan."""
+        fresh = self.fresh(source, now)
+        return [m for m in mmsi_list if str(m) not in fresh]
+
+    def frame(self, source):
+        """DataFrame [mmsi, vessel_type] gaya CSV lama untuk satu source."""
+        df = pd.read_sql_query("SELECT mmsi, status, vessel_type FROM vessel_meta WHERE source = ? ORDER BY rowid",
+                               self.db, params=(source,))
+        df["vessel_type"] = [csv_value(s, v) for s, v in zip(df["status"], df["vessel_type"])]
+        return df[["mmsi", "vessel_type"]]
+
+    def summary(self):
+        return pd.read_sql_query(
+            "SELECT source, status, COUNT(*) AS n FROM vessel_meta GROUP BY source, status ORDER BY source, n DESC",
+            self.db)
+
+    # ────────────────────────── tulis ──────────────────────────
+    def put_many(self, source, results, fetched_at=None):
+        """Simpan list dict {mmsi, vessel_type[, status]} dalam satu transaksi."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = []
+        for r in results:
+            status = r.get("status") or status_of(r.get("vessel_type"))
+            vessel_type = r.get("vessel_type") if status == OK else None
+            rows.append((source, str(r["mmsi"]), status, vessel_type, r.get("fetched_at", fetched_at)))
+        with self.db:
+            self.db.executemany("""
+                INSERT INTO vessel_meta (source, mmsi, status, vessel_type, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source, mmsi) DO UPDATE SET
+                    status = excluded.status, vessel_type = excluded.vessel_type,
+                    fetched_at = excluded.fetched_at""", rows)
+        return len(rows)
+
+    def put(self, source, mmsi, vessel_type, status=None):
+        self.put_many(source, [{"mmsi": mmsi, "vessel_type": vessel_type, "status": status}])
+
+    def import_frame(self, source, df, fetched_at=None):
+        """
+        Masukkan hasil lama (kolom mmsi, vessel_type[, fetched_at]) tanpa menimpa entri yang sudah ada.
+        Kalau satu MMSI muncul berkali-kali, status terbaik (OK > UNKNOWN > NOT_FOUND > ...) yang dipakai.
+        """
+        df = df.dropna(subset=["mmsi"]).copy()
+        if fetched_at is not None:
+            df["fetched_at"] = fetched_at
+        df["mmsi"] = df["mmsi"].astype(str).str.replace(r"\.0$", "", regex=True)
+        df["status"] = [status_of(v) for v in df["vessel_type"]]
+        df = (df.assign(rank=df["status"].map(RANK))
+              .sort_values("rank", kind="stable")
+              .drop_duplicates("mmsi"))
+        rows = [(source, m, s, v if s == OK else None, t)
+                for m, s, v, t in zip(df["mmsi"], df["status"], df["vessel_type"], df["fetched_at"])]
+        with self.db:
+            cur = self.db.executemany("INSERT OR IGNORE INTO vessel_meta VALUES (?, ?, ?, ?, ?)", rows)
+        return cur.rowcount
+
+
+# ────────────────────────── import file lama ──────────────────────────
+LEGACY = [
+    # (file, source, fungsi pembaca → DataFrame [mmsi, vessel_type])
+    ("scraped_vessel_type.csv", "vesselfinder",
+     lambda p: pd.read_csv(p, dtype=str)),
+    ("vessel_type_vesselfinder.csv", "vesselfinder",
+     lambda p: pd.read_csv(p, dtype=str)),
+    ("scraper_log.txt", "vesselfinder",
+     lambda p: pd.read_csv(p, header=None, names=["mmsi", "vessel_type"], dtype=str, on_bad_lines="skip")),
+    ("ship_info_scraped.csv", "ship_info",
+     lambda p: pd.read_csv(p, dtype=str).rename(columns={"type": "vessel_type"})),
+    ("ship_info_from_marinetraffic.csv", "marinetraffic",
+     lambda p: (pd.read_csv(p, dtype=str)
+                .assign(vessel_type=lambda d: d["vessel_type"].where(~d["ship_name"].fillna("").map(is_blocked),
+                                                                     BLOCKED)))),
+]
+
+
+def import_legacy(cache, base="."):
+    """Masukkan kelima output scraping lama ke cache (waktu ambil = mtime file)."""
+    frames = {}
+    for name, source, read in LEGACY:
+        path = Path(base) / name
+        if path.exists():
+            df = read(path)[["mmsi", "vessel_type"]].assign(fetched_at=os.path.getmtime(path))
+            frames.setdefault(source, []).append(df)
+            print(f"   ✔  {name:<34} → {source:<14} {len(df):>6,} baris")
+    for source, dfs in frames.items():
+        n = cache.import_frame(source, pd.concat(dfs, ignore_index=True))
+        print(f"   ➜  {source:<14} {n:>6,} entri baru")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Cache metadata kapal hasil scraping (SQLite)")
+    ap.add_argument("--db", type=Path, default=CACHE_DB)
+    ap.add_argument("--import-legacy", action="store_true", help="import output scraping lama")
+    args = ap.parse_args()
+
+    with VesselCache(args.db) as cache:
+        if args.import_legacy:
+            import_legacy(cache)
+        print(cache.summary().to_string(index=False))
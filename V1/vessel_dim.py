@@ -0,0 +1,182 @@
+"""
+Tabel dimensi kapal: satu baris per MMSI dengan ship type dari pesan statis.
+
+Dulu extract_ship_type.py memindai seluruh dataset per 300k baris untuk
+membangun `mapper` setiap kali dijalankan. Di sini mapping disimpan permanen
+dan hanya partisi hari yang baru / berubah yang dipindai:
+
+    data/ais_store/vessels.parquet
+
+    mmsi            uint32
+    ship_type_code  uint8    kode ship type AIS 0-99
+    ship_group      string   Fishing / Passenger / Cargo / Tanker / Other
+    source          string   "msg5" / "msg24" (pesan asal ship type)
+    last_seen       int64    epoch ms pesan statis terakhir
+
+Hari yang sudah diproses (beserta mtime partisinya) dicatat di metadata file
+Parquet itu sendiri. Untuk MMSI yang sama, baris dengan `last_seen` terbaru
+yang dipakai, jadi memproses ulang satu hari aman.
+
+Pemakaian:
+    python V1/vessel_dim.py            # proses hari baru / berubah
+    python V1/vessel_dim.py --force    # bangun ulang dari nol
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ais_schema import ms_to_datetime
+from ais_store import POSITIONS, STORE, list_partitions
+from nmea_reassemble import Reassembler
+from payload_store import PayloadStore
+
+VESSELS = "vessels.parquet"
+STATIC_TYPES = [5, 24]
+
+SCHEMA = pa.schema([
+    ("mmsi", pa.uint32()),
+    ("ship_type_code", pa.uint8()),
+    ("ship_group", pa.string()),
+    ("source", pa.string()),
+    ("last_seen", pa.int64()),
+])
+
+
+# ────────────────────────── decode ──────────────────────────
+def decode_static(*sentences):
+    """Satu pesan NMEA (semua fragmennya) → (msg_type, ship_type) atau None kalau bukan Msg-5 / Msg-24."""
+    from pyais import decode          # hanya dibutuhkan saat update, bukan saat membaca tabel
+    try:
+        msg = decode(*sentences)       # pyais.decode → objek MessageTypeN
+        if msg.msg_type in STATIC_TYPES:
+            code = msg.asdict().get("ship_type")   # field 'ship_type' di dict hasil
+            if code is not None:
+                return msg.msg_type, int(code)
+    except Exception:
+        pass                            # payload rusak → abaikan
+    return None
+
+
+def ship_type_code(*sentences):
+    """Return integer 0-99 (ship_type) hanya untuk Msg-5 / Msg-24."""
+    decoded = decode_static(*sentences)
+    return decoded[1] if decoded else None
+
+
+def ship_group(code):
+    if code == 30:
+        return "Fishing"
+    if 60 <= code <= 69:
+        return "Passenger"
+    if 70 <= code <= 79:
+        return "Cargo"
+    if 80 <= code <= 89:
+        return "Tanker"
+    return "Other"
+
+
+# ────────────────────────── baca / tulis ──────────────────────────
+def _read(root):
+    path = Path(root) / VESSELS
+    if not path.exists():
+        return SCHEMA.empty_table().to_pandas(), {}
+    tbl = pq.read_table(path)
+    days = json.loads((tbl.schema.metadata or {}).get(b"days", b"{}"))
+    return tbl.to_pandas(), days
+
+
+def load_vessels(root=STORE, utc=False):
+    """DataFrame dimensi kapal; `utc=True` menambah kolom datetime `last_seen_utc`."""
+    df, _ = _read(root)
+    if utc:
+        df["last_seen_utc"] = ms_to_datetime(df["last_seen"])
+    return df
+
+
+def _write(root, df, days):
+    path = Path(root) / VESSELS
+    tbl = pa.Table.from_pandas(df[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+    tbl = tbl.replace_schema_metadata({"days": json.dumps(days, sort_keys=True)})
+    tmp = path.with_name(path.name + ".tmp")
+    pq.write_table(tbl, tmp, compression="zstd")
+    tmp.replace(path)
+
+
+# ────────────────────────── update ──────────────────────────
+def _day_static(src, payloads, reassembler):
+    """Pesan statis satu partisi hari → DataFrame [mmsi, ship_type_code, source, last_seen]."""
+    files = [str(f) for f in sorted(src.glob("*.parquet"))]
+    df = (ds.dataset(files, format="parquet")
+          .to_table(columns=["mmsi", "ts", "aistype", "payload_ref"]).to_pandas())
+    # aistype kosong ikut diambil: fragmen ke-2 msg 5 sering tidak bertipe dan
+    # tanpa mmsi; mmsi pesan diambil dari fragmen yang membawanya (owners)
+    df = (df[df["aistype"].isin(STATIC_TYPES) | df["aistype"].isna()]
+          .dropna(subset=["ts", "payload_ref"])
+          .sort_values("ts", kind="stable"))                # urut waktu: syarat reassembly
+    if df.empty:
+        return None
+
+    original = payloads.get_many(df["payload_ref"].to_numpy()).to_pylist()
+    rows, owners, messages = reassembler.feed(original, df["ts"].to_numpy(), df["mmsi"].to_numpy())
+    decoded = [decode_static(*m) for m in messages]
+    ok = [k for k, d in enumerate(decoded) if d is not None and owners[k] is not None]
+    if not ok:
+        return None
+    rows = rows[ok]
+    return pd.DataFrame({
+        "mmsi": [owners[k] for k in ok],
+        "ship_type_code": [decoded[k][1] for k in ok],
+        "source": [f"msg{decoded[k][0]}" for k in ok],
+        "last_seen": df["ts"].to_numpy()[rows],
+    })
+
+
+def update_vessels(root=STORE, force=False):
+    """Perbarui tabel dimensi dari partisi hari yang baru / berubah; return jumlah hari yang dipindai."""
+    vessels, days = _read(root)
+    if force:
+        vessels, days = vessels.iloc[0:0], {}
+    payloads = PayloadStore(root)
+    reassembler = Reassembler()
+
+    parts, n = [vessels], 0
+    for day, src in list_partitions(root, POSITIONS):
+        key = f"{day:%Y-%m-%d}"
+        mtime = max((f.stat().st_mtime for f in src.glob("*.parquet")), default=0)
+        if days.get(key, -1) >= mtime:
+            continue
+        new = _day_static(src, payloads, reassembler)
+        if new is not None:
+            parts.append(new)
+        days[key] = mtime
+        n += 1
+
+    if n == 0:
+        return 0
+    print(f"   {reassembler.report()}")
+    vessels = (pd.concat(parts, ignore_index=True)
+               .sort_values("last_seen", kind="stable")
+               .drop_duplicates("mmsi", keep="last")
+               .sort_values("mmsi")
+               .reset_index(drop=True))
+    vessels["ship_group"] = vessels["ship_type_code"].map(ship_group).astype(object)
+    _write(root, vessels, days)
+    return n
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Perbarui tabel dimensi MMSI → ship type")
+    ap.add_argument("--root", type=Path, default=STORE)
+    ap.add_argument("--force", action="store_true", help="bangun ulang dari semua hari")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    n = update_vessels(args.root, args.force)
+    print(f"✅  {n} partisi hari dipindai, {len(load_vessels(args.root)):,} kapal "
+          f"dalam {time.time() - t0:.1f} detik")
@@ -0,0 +1,105 @@
+"""
+Atribut kapal (jenis kapal) diambil saat query lewat lookup MMSI, bukan merge.
+
+Dulu merging_type.py meng-cast 3,6 juta MMSI ke str, left-merge
+scraped_vessel_type.csv, lalu menulis pickle baru berisi seluruh dataset
+hanya demi satu kolom tambahan. Di sini atribut kapal disimpan sebagai tabel
+dimensi kecil (satu baris per MMSI, kolom kategorikal) yang diurutkan per
+MMSI. Menambah kolom ke DataFrame posisi = `searchsorted` MMSI lalu `take`
+kode kategori, jadi hasilnya kolom `category` tanpa menyalin data lain.
+
+Atribut yang tersedia:
+    vessel_type         jenis kapal hasil resolusi prioritas (default: hasil
+                        scraping dulu, kalau UNKNOWN / tidak ada → ship_group AIS)
+    vessel_type_source  "scrape" / "ais" (asal vessel_type)
+    scraped_type        vessel_type hasil scraping apa adanya
+    ship_type_code      kode ship type AIS (dari vessel_dim)
+    ship_group          Fishing / Passenger / Cargo / Tanker / Other
+
+Contoh:
+    df = load_positions(bbox=SELAT_SUNDA, columns=['mmsi', 'lat', 'lon'])
+    df = attach_vessel_attrs(df, ["vessel_type"])
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ais_store import STORE
+from vessel_dim import load_vessels
+
+VESSEL_TYPE_CSV = Path("scraped_vessel_type.csv")
+UNKNOWN = "UNKNOWN"
+PRIORITY = ("scrape", "ais")     # urutan sumber untuk vessel_type
+
+
+@lru_cache(maxsize=1)
+def load_vessel_types(path=VESSEL_TYPE_CSV):
+    """Hasil scraping vessel_type (ERROR / NOT_FOUND → UNKNOWN), mmsi uint32 unik."""
+    df_type = pd.read_csv(path, dtype={'mmsi': str})
+    df_type['vessel_type'] = df_type['vessel_type'].replace(['ERROR', 'NOT_FOUND'], UNKNOWN)
+    df_type['mmsi'] = pd.to_numeric(df_type['mmsi'], errors='coerce')
+    df_type = df_type.dropna(subset=['mmsi']).drop_duplicates('mmsi', keep='last')
+    return df_type.astype({'mmsi': 'uint32'})[['mmsi', 'vessel_type']]
+
+
+class VesselLookup:
+    """Tabel dimensi kapal terurut per MMSI + `take` atribut untuk array MMSI."""
+
+    def __init__(self, root=STORE, csv=VESSEL_TYPE_CSV, priority=PRIORITY):
+        scraped = (load_vessel_types(csv) if Path(csv).exists()
+                   else pd.DataFrame({'mmsi': pd.Series(dtype='uint32'), 'vessel_type': []}))
+        ais = load_vessels(root)[['mmsi', 'ship_type_code', 'ship_group']]
+
+        dim = (scraped.rename(columns={'vessel_type': 'scraped_type'})
+               .merge(ais, on='mmsi', how='outer')
+               .sort_values('mmsi')
+               .reset_index(drop=True))
+        dim['ship_type_code'] = dim['ship_type_code'].astype('UInt8')
+
+        # resolusi prioritas: sumber pertama yang punya nilai (bukan UNKNOWN) menang
+        candidates = {
+            'scrape': dim['scraped_type'].where(dim['scraped_type'] != UNKNOWN),
+            'ais': dim['ship_group'],
+        }
+        resolved = pd.Series(pd.NA, index=dim.index, dtype=object)
+        source = pd.Series(pd.NA, index=dim.index, dtype=object)
+        for name in priority:
+            take = resolved.isna() & candidates[name].notna()
+            resolved[take] = candidates[name][take]
+            source[take] = name
+        known = dim['scraped_type'].notna() | dim['ship_group'].notna()
+        resolved[resolved.isna() & known] = UNKNOWN
+        dim['vessel_type'] = resolved
+        dim['vessel_type_source'] = source
+
+        for col in ['scraped_type', 'ship_group', 'vessel_type', 'vessel_type_source']:
+            dim[col] = dim[col].astype('category')
+        self.keys = dim['mmsi'].to_numpy(dtype=np.uint32)
+        self.dim = dim.drop(columns='mmsi')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def positions(self, mmsi):
+        """Posisi baris dimensi untuk tiap MMSI; -1 kalau MMSI tidak ada di dimensi."""
+        mmsi = pd.to_numeric(pd.Series(mmsi), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(mmsi)
+        m = np.where(valid, mmsi, 0).astype(np.uint32)
+        pos = np.minimum(np.searchsorted(self.keys, m), max(len(self.keys) - 1, 0))
+        found = valid & (len(self.keys) > 0)
+        if len(self.keys):
+            found &= self.keys[pos] == m
+        return np.where(found, pos, -1)
+
+    def take(self, mmsi, attr):
+        """Kolom atribut `attr` sejajar dengan `mmsi` (kategori / UInt8, NA kalau tidak dikenal)."""
+        return self.dim[attr].array.take(self.positions(mmsi), allow_fill=True)
+
+
+def attach_vessel_attrs(df, attrs=("vessel_type",), lookup=None):
+    """Tambahkan kolom atribut kapal ke `df` (yang punya kolom `mmsi`) tanpa merge."""
+    lookup = lookup or VesselLookup()
+    pos = lookup.positions(df['mmsi'])
+    return df.assign(**{a: lookup.dim[a].array.take(pos, allow_fill=True) for a in attrs})
@@ -1,4 +1,3 @@
-import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point
 import matplotlib.pyplot as plt
@@ -6,24 +5,17 @@ import contextily as ctx
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
 
-# 1. Load data AIS hasil merge
-df = pd.read_pickle('data/maritim_selat_sunda_with_type.pkl')
+from ais_store import SELAT_SUNDA, load_positions
+from vessel_lookup import attach_vessel_attrs
 
-# 2. Pastikan kolom waktu valid
-df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+# 1–4. Load posisi Selat Sunda Agustus–Desember 2024 (filter di-push ke Parquet)
+df = load_positions(start="2024-08-01", end="2025-01-01", bbox=SELAT_SUNDA,
+                    columns=['mmsi', 'lat', 'lon'])
 
-# 3. Filter posisi Selat Sunda
-df = df.dropna(subset=['lat', 'lon', 'created_at', 'vessel_type'])
-df = df[(df['lat'] >= -6.5) & (df['lat'] <= -5.5) &
-        (df['lon'] >= 105.0) & (df['lon'] <= 106.0)]
-
-# 4. Filter hanya data Agustus–Desember 2024
-df = df[(df['created_at'].dt.year == 2024) &
-        (df['created_at'].dt.month >= 8) &
-        (df['created_at'].dt.month <= 12)]
-
-# 5. Ubah vessel_type ke kategori (hemat memori)
-df['vessel_type'] = df['vessel_type'].astype('category')
+# 5. vessel_type lewat lookup MMSI (sudah kategori, tanpa pickle gabungan)
+df = attach_vessel_attrs(df, ['vessel_type'])
+df = df.dropna(subset=['lat', 'lon', 'vessel_type'])
+df['vessel_type'] = df['vessel_type'].cat.remove_unused_categories()
 
 # 6. Buat GeoDataFrame
 df['geometry'] = [Point(xy) for xy in zip(df['lon'], df['lat'])]